@@ -1,17 +1,74 @@
-from typing import Callable, Optional
+import sys
+import types
+import importlib
+from typing import TYPE_CHECKING, Callable, Optional
 
-from oven.oven import Oven, build_oven
 from oven.version import __version__
-from oven.progress import progress, progress_range, ProgressBar
+
+if TYPE_CHECKING:
+    from oven.oven import Oven, build_oven
+    from oven.progress import (
+        progress,
+        progress_range,
+        ProgressBar,
+        aprogress,
+        as_completed_progress,
+    )
+    from oven.shared_progress import SharedProgress
+    from oven.progress_io import progress_file, ProgressFile
+    from oven.parallel import progress_map
+
+# Heavy members are loaded on first use (PEP 562), so that `import oven` stays cheap.
+_LAZY_MEMBERS = {
+    'Oven': 'oven.oven',
+    'build_oven': 'oven.oven',
+    'progress': 'oven.progress',
+    'progress_range': 'oven.progress',
+    'ProgressBar': 'oven.progress',
+    'aprogress': 'oven.progress',
+    'as_completed_progress': 'oven.progress',
+    'SharedProgress': 'oven.shared_progress',
+    'progress_file': 'oven.progress_io',
+    'ProgressFile': 'oven.progress_io',
+    'progress_map': 'oven.parallel',
+}
 
 # Global oven.
-_lazy_oven_obj: Optional[Oven] = None
+_lazy_oven_obj: Optional['Oven'] = None
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_MEMBERS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    member = getattr(importlib.import_module(_LAZY_MEMBERS[name]), name)
+    globals()[name] = member
+    return member
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_MEMBERS))
+
 
+class _OvenModule(types.ModuleType):
+    def __setattr__(self, name, value) -> None:
+        # `oven.progress` is both a submodule and a function. Importing the submodule makes the import
+        # system bind it to the package, which must not shadow the function.
+        if name == 'progress' and isinstance(value, types.ModuleType):
+            value = value.progress
+        super().__setattr__(name, value)
 
-def get_lazy_oven() -> Optional[Oven]:
+
+sys.modules[__name__].__class__ = _OvenModule
+
+
+def get_lazy_oven() -> Optional['Oven']:
     global _lazy_oven_obj
     if _lazy_oven_obj is None:
-        _lazy_oven_obj = build_oven()
+        from oven.oven import build_oven
+        from oven.daemon import connect_daemon
+
+        # Prefer the host-local daemon if it's running.
+        _lazy_oven_obj = connect_daemon() or build_oven()
     return _lazy_oven_obj
 
 
@@ -22,7 +79,8 @@ def get_lazy_oven() -> Optional[Oven]:
 
 def monitor(func) -> Callable:
     """
-    Notifier decorator for a function.
+    Notifier decorator for a function. Coroutine functions are also supported, the notifications are then
+    delivered without blocking the event loop.
 
     Usage:
     ```
@@ -56,6 +114,32 @@ def notify(msg: str) -> None:
     return get_lazy_oven().ding_log(msg)
 
 
+async def anotify(msg: str) -> None:
+    """
+    Async counterpart of `notify()`, it doesn't block the event loop.
+
+    Usage:
+    ```
+    await oven.anotify('Hello World!')
+    ```
+    """
+    return await get_lazy_oven().ading_log(msg)
+
+
+def flush(timeout: Optional[float] = None) -> bool:
+    """
+    Wait until the queued notifications are delivered, it only matters when `delivery.mode` is `async`.
+
+    Usage:
+    ```
+    oven.flush(timeout=10)
+    ```
+    """
+    if _lazy_oven_obj is None:
+        return True
+    return _lazy_oven_obj.flush(timeout)
+
+
 # 🍟 Interesting alias just for fun, these alias are aligned with CLI.
 bake = monitor  # @oven.bake = @oven.monitor
 ding = notify  # oven.ding(...) = oven.notify(...)
@@ -65,11 +149,19 @@ ding = notify  # oven.ding(...) = oven.notify(...)
 __all__ = [
     'monitor',
     'notify',
+    'anotify',
     'bake',
     'ding',
+    'flush',
     'progress',
     'progress_range',
     'ProgressBar',
+    'aprogress',
+    'as_completed_progress',
+    'SharedProgress',
+    'progress_file',
+    'ProgressFile',
+    'progress_map',
     'get_lazy_oven',
     'Oven',
     'build_oven',
@@ -1,15 +1,67 @@
-from typing import Union, Dict
+import time
+import random
+from typing import Union, Dict, Optional
 
 from .info import *
 
 
 class RespStatus:
-    def __init__(self, has_err: bool, err_msg: str = '') -> None:
+    def __init__(
+        self,
+        has_err: bool,
+        err_msg: str = '',
+        code: Optional[int] = None,
+        status_code: Optional[int] = None,
+    ) -> None:
         self.has_err: bool = has_err
         self.err_msg: str = err_msg
+        # Error code parsed from the response body, and the HTTP status. None if not available.
+        self.code: Optional[int] = code
+        self.status_code: Optional[int] = status_code
+        # Filled by `NotifierBackendBase.deliver()`.
+        self.attempts: int = 1
+        # Both in seconds, the latency includes retries and waiting for the rate limiter.
+        self.latency: float = 0.0
+        self.wait_time: float = 0.0
+        # Whether the undelivered information was kept in the outbox for later replay.
+        self.kept: bool = False
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: the n-th retry sleeps a random time in
+    `[0, min(max_delay, base_delay * 2 ** (n - 1))]`. No more retry is made once the total time would
+    exceed `budget` seconds, the time waiting for the rate limiter is not counted. In the caller's thread,
+    at most `sync_max_attempts` attempts are made, within the same budget.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        budget: float = 60.0,
+        sync_max_attempts: int = 2,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.sync_max_attempts = sync_max_attempts
+
+    def get_delay(self, n_retry: int) -> float:
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (n_retry - 1))
+        )
 
 
 class NotifierBackendBase:
+    # Set by `Oven` if undelivered notifications should be persisted.
+    outbox = None
+    # Replaced by `Oven` according to the `retry` section.
+    retry_policy = RetryPolicy()
+    # Error codes in response body that are worth retrying, e.g. "sending too fast".
+    RETRYABLE_CODES = set()
 
     # ========================================== #
     # Functions below should/can be overwritten. #
@@ -24,3 +76,184 @@ class NotifierBackendBase:
     def get_meta(self) -> Dict:
         """Generate meta information for information object."""
         raise NotImplementedError
+
+    async def anotify(self, info: ExpInfoBase) -> RespStatus:
+        """
+        Async counterpart of `notify()`, backends with a native async client can overwrite it. By default,
+        `notify()` is offloaded to the default executor.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.notify, info)
+
+    def is_retryable(self, resp: RespStatus) -> bool:
+        """Classify a failed response. Transport errors, HTTP 429 / 5xx and `RETRYABLE_CODES` are retried."""
+        if resp.status_code is None:
+            return True  # never got a response, e.g. timeout
+        if resp.status_code == 429 or resp.status_code >= 500:
+            return True
+        if resp.status_code >= 400:
+            return False
+        return resp.code in self.RETRYABLE_CODES
+
+    # ================================ #
+    # Functions below are shared APIs. #
+    # ================================ #
+
+    def deliver(
+        self, info: ExpInfoBase, persist: bool = True, retry: bool = True
+    ) -> RespStatus:
+        """
+        Send the information through `notify()`, waiting for the rate limiter if configured and retrying
+        according to `retry_policy`. If it finally fails and the outbox is enabled, the information is
+        persisted for later replay.
+
+        The timeouts of each attempt are capped to what is left of the budget, so the delivery never takes
+        much longer than it. The budget starts once the rate limiter lets the first attempt go. In the
+        caller's thread, `retry` is False and at most `retry_policy.sync_max_attempts` attempts are made.
+        """
+        from oven.utils.http import deadline
+
+        limiter = self._get_rate_limiter()
+        start = time.monotonic()
+        attempts, wait_time = 0, 0.0
+        while True:
+            attempts += 1
+            if limiter is not None:
+                wait_time += limiter.acquire()
+            # Waiting for a token doesn't count against the budget.
+            budget_start = start + wait_time
+            try:
+                with deadline(budget_start + self.retry_policy.budget):
+                    resp = self.notify(info)
+            except Exception as e:
+                # Transport errors are reported through `RespStatus`, anything raised here is not retryable.
+                resp = RespStatus(has_err=True, err_msg=f'{e}')
+                break
+
+            delay = self._get_retry_delay(resp, attempts, budget_start, retry)
+            if delay is None:
+                break
+            time.sleep(delay)
+        return self._finish_delivery(
+            info, resp, attempts, start, wait_time, persist
+        )
+
+    async def adeliver(
+        self, info: ExpInfoBase, persist: bool = True, retry: bool = True
+    ) -> RespStatus:
+        """Async counterpart of `deliver()`, the event loop is not blocked while retrying."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if type(self).anotify is NotifierBackendBase.anotify:
+            # No native async support, offload the whole delivery at once.
+            return await loop.run_in_executor(
+                None, self.deliver, info, persist, retry
+            )
+
+        limiter = self._get_rate_limiter()
+        start = time.monotonic()
+        attempts, wait_time = 0, 0.0
+        while True:
+            attempts += 1
+            if limiter is not None:
+                wait_time += await loop.run_in_executor(None, limiter.acquire)
+            # Waiting for a token doesn't count against the budget.
+            budget_start = start + wait_time
+            try:
+                resp = await asyncio.wait_for(
+                    self.anotify(info),
+                    budget_start + self.retry_policy.budget - time.monotonic(),
+                )
+            except asyncio.TimeoutError:
+                resp = RespStatus(
+                    has_err=True, err_msg='Retry budget exhausted.'
+                )
+                break
+            except Exception as e:
+                resp = RespStatus(has_err=True, err_msg=f'{e}')
+                break
+
+            delay = self._get_retry_delay(resp, attempts, budget_start, retry)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        return self._finish_delivery(
+            info, resp, attempts, start, wait_time, persist
+        )
+
+    def find_backend(self, name: str) -> Optional['NotifierBackendBase']:
+        """Find the backend by its name in configuration, e.g. to replay the outbox. None if not found."""
+        cfg = getattr(self, 'cfg', None) or {}
+        return self if cfg.get('backend', None) == name else None
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _get_retry_delay(
+        self, resp: RespStatus, attempts: int, start: float, retry: bool = True
+    ) -> Optional[float]:
+        """
+        Get the delay before next attempt, None if it shouldn't be retried. The next attempt is capped to
+        what is left of the budget after the delay.
+        """
+        policy = self.retry_policy
+        max_attempts = (
+            policy.max_attempts
+            if retry
+            else min(policy.max_attempts, policy.sync_max_attempts)
+        )
+        if (
+            not resp.has_err
+            or attempts >= max_attempts
+            or not self.is_retryable(resp)
+        ):
+            return None
+        delay = policy.get_delay(attempts)
+        if time.monotonic() - start + delay >= policy.budget:
+            return None
+        return delay
+
+    def _finish_delivery(
+        self,
+        info: ExpInfoBase,
+        resp: RespStatus,
+        attempts: int,
+        start: float,
+        wait_time: float,
+        persist: bool,
+    ) -> RespStatus:
+        resp.attempts = attempts
+        resp.latency = time.monotonic() - start
+        resp.wait_time = wait_time
+
+        if resp.has_err and persist and self.outbox is not None:
+            try:
+                self.outbox.append(self.cfg['backend'], info)
+                resp.kept = True
+                resp.err_msg += ' (kept in outbox)'
+            except Exception as e:
+                resp.err_msg += f' (failed to keep in outbox: {e})'
+        return resp
+
+    def _get_rate_limiter(self):
+        """Build the limiter from `rate_limit` field lazily, the budget is shared by the same hook."""
+        if not hasattr(self, '_rate_limiter'):
+            cfg = getattr(self, 'cfg', None) or {}
+            limit_cfg = cfg.get('rate_limit', None)
+            if limit_cfg is None:
+                self._rate_limiter = None
+            else:
+                from oven.utils import get_home_path
+                from oven.utils.ratelimit import TokenBucket
+
+                self._rate_limiter = TokenBucket(
+                    key=str(cfg.get('hook', cfg.get('backend', ''))),
+                    capacity=limit_cfg['capacity'],
+                    period=limit_cfg['period'],
+                    state_dir=get_home_path() / 'ratelimit',
+                )
+        return self._rate_limiter
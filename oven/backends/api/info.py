@@ -1,6 +1,8 @@
+import copy
 import random
 import socket
-from typing import Optional, Dict
+import importlib
+from typing import Optional, Dict, Tuple
 from oven.utils.time import get_current_timestamp
 
 # fmt: off
@@ -62,6 +64,9 @@ class ExpInfoBase:
     information is updated. It's not necessary to be implemented.
     """
 
+    # Credentials in the meta information, never persisted by `to_payload()`.
+    SECRET_FIELDS: Tuple[str, ...] = ()
+
     def __init__(
         self,
         backend,
@@ -85,7 +90,50 @@ class ExpInfoBase:
         self.start_timestamp = self.current_timestamp
         self._safe_signal_handler()
 
+    @classmethod
+    async def acreate(
+        cls,
+        backend,
+        exp_meta_info: Dict = {},
+        description: Optional[str] = '',
+    ) -> 'ExpInfoBase':
+        """Async counterpart of the constructor, the initial signal is delivered without blocking the event loop."""
+        capture = _CaptureBackend(backend)
+        info = cls(capture, exp_meta_info, description)
+        info.backend = backend
+        for payload in capture.payloads:
+            payload.backend = backend
+            info._check_resp(await backend.adeliver(payload))
+        return info
+
+    @classmethod
+    def create_muted(
+        cls,
+        backend,
+        exp_meta_info: Dict = {},
+        description: Optional[str] = '',
+    ) -> 'ExpInfoBase':
+        """Create it without delivering the start signal, the following signals are delivered as usual."""
+        info = cls(_CaptureBackend(backend), exp_meta_info, description)
+        info.backend = backend
+        return info
+
     def _safe_signal_handler(self) -> None:
+        self._prepare_signal()
+
+        # Trigger notifier backend. It's the caller's thread, so at most `sync_max_attempts` attempts are
+        # made, the async mode and the daemon retry in their delivery thread instead.
+        if Signal.is_noisy(self.current_signal):
+            self._check_resp(self.backend.deliver(self, retry=False))
+
+    async def _asafe_signal_handler(self) -> None:
+        self._prepare_signal()
+
+        # Trigger notifier backend. Other tasks may update the signal while we are waiting, so freeze it.
+        if Signal.is_noisy(self.current_signal):
+            self._check_resp(await self.backend.adeliver(self.snapshot()))
+
+    def _prepare_signal(self) -> None:
         try:
             assert Signal.is_valid(self.current_signal), 'Invalid signal.'
             # Get trigger time.
@@ -103,13 +151,14 @@ class ExpInfoBase:
         finally:
             self.custom_signal_handler()
 
-        # Trigger notifier backend.
-        if Signal.is_noisy(self.current_signal):
-            resp = self.backend.notify(self)
-            if resp.has_err:
-                raise ConnectionError(
-                    f'Notifier backend error detected: {resp.err_msg}'
-                )
+    def _check_resp(self, resp) -> None:
+        if resp.has_err and getattr(resp, 'kept', False):
+            # It will be delivered by the next replay, nothing is lost.
+            print(f'Warning: Notifier backend error detected: {resp.err_msg}')
+        elif resp.has_err:
+            raise ConnectionError(
+                f'Notifier backend error detected: {resp.err_msg}'
+            )
 
     def update_signal(
         self, signal: int, description: Optional[str] = ''
@@ -120,6 +169,15 @@ class ExpInfoBase:
 
         self._safe_signal_handler()
 
+    async def aupdate_signal(
+        self, signal: int, description: Optional[str] = ''
+    ) -> None:
+        """Async counterpart of `update_signal()`."""
+        self.current_signal = signal
+        self.current_description = description
+
+        await self._asafe_signal_handler()
+
     # ========================================== #
     # Functions below should/can be overwritten. #
     # ========================================== #
@@ -135,6 +193,47 @@ class ExpInfoBase:
     def custom_signal_handler(self) -> None:
         """Extra process for different signals. Not necessary to be implemented."""
 
+    def snapshot(self) -> 'ExpInfoBase':
+        """
+        Freeze the current state so that it can be delivered later, e.g. by a background dispatcher. The
+        formatted fields are plain strings, so a shallow copy is enough for the built-in backends.
+        """
+        return copy.copy(self)
+
+    def to_payload(self) -> Dict:
+        """
+        Serialize the state to a JSON-compatible dict, so that it can be persisted or sent to another process.
+        The `SECRET_FIELDS` are left out, `from_payload()` gets them back from the backend's meta information.
+        """
+        state = {k: v for k, v in self.__dict__.items() if k != 'backend'}
+        meta = state.get('exp_meta_info', None)
+        if isinstance(meta, dict):
+            state['exp_meta_info'] = meta = dict(meta)
+        for field in self.SECRET_FIELDS:
+            for fields in (state, meta):
+                if isinstance(fields, dict) and field in fields:
+                    fields[field] = None
+        cls = type(self)
+        return {'cls': f'{cls.__module__}:{cls.__qualname__}', 'state': state}
+
+    @staticmethod
+    def from_payload(payload: Dict, backend) -> 'ExpInfoBase':
+        """Rebuild the information object from `to_payload()` without triggering any signal."""
+        module_name, cls_name = payload['cls'].split(':')
+        cls = getattr(importlib.import_module(module_name), cls_name)
+        info = cls.__new__(cls)
+        info.__dict__.update(payload['state'])
+        info.backend = backend
+
+        if cls.SECRET_FIELDS:
+            secrets = backend.get_meta()
+            meta = info.__dict__.get('exp_meta_info', None)
+            for field in cls.SECRET_FIELDS:
+                for fields in (info.__dict__, meta):
+                    if isinstance(fields, dict) and field in fields:
+                        fields[field] = secrets.get(field, None)
+        return info
+
 
 class LogInfoBase:
     """
@@ -166,3 +265,22 @@ class LogInfoBase:
         self.current_description = description
 
         self._safe_signal_handler()
+
+
+class _CaptureBackend:
+    """Record the snapshots instead of delivering them, so that they can be delivered asynchronously later."""
+
+    def __init__(self, backend) -> None:
+        self.backend = backend
+        self.payloads = []
+
+    def deliver(
+        self, info: ExpInfoBase, persist: bool = True, retry: bool = True
+    ):
+        from oven.backends.api import RespStatus
+
+        self.payloads.append(info.snapshot())
+        return RespStatus(has_err=False)
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__['backend'], name)
@@ -1,14 +1,16 @@
 import json
-import requests
 from typing import Union, Dict, Tuple
 
-from oven.consts import REQ_TIMEOUT
+from oven.utils.http import post
 from oven.backends.api import NotifierBackendBase, RespStatus
 
 from .info import DingTalkExpInfo, DingTalkLogInfo
 
 
 class DingTalkBackend(NotifierBackendBase):
+    # -1: system busy, 130101: sending too fast.
+    RETRYABLE_CODES = {-1, 130101}
+
     def __init__(self, cfg: Dict):
         # Validate the configuration.
         assert (
@@ -40,17 +42,24 @@ class DingTalkBackend(NotifierBackendBase):
         }
 
         # 2. Post request and get response.
-        has_err, err_msg = False, ''
+        has_err, err_msg, code, status_code = False, '', None, None
         try:
-            resp = requests.post(self.url, json=data, timeout=REQ_TIMEOUT)
+            resp = post(self.url, json=data)
+            status_code = resp.status_code
             resp_dict = json.loads(resp.text)
             has_err, err_msg = self._parse_resp(resp_dict)
+            code = resp_dict.get('errcode', None)
         except Exception as e:
             has_err = True
             err_msg = f'Cannot send message to DingTalk: {e}'
 
         # 3. Return response dict.
-        resp_status = RespStatus(has_err=has_err, err_msg=err_msg)
+        resp_status = RespStatus(
+            has_err=has_err,
+            err_msg=err_msg,
+            code=code,
+            status_code=status_code,
+        )
         return resp_status
 
     def get_meta(self) -> Dict:
@@ -72,3 +81,7 @@ class DingTalkBackend(NotifierBackendBase):
             msg = resp_dict['errmsg']
             has_err, err_msg = True, f'[{code}] {msg}'
         return has_err, err_msg
+
+
+# The triple registered under the `oven.backends` entry point group.
+BACKEND_CLASSES = (DingTalkBackend, DingTalkExpInfo, DingTalkLogInfo)
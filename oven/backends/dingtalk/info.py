@@ -21,6 +21,7 @@ LINE_SPLIT = '\n\n'
 
 
 class DingTalkExpInfo(ExpInfoBase):
+    SECRET_FIELDS = ('sec_key',)
 
     # ================ #
     # Pre-defined API. #
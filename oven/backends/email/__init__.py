@@ -7,6 +7,7 @@ from email.mime.multipart import MIMEMultipart
 
 from oven.backends.api import NotifierBackendBase, RespStatus
 from .info import EmailExpInfo, EmailLogInfo
+from .session import SMTPSession
 
 
 class EmailBackend(NotifierBackendBase):
@@ -35,6 +36,18 @@ class EmailBackend(NotifierBackendBase):
         self.sender_email = cfg['sender_email']
         self.sender_pwd = cfg['sender_pwd']
         self.receiver_email = cfg['receiver_email']
+        self.session = SMTPSession(
+            smtp_server=self.smtp_server,
+            smtp_port=self.smtp_port,
+            sender_email=self.sender_email,
+            sender_pwd=self.sender_pwd,
+            starttls=cfg.get('smtp_starttls', True),
+            idle_timeout=cfg.get('smtp_idle_timeout', 120),
+        )
+
+    def is_retryable(self, resp: RespStatus) -> bool:
+        """Network errors and transient (4xx) SMTP replies are retried, permanent (5xx) ones are not."""
+        return resp.code is None or 400 <= resp.code < 500
 
     def get_meta(self) -> Dict:
         """Generate meta information for information object."""
@@ -58,10 +71,7 @@ class EmailBackend(NotifierBackendBase):
             'card': info.format_information(),
         }
         # mail config
-        smtp_server = self.cfg['smtp_server']
-        smtp_port = self.cfg['smtp_port']
         sender_email = self.cfg['sender_email']
-        sender_password = self.cfg['sender_pwd']
         receiver_email = self.cfg['receiver_email']
 
         subject = formatted_data['card']['subject']
@@ -75,19 +85,22 @@ class EmailBackend(NotifierBackendBase):
 
         # Attach content
         msg.attach(MIMEText(content, 'plain'))
-        has_err, err_msg = False, ''
+        has_err, err_msg, code = False, '', None
         try:
-            # Connect to the SMTP server.
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()  # TLS encryption
-            server.login(sender_email, sender_password)  # login
-            # Sending
-            server.sendmail(sender_email, receiver_email, msg.as_string())
-            server.quit()
+            # Sending through the long-lived session.
+            self.session.sendmail(receiver_email, msg.as_string())
         except Exception as e:
             has_err = True
             err_msg = f'Cannot send email: {e}'
+            if isinstance(e, smtplib.SMTPResponseException):
+                code = e.smtp_code
+            elif isinstance(e, smtplib.SMTPRecipientsRefused):
+                code = 550
 
         # 3. Return response dict.
-        resp_status = RespStatus(has_err=has_err, err_msg=err_msg)
+        resp_status = RespStatus(has_err=has_err, err_msg=err_msg, code=code)
         return resp_status
+
+
+# The triple registered under the `oven.backends` entry point group.
+BACKEND_CLASSES = (EmailBackend, EmailExpInfo, EmailLogInfo)
@@ -15,6 +15,7 @@ def lines2reply(lines):
 
 
 class EmailExpInfo(ExpInfoBase):
+    SECRET_FIELDS = ('sender_pwd',)
 
     # ================ #
     # Pre-defined API. #
@@ -0,0 +1,158 @@
+import os
+import time
+import atexit
+import smtplib
+import threading
+from typing import Optional
+
+from oven.consts import REQ_READ_TIMEOUT
+from oven.utils.http import cap_timeout
+
+
+class SMTPSession:
+    """
+    A long-lived authenticated SMTP session.
+
+    The connection is opened (and `starttls()` + `login()` are done) lazily on the first message, then
+    reused by the following ones. A session that has been idle for a while is checked with `NOOP` before
+    reuse, and a timer closes it once it's idle for more than `idle_timeout` seconds, so that the server
+    isn't left holding it. If the server drops the connection anyway, the message is re-sent once over a
+    fresh session.
+    """
+
+    def __init__(
+        self,
+        smtp_server: str,
+        smtp_port: int,
+        sender_email: str,
+        sender_pwd: str,
+        starttls: bool = True,
+        idle_timeout: float = 120.0,
+        noop_after: float = 5.0,
+        timeout: float = REQ_READ_TIMEOUT,
+    ) -> None:
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.sender_email = sender_email
+        self.sender_pwd = sender_pwd
+        self.starttls = starttls
+        self.idle_timeout = idle_timeout
+        self.noop_after = noop_after
+        self.timeout = timeout
+
+        # Statistics.
+        self.n_connects = 0
+
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._pid = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+
+    def sendmail(self, receiver_email: str, msg: str) -> None:
+        with self._lock:
+            try:
+                self._get_smtp_for_send().sendmail(
+                    self.sender_email, receiver_email, msg
+                )
+            except smtplib.SMTPServerDisconnected:
+                # The server may close idle sessions silently, reconnect transparently once.
+                self._drop()
+                self._get_smtp_for_send().sendmail(
+                    self.sender_email, receiver_email, msg
+                )
+            self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._smtp is not None and self._pid == os.getpid():
+                try:
+                    self._smtp.quit()
+                except Exception:
+                    pass
+            self._smtp = None
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        if self._smtp is not None:
+            idle = time.monotonic() - self._last_used
+            if self._pid != os.getpid():
+                # The socket belongs to the parent process, never share it.
+                self._smtp = None
+            elif idle > self.idle_timeout:
+                self._drop()
+            elif idle > self.noop_after and not self._is_alive():
+                self._drop()
+
+        if self._smtp is None:
+            self._smtp = self._connect()
+            self._pid = os.getpid()
+            self._last_used = time.monotonic()
+            self._watch_idle(self._smtp, self.idle_timeout)
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+        return self._smtp
+
+    def _get_smtp_for_send(self) -> smtplib.SMTP:
+        smtp = self._get_smtp()
+        # The session outlives the delivery, so its timeout is capped again for each message.
+        if smtp.sock is not None:
+            smtp.sock.settimeout(cap_timeout(self.timeout))
+        return smtp
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(
+            self.smtp_server, self.smtp_port, timeout=cap_timeout(self.timeout)
+        )
+        try:
+            if self.starttls:
+                server.starttls()  # TLS encryption
+            server.login(self.sender_email, self.sender_pwd)  # login
+        except Exception:
+            server.close()
+            raise
+        self.n_connects += 1
+        return server
+
+    def _watch_idle(self, smtp: smtplib.SMTP, delay: float) -> None:
+        from oven.utils.scheduler import get_scheduler
+
+        get_scheduler().call_later(delay, lambda: self._close_if_idle(smtp))
+
+    def _close_if_idle(self, smtp: smtplib.SMTP) -> None:
+        # It runs on the scheduler thread, so it never waits for a message being sent, the timer is
+        # armed again instead.
+        if not self._lock.acquire(blocking=False):
+            self._watch_idle(smtp, self.idle_timeout)
+            return
+        try:
+            if self._smtp is not smtp or self._pid != os.getpid():
+                return  # replaced or dropped meanwhile, it has its own timer
+            idle = time.monotonic() - self._last_used
+            if idle < self.idle_timeout:
+                self._watch_idle(smtp, self.idle_timeout - idle)
+                return
+            # Without `QUIT`, waiting for the reply would hold the scheduler thread.
+            smtp.close()
+            self._smtp = None
+        finally:
+            self._lock.release()
+
+    def _is_alive(self) -> bool:
+        try:
+            return self._smtp.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _drop(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
@@ -5,14 +5,15 @@ import hashlib
 import hmac
 from datetime import datetime
 
-import requests
-
 from oven.backends.api import NotifierBackendBase, RespStatus
-from oven.consts import REQ_TIMEOUT
+from oven.utils.http import post
 from .info import FeishuExpInfo, FeishuLogInfo
 
 
 class FeishuBackend(NotifierBackendBase):
+    # 9499: too many requests, 11232: frequency limited.
+    RETRYABLE_CODES = {9499, 11232}
+
     def __init__(self, cfg: Dict):
         # Validate the configuration.
         assert (
@@ -53,19 +54,24 @@ class FeishuBackend(NotifierBackendBase):
             'card': info.format_information(),
         }
         # 2. Post request and get response.
-        has_err, err_msg = False, ''
+        has_err, err_msg, code, status_code = False, '', None, None
         try:
-            resp = requests.post(
-                self.url, json=formatted_data, timeout=REQ_TIMEOUT
-            )
+            resp = post(self.url, json=formatted_data)
+            status_code = resp.status_code
             resp_dict = json.loads(resp.text)
             has_err, err_msg = self._parse_resp(resp_dict)
+            code = resp_dict.get('code', None)
         except Exception as e:
             has_err = True
             err_msg = f'Cannot send message to Feishu: {e}'
 
         # 3. Return response dict.
-        resp_status = RespStatus(has_err=has_err, err_msg=err_msg)
+        resp_status = RespStatus(
+            has_err=has_err,
+            err_msg=err_msg,
+            code=code,
+            status_code=status_code,
+        )
         return resp_status
 
     def get_meta(self) -> Dict:
@@ -91,3 +97,7 @@ class FeishuBackend(NotifierBackendBase):
             msg = resp_dict['msg']
             has_err, err_msg = True, f'[{code}] {msg}'
         return has_err, err_msg
+
+
+# The triple registered under the `oven.backends` entry point group.
+BACKEND_CLASSES = (FeishuBackend, FeishuExpInfo, FeishuLogInfo)
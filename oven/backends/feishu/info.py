@@ -15,6 +15,7 @@ def lines2reply(lines):
 
 
 class FeishuExpInfo(ExpInfoBase):
+    SECRET_FIELDS = ('signature',)
 
     # ================ #
     # Pre-defined API. #
@@ -0,0 +1,129 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Type
+
+from oven.backends.api import (
+    NotifierBackendBase,
+    ExpInfoBase,
+    LogInfoBase,
+    RespStatus,
+)
+
+from .info import MultiExpInfo, MultiLogInfo
+
+
+class MultiBackend(NotifierBackendBase):
+    """
+    Fan out every signal to several backends concurrently. Each child backend keeps its own rate
+    limiter, retry policy and outbox, so the total latency is the one of the slowest backend.
+    """
+
+    def __init__(
+        self,
+        cfg: Dict,
+        children: List[
+            Tuple[NotifierBackendBase, Type[ExpInfoBase], Type[LogInfoBase]]
+        ],
+    ):
+        # Validate the configuration.
+        assert (
+            len(children) > 0
+        ), 'Please ensure at least one backend is listed in "backend" field in the configuration file!'
+
+        # Setup.
+        self.cfg = cfg
+        self.backends = [backend for backend, _, _ in children]
+        self.ExpInfoClasses = [ExpInfoClass for _, ExpInfoClass, _ in children]
+        self.LogInfoClasses = [LogInfoClass for _, _, LogInfoClass in children]
+
+        self._pool = None
+        self._pool_pid = None
+
+    def notify(self, info: MultiExpInfo) -> RespStatus:
+        return self._fan_out(lambda b, c: b.notify(c), info)
+
+    def deliver(
+        self, info: MultiExpInfo, persist: bool = True, retry: bool = True
+    ) -> RespStatus:
+        return self._fan_out(lambda b, c: b.deliver(c, persist, retry), info)
+
+    async def adeliver(
+        self, info: MultiExpInfo, persist: bool = True, retry: bool = True
+    ) -> RespStatus:
+        import asyncio
+
+        resps = await asyncio.gather(
+            *[
+                backend.adeliver(child, persist, retry)
+                for backend, child in zip(self.backends, info.children)
+            ],
+            return_exceptions=True,
+        )
+        return self._aggregate(
+            [
+                RespStatus(has_err=True, err_msg=f'{resp}')
+                if isinstance(resp, Exception)
+                else resp
+                for resp in resps
+            ]
+        )
+
+    def get_meta(self) -> Dict:
+        """Generate meta information for information object."""
+        return {
+            'children': [backend.get_meta() for backend in self.backends],
+            'backend': 'MultiBackend',
+        }
+
+    def find_backend(self, name: str) -> Optional[NotifierBackendBase]:
+        for backend in self.backends:
+            if backend.find_backend(name) is not None:
+                return backend
+        return None
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _fan_out(self, fn, info: MultiExpInfo) -> RespStatus:
+        if len(self.backends) == 1:
+            resps = [fn(self.backends[0], info.children[0])]
+        else:
+            futures = [
+                self._get_pool().submit(fn, backend, child)
+                for backend, child in zip(self.backends, info.children)
+            ]
+            resps = []
+            for future in futures:
+                try:
+                    resps.append(future.result())
+                except Exception as e:
+                    resps.append(RespStatus(has_err=True, err_msg=f'{e}'))
+        return self._aggregate(resps)
+
+    def _aggregate(self, resps: List[RespStatus]) -> RespStatus:
+        """Merge per-backend responses, it fails if any of the backends fails."""
+        names = [backend.cfg['backend'] for backend in self.backends]
+        err_msgs = [
+            f'[{name}] {resp.err_msg}'
+            for name, resp in zip(names, resps)
+            if resp.has_err
+        ]
+        resp_status = RespStatus(
+            has_err=len(err_msgs) > 0, err_msg='; '.join(err_msgs)
+        )
+        resp_status.attempts = max(resp.attempts for resp in resps)
+        resp_status.latency = max(resp.latency for resp in resps)
+        resp_status.wait_time = max(resp.wait_time for resp in resps)
+        resp_status.details = dict(zip(names, resps))
+        return resp_status
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        # Worker threads don't survive `fork()`.
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ThreadPoolExecutor(
+                max_workers=len(self.backends),
+                thread_name_prefix='oven-fan-out',
+            )
+            self._pool_pid = os.getpid()
+        return self._pool
@@ -0,0 +1,81 @@
+from typing import Dict, List
+
+from oven.backends.api import Signal, ExpInfoBase, LogInfoBase, RespStatus
+
+
+class _MutedBackend:
+    """Child information objects only format themselves, the parent delivers them together."""
+
+    def deliver(
+        self, info: ExpInfoBase, persist: bool = True, retry: bool = True
+    ) -> RespStatus:
+        return RespStatus(has_err=False)
+
+    async def adeliver(
+        self, info: ExpInfoBase, persist: bool = True, retry: bool = True
+    ) -> RespStatus:
+        return RespStatus(has_err=False)
+
+
+_MUTED_BACKEND = _MutedBackend()
+
+
+class MultiExpInfo(ExpInfoBase):
+    """
+    It holds one child information object per backend, each one is formatted by its own backend's
+    information class. Signals are forwarded to all the children, and `MultiBackend` delivers them.
+    """
+
+    # ================ #
+    # Pre-defined API. #
+    # ================ #
+
+    def format_information(self) -> List:
+        return [child.format_information() for child in self.children]
+
+    def custom_signal_handler(self) -> None:
+        # Initialization, the children are created with the first noisy signal.
+        if self.current_signal == Signal.I:
+            self.children = []
+            return
+
+        if len(self.children) == 0:
+            self.children = self._init_children()
+        else:
+            for child in self.children:
+                child.current_signal = self.current_signal
+                child.current_description = self.current_description
+                child._safe_signal_handler()
+
+    def snapshot(self) -> 'MultiExpInfo':
+        info = super().snapshot()
+        info.children = [child.snapshot() for child in self.children]
+        return info
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _get_child_classes(self) -> List:
+        return self.backend.ExpInfoClasses
+
+    def _init_children(self) -> List[ExpInfoBase]:
+        children = []
+        for InfoClass, meta in zip(
+            self._get_child_classes(), self.exp_meta_info['children']
+        ):
+            meta = dict(meta)
+            meta['cmd'] = self.exp_meta_info.get('cmd', '')
+            children.append(
+                InfoClass(
+                    backend=_MUTED_BACKEND,
+                    exp_meta_info=meta,
+                    description=self.current_description,
+                )
+            )
+        return children
+
+
+class MultiLogInfo(LogInfoBase, MultiExpInfo):
+    def _get_child_classes(self) -> List:
+        return self.backend.LogInfoClasses
@@ -0,0 +1,123 @@
+import sys
+from typing import Dict, List, Tuple, Type
+
+from oven.backends.api import NotifierBackendBase, ExpInfoBase, LogInfoBase
+
+ENTRY_POINT_GROUP = 'oven.backends'
+
+BackendClasses = Tuple[
+    Type[NotifierBackendBase], Type[ExpInfoBase], Type[LogInfoBase]
+]
+
+# Built-in backends are resolved without scanning the installed distributions, they are declared as
+# entry points in `setup.py` as well, as an example for third-party backends.
+_BUILTIN_BACKENDS = {
+    'dingtalk': 'oven.backends.dingtalk:BACKEND_CLASSES',
+    'feishu': 'oven.backends.feishu:BACKEND_CLASSES',
+    'slack': 'oven.backends.slack:BACKEND_CLASSES',
+    'email': 'oven.backends.email:BACKEND_CLASSES',
+}
+
+# Backends registered at runtime, and the ones already loaded.
+_registered: Dict[str, BackendClasses] = {}
+# Entry points discovered from the metadata, the backend modules are not imported yet.
+_entry_points = None
+
+
+def register_backend(
+    name: str,
+    BackendClass: Type[NotifierBackendBase],
+    ExpInfoClass: Type[ExpInfoBase],
+    LogInfoClass: Type[LogInfoBase],
+) -> None:
+    """Register a backend at runtime, it can then be used by its name in the configuration file."""
+    _registered[name] = _validate(
+        name, (BackendClass, ExpInfoClass, LogInfoClass)
+    )
+
+
+def load_backend(name: str) -> BackendClasses:
+    """Import the backend class and its information classes by the backend name."""
+    if name in _registered:
+        return _registered[name]
+
+    if name in _BUILTIN_BACKENDS:
+        backend_classes = _load_object(_BUILTIN_BACKENDS[name])
+    else:
+        entry_points = _get_entry_points()
+        if name not in entry_points:
+            raise NotImplementedError(
+                f'Notifier backend `{name}` is not supported yet.'
+            )
+        try:
+            backend_classes = entry_points[name].load()
+        except Exception as e:
+            raise ImportError(
+                f'Notifier backend `{name}` could not be loaded from `{entry_points[name].value}`: {e}'
+            ) from e
+
+    _registered[name] = _validate(name, backend_classes)
+    return _registered[name]
+
+
+def list_backends() -> List[str]:
+    """List the names of all available backends."""
+    return sorted(
+        set(_BUILTIN_BACKENDS) | set(_get_entry_points()) | set(_registered)
+    )
+
+
+# ================ #
+# Utils functions. #
+# ================ #
+
+
+def _get_entry_points() -> Dict:
+    """Read the entry points from the installed distributions' metadata, only once."""
+    global _entry_points
+    if _entry_points is None:
+        from importlib import metadata
+
+        if sys.version_info >= (3, 10):
+            eps = metadata.entry_points(group=ENTRY_POINT_GROUP)
+        else:
+            eps = metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+        _entry_points = {}
+        for ep in eps:
+            # Built-in backends can't be shadowed, and the first declaration wins a name clash.
+            if ep.name in _BUILTIN_BACKENDS:
+                continue
+            if ep.name in _entry_points:
+                if ep.value != _entry_points[ep.name].value:
+                    print(
+                        f'Warning: Backend `{ep.name}` is declared by several packages, '
+                        f'`{_entry_points[ep.name].value}` is used.'
+                    )
+                continue
+            _entry_points[ep.name] = ep
+    return _entry_points
+
+
+def _load_object(path: str):
+    import importlib
+
+    module_name, attr = path.split(':')
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _validate(name: str, backend_classes) -> BackendClasses:
+    assert (
+        isinstance(backend_classes, (tuple, list))
+        and len(backend_classes) == 3
+    ), f'Backend `{name}` should be registered as a triple (BackendClass, ExpInfoClass, LogInfoClass)!'
+    BackendClass, ExpInfoClass, LogInfoClass = backend_classes
+    assert issubclass(
+        BackendClass, NotifierBackendBase
+    ), f'`{BackendClass.__name__}` of backend `{name}` should inherit `NotifierBackendBase`!'
+    assert issubclass(
+        ExpInfoClass, ExpInfoBase
+    ), f'`{ExpInfoClass.__name__}` of backend `{name}` should inherit `ExpInfoBase`!'
+    assert issubclass(
+        LogInfoClass, LogInfoBase
+    ), f'`{LogInfoClass.__name__}` of backend `{name}` should inherit `LogInfoBase`!'
+    return tuple(backend_classes)
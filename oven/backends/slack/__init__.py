@@ -1,8 +1,7 @@
 import json
-import requests
 from typing import Union, Dict, Tuple
 
-from oven.consts import REQ_TIMEOUT
+from oven.utils.http import post
 from oven.backends.api import NotifierBackendBase, RespStatus
 
 from .info import SlackExpInfo, SlackLogInfo
@@ -29,16 +28,19 @@ class SlackBackend(NotifierBackendBase):
         data = info.format_information()
 
         # 2. Post request and get response.
-        has_err, err_msg = False, ''
+        has_err, err_msg, status_code = False, '', None
         try:
-            resp = requests.post(self.url, json=data, timeout=REQ_TIMEOUT)
+            resp = post(self.url, json=data)
+            status_code = resp.status_code
             has_err, err_msg = self._parse_resp(resp.text)
         except Exception as e:
             has_err = True
             err_msg = f'Cannot send message to Slack: {e}'
 
         # 3. Return response dict.
-        resp_status = RespStatus(has_err=has_err, err_msg=err_msg)
+        resp_status = RespStatus(
+            has_err=has_err, err_msg=err_msg, status_code=status_code
+        )
         return resp_status
 
     def get_meta(self) -> Dict:
@@ -57,3 +59,7 @@ class SlackBackend(NotifierBackendBase):
         if resp_content != 'ok':
             has_err, err_msg = True, resp_content
         return has_err, err_msg
+
+
+# The triple registered under the `oven.backends` entry point group.
+BACKEND_CLASSES = (SlackBackend, SlackExpInfo, SlackLogInfo)
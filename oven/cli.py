@@ -80,6 +80,15 @@ def oven() -> None:
             print(f'😵‍💫 Unexpected argument {args[1:]}!')
         else:
             toggle_backend(args[0])
+    elif action == 'flush-outbox':
+        import oven
+
+        n_sent, n_left = oven.get_lazy_oven().flush_outbox()
+        print(f'📮 {n_sent} notification(s) sent, {n_left} left in the outbox.')
+    elif action == 'serve':
+        from oven.daemon import serve
+
+        serve()
     elif action == 'home':
         from oven.utils import get_home_path
 
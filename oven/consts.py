@@ -5,3 +5,6 @@ CFG_TEMP_URL = 'https://raw.githubusercontent.com/IsshikiHugh/ExpOven/refs/heads
 OVEN_VERSION_URL = 'https://raw.githubusercontent.com/IsshikiHugh/ExpOven/refs/heads/main/oven/version.py'
 
 REQ_TIMEOUT = 60 * 3  # in seconds
+REQ_CONNECT_TIMEOUT = 10  # in seconds
+REQ_READ_TIMEOUT = 60  # in seconds
+HTTP_POOL_SIZE = 4  # keep-alive connections per host
@@ -0,0 +1,363 @@
+import os
+import sys
+import json
+import uuid
+import signal
+import socket
+import struct
+import threading
+import socketserver
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from oven.backends.api import (
+    NotifierBackendBase,
+    ExpInfoBase,
+    LogInfoBase,
+    RespStatus,
+    Signal,
+)
+from oven.oven import Oven, build_oven
+from oven.dispatcher import QueuedBackend
+from oven.utils import get_home_path, get_cfg_path
+from oven.utils.cfg_cache import load_cfg
+
+_HEADER = struct.Struct('>I')  # length of the JSON body
+# Signals are acked once they are queued by the daemon, only replaying the outbox may take longer.
+_CLIENT_TIMEOUT = 10.0
+
+
+def get_socket_path() -> Path:
+    return get_home_path() / 'oven.sock'
+
+
+# =============== #
+# Event handling. #
+# =============== #
+
+
+class EventSink:
+    """
+    Replay the event frames on a real `Oven`. Each experiment of the clients is mapped to an information
+    object here, so the messages are formatted and delivered exactly like in a standalone process.
+    """
+
+    def __init__(self, oven: Oven) -> None:
+        self.oven = oven
+        self.infos: Dict[str, ExpInfoBase] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, event: Dict) -> Dict:
+        op = event.get('op', None)
+        try:
+            if op == 'signal':
+                self._on_signal(event)
+                return {'ok': True}
+            elif op == 'flush_outbox':
+                n_sent, n_left = self.oven.flush_outbox()
+                return {'ok': True, 'n_sent': n_sent, 'n_left': n_left}
+            elif op == 'ping':
+                return {'ok': True, 'pid': os.getpid()}
+            else:
+                return {'ok': False, 'err_msg': f'Unknown operation `{op}`.'}
+        except Exception as e:
+            return {'ok': False, 'err_msg': f'{e}'}
+
+    def discard(self, keys) -> None:
+        """Forget the experiments, e.g. when the client disconnects without terminating them."""
+        with self._lock:
+            for key in keys:
+                self.infos.pop(key, None)
+
+    def _on_signal(self, event: Dict) -> None:
+        key, sig = event['id'], event['signal']
+        description = event.get('description', '')
+        with self._lock:
+            info = self.infos.get(key, None)
+
+        if info is None:
+            # Constructing the information object delivers the start signal, or the terminate signal for logs.
+            # An experiment first seen after its start, e.g. an exception of a quiet rank, or one started on
+            # the daemon before this sink took over, doesn't deliver its start again.
+            meta = self.oven.backend.get_meta()
+            meta['cmd'] = event.get('cmd', '')
+            if event.get('log', False):
+                create_info = self.oven.LogInfoClass
+            elif sig != Signal.S:
+                create_info = self.oven.ExpInfoClass.create_muted
+            else:
+                create_info = self.oven.ExpInfoClass
+            info = create_info(
+                backend=self.oven.backend,
+                exp_meta_info=meta,
+                description=description,
+            )
+            if not event.get('log', False):
+                with self._lock:
+                    self.infos[key] = info
+                if sig != Signal.S:
+                    info.update_signal(signal=sig, description=description)
+        else:
+            info.update_signal(signal=sig, description=description)
+
+        if sig in [Signal.T, Signal.E]:
+            with self._lock:
+                self.infos.pop(key, None)
+
+
+def _send_frame(sock: socket.socket, obj: Dict) -> None:
+    body = json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> Optional[bytes]:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None  # closed by peer
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv_frame(sock: socket.socket) -> Optional[Dict]:
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    body = _recv_exactly(sock, _HEADER.unpack(header)[0])
+    if body is None:
+        return None
+    return json.loads(body.decode('utf-8'))
+
+
+# ======= #
+# Client. #
+# ======= #
+
+
+class DaemonClient:
+    """A persistent connection to the daemon, it's re-opened after `fork()`."""
+
+    def __init__(self, path: Path, timeout: float = _CLIENT_TIMEOUT) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._sock = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def request(self, event: Dict, long_running: bool = False) -> Dict:
+        """Send the event and wait for the answer, at most `timeout` seconds unless it's `long_running`."""
+        with self._lock:
+            try:
+                sock = self._get_sock()
+                sock.settimeout(None if long_running else self.timeout)
+                _send_frame(sock, event)
+                resp = _recv_frame(sock)
+                if resp is None:
+                    raise ConnectionError('Oven daemon closed the connection.')
+                return resp
+            except OSError:
+                self._close()
+                raise
+
+    def _get_sock(self) -> socket.socket:
+        if self._sock is None or self._pid != os.getpid():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(str(self.path))
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+            self._pid = os.getpid()
+        return self._sock
+
+    def _close(self) -> None:
+        if self._sock is not None and self._pid == os.getpid():
+            self._sock.close()
+        self._sock = None
+
+
+class RemoteExpInfo(ExpInfoBase):
+    """Only the signals are tracked in the client, the daemon formats the message with its own backend."""
+
+    def __init__(
+        self,
+        backend,
+        exp_meta_info: Dict = {},
+        description: Optional[str] = '',
+    ) -> None:
+        self.remote_id = uuid.uuid4().hex
+        super().__init__(backend, exp_meta_info, description)
+
+    def format_information(self) -> str:
+        return self.current_description
+
+    def to_event(self) -> Dict:
+        return {
+            'op': 'signal',
+            'id': self.remote_id,
+            'signal': self.current_signal,
+            'description': self.current_description,
+            'cmd': self.exp_meta_info.get('cmd', ''),
+            'log': isinstance(self, LogInfoBase),
+        }
+
+
+class RemoteLogInfo(LogInfoBase, RemoteExpInfo):
+    def __init__(
+        self,
+        backend,
+        exp_meta_info: Optional[Dict] = None,
+        description: Optional[str] = '',
+    ) -> None:
+        self.remote_id = uuid.uuid4().hex
+        LogInfoBase.__init__(self, backend, exp_meta_info, description)
+
+
+class DaemonBackend(NotifierBackendBase):
+    """
+    Forward the signals to the daemon, which rate-limits, retries and delivers them. If the daemon goes
+    away, the following signals are delivered directly from this process.
+    """
+
+    def __init__(self, client: DaemonClient) -> None:
+        self.cfg = {'backend': 'daemon'}
+        self.client = client
+        self._fallback = None
+
+    def notify(self, info: RemoteExpInfo) -> RespStatus:
+        resp = self.request(info.to_event())
+        return RespStatus(
+            has_err=not resp['ok'], err_msg=resp.get('err_msg', '')
+        )
+
+    def deliver(
+        self, info: RemoteExpInfo, persist: bool = True, retry: bool = True
+    ) -> RespStatus:
+        # Retrying and the outbox are taken care of by the daemon.
+        return self.notify(info)
+
+    def get_meta(self) -> Dict:
+        return {'backend': 'DaemonBackend'}
+
+    def request(self, event: Dict, long_running: bool = False) -> Dict:
+        if self._fallback is None:
+            try:
+                return self.client.request(event, long_running)
+            except socket.timeout as e:
+                # The daemon is alive but busy, and it may still deliver the event, so never deliver it here.
+                return {
+                    'ok': False,
+                    'err_msg': f'Oven daemon did not answer in time ({e}).',
+                }
+            except OSError as e:
+                try:
+                    # Not `build_oven()`, which exits on an invalid configuration.
+                    fallback = EventSink(Oven(load_cfg(get_cfg_path())))
+                except Exception as build_e:
+                    return {
+                        'ok': False,
+                        'err_msg': f'Oven daemon is not available ({e}), and cannot deliver directly: {build_e}',
+                    }
+                print(
+                    f'Warning: Oven daemon is not available ({e}), delivering directly.'
+                )
+                self._fallback = fallback
+        return self._fallback.handle(event)
+
+
+class DaemonOven(Oven):
+    """An `Oven` whose notifications are formatted and delivered by the daemon."""
+
+    def __init__(self, client: DaemonClient) -> None:
+        self.cfg = {'backend': 'daemon'}
+        self.root_cfg = self.cfg
+        self.ExpInfoClass = RemoteExpInfo
+        self.LogInfoClass = RemoteLogInfo
+        self.backend = DaemonBackend(client)
+
+    def flush_outbox(self) -> Tuple[int, int]:
+        # The daemon replays synchronously, it may take much longer than a signal.
+        resp = self.backend.request({'op': 'flush_outbox'}, long_running=True)
+        if not resp['ok']:
+            raise RuntimeError(resp.get('err_msg', ''))
+        return resp['n_sent'], resp['n_left']
+
+
+def connect_daemon() -> Optional[DaemonOven]:
+    """Connect to the daemon under `OVEN_HOME` if it's running, None otherwise."""
+    if not hasattr(socket, 'AF_UNIX') or os.environ.get('OVEN_NO_DAEMON'):
+        return None
+    path = get_socket_path()
+    if not path.exists():
+        return None
+    client = DaemonClient(path)
+    try:
+        client.request({'op': 'ping'})
+    except OSError:
+        return None  # stale socket
+    return DaemonOven(client)
+
+
+# ======= #
+# Server. #
+# ======= #
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        keys = set()
+        while True:
+            try:
+                event = _recv_frame(self.request)
+            except (OSError, ValueError):
+                break
+            if event is None:
+                break
+            if event.get('op', None) == 'signal':
+                keys.add(event['id'])
+            _send_frame(self.request, self.server.sink.handle(event))
+        self.server.sink.discard(keys)
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve() -> None:
+    """Serve the processes on this host until interrupted, notifications are delivered asynchronously."""
+    if not hasattr(socket, 'AF_UNIX'):
+        raise NotImplementedError(
+            'Oven daemon requires Unix domain sockets, which are not supported on this platform.'
+        )
+
+    path = get_socket_path()
+    if path.exists():
+        if connect_daemon() is not None:
+            print(f'😵‍💫 Oven daemon is already running at {path}!')
+            return
+        path.unlink()  # left by a dead daemon
+
+    oven = build_oven()
+    if not isinstance(oven.backend, QueuedBackend):
+        delivery_cfg = dict(oven.root_cfg.get('delivery', None) or {})
+        delivery_cfg['mode'] = 'async'
+        oven._init_delivery(delivery_cfg)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    server = _Server(str(path), _Handler)
+    os.chmod(path, 0o600)
+    server.sink = EventSink(oven)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    print(f'🍞 Oven daemon is serving at {path}, press Ctrl+C to stop.')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        # The pending notifications are flushed at exit by the dispatcher.
+        path.unlink(missing_ok=True)
@@ -0,0 +1,250 @@
+import os
+import time
+import atexit
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+from oven.backends.api import (
+    NotifierBackendBase,
+    ExpInfoBase,
+    RespStatus,
+    Signal,
+)
+
+
+class _Entry:
+    __slots__ = ('info', 'payload')
+
+    def __init__(self, info: ExpInfoBase, payload: ExpInfoBase) -> None:
+        # Keep the source alive, so that `id(info)` is a stable key.
+        self.info = info
+        self.payload = payload
+
+
+class Dispatcher:
+    """
+    A bounded in-process delivery queue drained by a single daemon thread.
+
+    Signals are snapshotted when they are submitted, so the caller only pays for a shallow copy and a
+    deque append. The dispatcher thread then calls `backend.deliver()` on the snapshots in FIFO order.
+
+    Progress signals are coalesced per experiment (i.e. per ExpInfo instance): a pending P signal is
+    replaced in place by a newer one, so a slow backend receives at most one P per experiment at a time.
+    S, T and E signals are never coalesced nor reordered. When the queue is full, pending P signals are
+    evicted to make room for the others, and only what still doesn't fit is dropped and counted.
+    """
+
+    def __init__(
+        self,
+        backend: NotifierBackendBase,
+        queue_size: int = 1024,
+        flush_timeout: Optional[float] = 10.0,
+        coalesce: bool = True,
+        replay_interval: float = 30.0,
+    ) -> None:
+        self.backend = backend
+        self.queue_size = queue_size
+        self.flush_timeout = flush_timeout
+        self.coalesce = coalesce
+        self.replay_interval = replay_interval
+
+        # Statistics.
+        self.n_delivered = 0
+        self.n_failed = 0
+        self.n_dropped = 0
+        self.n_coalesced = 0
+
+        self._next_replay = 0.0
+        self._reset()
+        # The pooled HTTP session is closed by an exit hook registered when its module is imported, which
+        # must run after the flush, i.e. be registered before it.
+        import oven.utils.http
+
+        atexit.register(self._flush_at_exit)
+        # Threads (and possibly held locks) don't survive `fork()`, the child starts from a clean state.
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def submit(self, info: ExpInfoBase) -> bool:
+        """Snapshot the information and enqueue it. Return False if it's dropped."""
+        payload = info.snapshot()
+        key = id(info)
+        is_progress = self.coalesce and payload.current_signal == Signal.P
+        with self._cond:
+            self._ensure_thread()
+
+            if is_progress and key in self._pending_p:
+                # Replace the stale progress in place, the position in queue is kept.
+                self._pending_p[key].payload = payload
+                self.n_coalesced += 1
+                return True
+
+            if len(self._queue) >= self.queue_size and (
+                is_progress or not self._evict_progress()
+            ):
+                self.n_dropped += 1
+                return False
+
+            entry = _Entry(info, payload)
+            self._queue.append(entry)
+            if is_progress:
+                self._pending_p[key] = entry
+            else:
+                # Later progress must not jump over this signal.
+                self._pending_p.pop(key, None)
+            self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all the queued payloads are delivered. Return False if it times out."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while len(self._queue) > 0 or self._n_in_flight > 0:
+                if deadline is None:
+                    self._cond.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+        return True
+
+    @property
+    def depth(self) -> int:
+        """Number of payloads waiting for delivery."""
+        return len(self._queue) + self._n_in_flight
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _reset(self) -> None:
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._pending_p = {}  # id(info) -> queued entry of P signal
+        self._n_in_flight = 0
+        self._thread = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._worker, name='oven-dispatcher', daemon=True
+            )
+            self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while len(self._queue) == 0:
+                    self._cond.wait()
+                entry = self._queue.popleft()
+                key = id(entry.info)
+                if self._pending_p.get(key, None) is entry:
+                    del self._pending_p[key]
+                self._n_in_flight += 1
+
+            self._deliver(entry.payload)
+
+            with self._cond:
+                self._n_in_flight -= 1
+                self._cond.notify_all()
+
+    def _evict_progress(self) -> bool:
+        """Drop the oldest pending progress signal to make room. Return False if there is none."""
+        for entry in self._queue:
+            key = id(entry.info)
+            if self._pending_p.get(key, None) is entry:
+                del self._pending_p[key]
+                self._queue.remove(entry)
+                self.n_dropped += 1
+                return True
+        return False
+
+    def _replay_outbox(self) -> None:
+        """Send the notifications kept in the outbox first, so that the order is preserved."""
+        outbox = self.backend.outbox
+        if outbox is None or time.monotonic() < self._next_replay:
+            return
+        self._next_replay = time.monotonic() + self.replay_interval
+        try:
+            outbox.replay(self.backend.find_backend)
+        except Exception as e:
+            print(f'Warning: Failed to replay the outbox: {e}')
+
+    def _deliver(self, payload: ExpInfoBase) -> None:
+        self._replay_outbox()
+        try:
+            resp = self.backend.deliver(payload)
+        except Exception as e:
+            resp = RespStatus(has_err=True, err_msg=f'{e}')
+
+        if resp.has_err:
+            self.n_failed += 1
+            print(
+                f'Warning: Failed to deliver notification after {resp.attempts} attempt(s): {resp.err_msg}'
+            )
+        else:
+            self.n_delivered += 1
+
+    def _flush_at_exit(self) -> None:
+        if not self.flush(timeout=self.flush_timeout):
+            print(
+                f'Warning: {self.depth} notification(s) are not delivered before exit.'
+            )
+
+
+class QueuedBackend(NotifierBackendBase):
+    """
+    Wrap a backend so that `notify()` returns immediately and the real delivery happens on the dispatcher
+    thread. Everything else is forwarded to the wrapped backend.
+    """
+
+    def __init__(self, backend: NotifierBackendBase, cfg: Dict) -> None:
+        self.backend = backend
+        self.dispatcher = Dispatcher(
+            backend,
+            queue_size=cfg.get('queue_size', 1024),
+            flush_timeout=cfg.get('flush_timeout', 10.0),
+            coalesce=cfg.get('coalesce', True),
+        )
+        # `n_dropped` also counts the evicted progress, which are not worth a warning.
+        self._warned_drop = False
+
+    def notify(self, info: ExpInfoBase) -> RespStatus:
+        if not self.dispatcher.submit(info) and not self._warned_drop:
+            # Never raise into the caller, just warn once.
+            self._warned_drop = True
+            print(
+                'Warning: Delivery queue is full, notifications are dropped.'
+            )
+        return RespStatus(has_err=False)
+
+    def deliver(
+        self, info: ExpInfoBase, persist: bool = True, retry: bool = True
+    ) -> RespStatus:
+        # The rate limiter, retries and the outbox are applied on the dispatcher thread, never in the caller.
+        return self.notify(info)
+
+    async def adeliver(
+        self, info: ExpInfoBase, persist: bool = True, retry: bool = True
+    ) -> RespStatus:
+        # Enqueuing never blocks, so there is no need to leave the event loop.
+        return self.notify(info)
+
+    def get_meta(self) -> Dict:
+        return self.backend.get_meta()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return self.dispatcher.flush(timeout)
+
+    def __getattr__(self, name):
+        # Only called when the attribute is missing on the wrapper itself. Before `__init__()`, e.g. while
+        # copying or unpickling, there is no backend to forward to yet.
+        try:
+            backend = object.__getattribute__(self, 'backend')
+        except AttributeError:
+            raise AttributeError(
+                f'{type(self).__name__!r} object has no attribute {name!r}'
+            ) from None
+        return getattr(backend, name)
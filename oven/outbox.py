@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from oven.backends.api import NotifierBackendBase, ExpInfoBase
+
+try:
+    import fcntl
+except ImportError:  # Windows, the replays are only serialized inside the process.
+    fcntl = None
+
+
+class Outbox:
+    """
+    Durable on-disk outbox for undelivered notifications.
+
+    Payloads are appended to a SQLite database in WAL mode with `synchronous=NORMAL`. Every append is
+    its own small transaction, but it's only written to the WAL, and the fsync happens in batches at
+    checkpoints, so appending is cheap for the caller while a crash of the process loses nothing.
+    The outbox keeps at most `max_entries` payloads no older than `max_age` seconds, the oldest ones
+    are evicted first. `replay()` re-sends the payloads in order and stops at the first failure. One
+    replay runs at a time on the host, so that no payload is sent twice by concurrent processes.
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        max_entries: int = 1000,
+        max_age: float = 7 * 24 * 3600,
+    ) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_age = max_age
+
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+        # One replay at a time in this process, e.g. `flush-outbox` on the daemon while it delivers.
+        self._replay_lock = threading.Lock()
+
+    def append(self, backend_name: str, info: ExpInfoBase) -> None:
+        """Persist an undelivered information."""
+        payload = json.dumps(
+            info.to_payload(), ensure_ascii=False, default=str
+        )
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                conn.execute(
+                    'INSERT INTO outbox (created, backend, payload) VALUES (?, ?, ?)',
+                    (time.time(), backend_name, payload),
+                )
+                self._evict(conn)
+
+    def replay(
+        self, get_backend: Callable[[str], Optional[NotifierBackendBase]]
+    ) -> Tuple[int, int]:
+        """
+        Re-send the payloads in order. `get_backend` maps the backend name to a backend, payloads whose
+        backend is not available are kept. Return the number of sent and left payloads.
+        """
+        with self._replay_lock:
+            # The lock file is not the database itself, SQLite has its own locks on it.
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(f'{self.path}.lock', os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                return self._replay(get_backend)
+            finally:
+                os.close(fd)  # releases the lock
+
+    def __len__(self) -> int:
+        with self._lock:
+            return (
+                self._get_conn()
+                .execute('SELECT COUNT(*) FROM outbox')
+                .fetchone()[0]
+            )
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _replay(
+        self, get_backend: Callable[[str], Optional[NotifierBackendBase]]
+    ) -> Tuple[int, int]:
+        n_sent = 0
+        last_id = 0
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                self._evict(conn)
+        while True:
+            with self._lock:
+                row = (
+                    self._get_conn()
+                    .execute(
+                        'SELECT id, backend, payload FROM outbox WHERE id > ? ORDER BY id LIMIT 1',
+                        (last_id,),
+                    )
+                    .fetchone()
+                )
+            if row is None:
+                break
+            last_id, backend_name, payload = row
+            backend = get_backend(backend_name)
+            if backend is None:
+                continue
+
+            info = ExpInfoBase.from_payload(json.loads(payload), backend)
+            resp = backend.deliver(info, persist=False)
+            if resp.has_err:
+                break  # keep the order, try again later
+            with self._lock:
+                conn = self._get_conn()
+                with conn:
+                    conn.execute('DELETE FROM outbox WHERE id = ?', (last_id,))
+            n_sent += 1
+        return n_sent, len(self)
+
+    def _get_conn(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared across `fork()`.
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Only readable by the owner, SQLite creates the WAL files with the same mode.
+            os.close(os.open(str(self.path), os.O_CREAT | os.O_RDWR, 0o600))
+            os.chmod(str(self.path), 0o600)
+            conn = sqlite3.connect(
+                str(self.path), timeout=30, check_same_thread=False
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS outbox ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'created REAL NOT NULL, '
+                'backend TEXT NOT NULL, '
+                'payload TEXT NOT NULL)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS outbox_created ON outbox (created)'
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            'DELETE FROM outbox WHERE created < ?',
+            (time.time() - self.max_age,),
+        )
+        conn.execute(
+            'DELETE FROM outbox WHERE id <= (SELECT MAX(id) FROM outbox) - ?',
+            (self.max_entries,),
+        )
+
+
+def build_outbox(cfg: Optional[Dict]) -> Optional[Outbox]:
+    """Build the outbox under `OVEN_HOME` according to the `outbox` section, None if it's disabled."""
+    if cfg is None or not cfg.get('enabled', False):
+        return None
+    from oven.utils import get_home_path
+
+    return Outbox(
+        get_home_path() / 'outbox.db',
+        max_entries=cfg.get('max_entries', 1000),
+        max_age=cfg.get('max_age', 7 * 24 * 3600),
+    )
@@ -1,64 +1,106 @@
 import sys
 import traceback
 import subprocess
-from typing import Type, Callable, Any, Union
+from typing import Type, Callable, Any, Union, Optional, Tuple, List
 from pathlib import Path
-from omegaconf import OmegaConf
 
 from oven.backends.api import (
     NotifierBackendBase,
     ExpInfoBase,
     LogInfoBase,
+    RetryPolicy,
     Signal,
 )
 from oven.utils import get_cfg_path
+from oven.utils.cfg_cache import load_cfg
+from oven.utils.http import configure_http
+from oven.utils.dist import should_deliver, format_rank
+from oven.backends.registry import load_backend
+from oven.dispatcher import QueuedBackend
+from oven.outbox import build_outbox
 
 
 class Oven:
     def __init__(self, cfg) -> None:
         self.cfg = cfg
+        self.root_cfg = cfg
+        delivery_cfg = cfg.get('delivery', None) or {}
+        configure_http(cfg.get('http', None))
 
         # Register some important classes.
         self.ExpInfoClass: Type[ExpInfoBase]
         self.LogInfoClass: Type[LogInfoBase]
         self.backend: NotifierBackendBase
         self._init_notifier()
+        self._init_retry(cfg.get('retry', None))
+        self._init_outbox(cfg.get('outbox', None))
+        self._init_delivery(delivery_cfg)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the queued notifications are delivered. Always True in sync mode."""
+        if isinstance(self.backend, QueuedBackend):
+            return self.backend.flush(timeout)
+        return True
+
+    def flush_outbox(self) -> Tuple[int, int]:
+        """Re-send the notifications kept in the outbox in order. Return the number of sent and left ones."""
+        backend = self.backend
+        if isinstance(backend, QueuedBackend):
+            backend = backend.backend  # replay synchronously
+        if backend.outbox is None:
+            return 0, 0
+
+        backends = {}
+
+        def get_backend(name: str) -> Optional[NotifierBackendBase]:
+            if name not in backends:
+                backends[name] = backend.find_backend(name)
+                if backends[name] is None:
+                    try:
+                        backends[name] = self._build_backend(name)
+                    except Exception as e:
+                        print(
+                            f'Warning: Could not build backend `{name}`: {e}'
+                        )
+            return backends[name]
+
+        return backend.outbox.replay(get_backend)
+
+    @property
+    def quiet(self) -> bool:
+        """On the non-primary ranks of a distributed launch, only the exceptions are delivered."""
+        return not should_deliver()
 
     def ding_log(self, msg: str) -> None:
         """Notify a single log information."""
+        if self.quiet:
+            return
         meta = self.backend.get_meta()
         log_info = self.LogInfoClass(
             self.backend, exp_meta_info=meta, description=msg
         )
 
+    async def ading_log(self, msg: str) -> None:
+        """Async counterpart of `ding_log()`, the event loop is not blocked while delivering."""
+        if self.quiet:
+            return
+        meta = self.backend.get_meta()
+        log_info = await self.LogInfoClass.acreate(
+            self.backend, exp_meta_info=meta, description=msg
+        )
+
     def ding_func(self, func: Callable) -> Callable:
-        """Function decorator to notify the experiment information."""
+        """Function decorator to notify the experiment information. Coroutine functions are supported."""
+        import inspect
 
-        def inner(*args, **kwargs) -> Any:
-            # Generate function information.
-            n_args = len(args)
-            n_kwargs = len(kwargs.keys())
-            args_info = ''
-            if n_args > 0:
-                args_info += f', #args={n_args}'
-            if n_kwargs > 0:
-                args_info += f', #kwargs={n_kwargs}'
-                kwargs_keys = list(kwargs.keys())
-                if n_kwargs <= 5:
-                    kwargs_keys = ', '.join(kwargs_keys)
-                    args_info += f', kwargs={kwargs_keys} )'
-                else:
-                    kwargs_keys = ', '.join(kwargs_keys[:5])
-                    args_info += f', kwargs={kwargs_keys}...'
-            if len(args_info) > 2:
-                args_info = args_info[2:]
+        if inspect.iscoroutinefunction(func):
+            return self._ding_async_func(func)
 
+        def inner(*args, **kwargs) -> Any:
             # Start the experiment.
             meta = self.backend.get_meta()
-            meta['cmd'] = f'{func.__name__}({args_info})'
-            exp_info = self.ExpInfoClass(
-                backend=self.backend, exp_meta_info=meta
-            )
+            meta['cmd'] = self._format_func_call(func, args, kwargs)
+            exp_info = self._start_exp(meta)
 
             try:
                 # Running the experiment.
@@ -67,13 +109,14 @@ class Oven:
                 # Finish baking with error.
                 exp_info.update_signal(
                     signal=Signal.E,
-                    description=f'Function internal exception detected: {e}',
+                    description=f'{format_rank()}Function internal exception detected: {e}',
                 )
                 traceback.print_exc()
                 return None
 
             # Experiment finished.
-            exp_info.update_signal(signal=Signal.T)
+            if not self.quiet:
+                exp_info.update_signal(signal=Signal.T)
             return resp
 
         return inner
@@ -82,7 +125,7 @@ class Oven:
         """Run a command and notify before & after the command."""
         meta = self.backend.get_meta()
         meta['cmd'] = cmd.strip()
-        exp_info = self.ExpInfoClass(backend=self.backend, exp_meta_info=meta)
+        exp_info = self._start_exp(meta)
 
         try:
             # run command, then capture output and error.
@@ -90,66 +133,157 @@ class Oven:
         except subprocess.CalledProcessError as e:
             # Finish baking with error.
             exp_info.update_signal(
-                signal=Signal.E, description=f'Command error detected: {e}'
+                signal=Signal.E,
+                description=f'{format_rank()}Command error detected: {e}',
             )
             traceback.print_exc()
             return None
 
         # Experiment finished.
-        exp_info.update_signal(signal=Signal.T)
+        if not self.quiet:
+            exp_info.update_signal(signal=Signal.T)
+
+    def _ding_async_func(self, func: Callable) -> Callable:
+        async def inner(*args, **kwargs) -> Any:
+            # Start the experiment.
+            meta = self.backend.get_meta()
+            meta['cmd'] = self._format_func_call(func, args, kwargs)
+            if self.quiet:
+                exp_info = self._start_exp(meta)  # nothing is delivered
+            else:
+                exp_info = await self.ExpInfoClass.acreate(
+                    backend=self.backend, exp_meta_info=meta
+                )
+
+            try:
+                # Running the experiment.
+                resp = await func(*args, **kwargs)
+            except Exception as e:
+                # Finish baking with error.
+                await exp_info.aupdate_signal(
+                    signal=Signal.E,
+                    description=f'{format_rank()}Function internal exception detected: {e}',
+                )
+                traceback.print_exc()
+                return None
+
+            # Experiment finished.
+            if not self.quiet:
+                await exp_info.aupdate_signal(signal=Signal.T)
+            return resp
+
+        return inner
+
+    def _start_exp(self, meta) -> ExpInfoBase:
+        """Start an experiment, the start signal is not delivered if the oven is quiet."""
+        if self.quiet:
+            return self.ExpInfoClass.create_muted(
+                backend=self.backend, exp_meta_info=meta
+            )
+        return self.ExpInfoClass(backend=self.backend, exp_meta_info=meta)
+
+    def _format_func_call(self, func: Callable, args, kwargs) -> str:
+        # Generate function information.
+        n_args = len(args)
+        n_kwargs = len(kwargs.keys())
+        args_info = ''
+        if n_args > 0:
+            args_info += f', #args={n_args}'
+        if n_kwargs > 0:
+            args_info += f', #kwargs={n_kwargs}'
+            kwargs_keys = list(kwargs.keys())
+            if n_kwargs <= 5:
+                kwargs_keys = ', '.join(kwargs_keys)
+                args_info += f', kwargs={kwargs_keys} )'
+            else:
+                kwargs_keys = ', '.join(kwargs_keys[:5])
+                args_info += f', kwargs={kwargs_keys}...'
+        if len(args_info) > 2:
+            args_info = args_info[2:]
+        return f'{func.__name__}({args_info})'
 
     def _init_notifier(self) -> None:
         """Initialize the notifier."""
+        backend = self.cfg['backend']
+        if not isinstance(backend, str):
+            return self._init_multi_notifier(list(backend))
+
         # 1. Through useless things.
-        backend = self.cfg.backend
         self.cfg = self.cfg[backend]
         self.cfg['backend'] = backend
-        if backend == 'dingtalk':
-            from oven.backends.dingtalk import (
-                DingTalkBackend,
-                DingTalkExpInfo,
-                DingTalkLogInfo,
-            )
+        # 2. Build the backend.
+        (
+            BackendClass,
+            self.ExpInfoClass,
+            self.LogInfoClass,
+        ) = load_backend(backend)
+        self.backend = BackendClass(self.cfg)
 
-            self.ExpInfoClass = DingTalkExpInfo
-            self.LogInfoClass = DingTalkLogInfo
-            self.backend = DingTalkBackend(self.cfg)
-        elif backend == 'feishu':
-            from oven.backends.feishu import (
-                FeishuBackend,
-                FeishuExpInfo,
-                FeishuLogInfo,
-            )
+    def _init_multi_notifier(self, backends: List[str]) -> None:
+        """Initialize a notifier that delivers to all the listed backends concurrently."""
+        from oven.backends.multi import (
+            MultiBackend,
+            MultiExpInfo,
+            MultiLogInfo,
+        )
 
-            self.ExpInfoClass = FeishuExpInfo
-            self.LogInfoClass = FeishuLogInfo
-            self.backend = FeishuBackend(self.cfg)
-        elif backend == 'slack':
-            from oven.backends.slack import (
-                SlackBackend,
-                SlackExpInfo,
-                SlackLogInfo,
+        children = []
+        for backend in backends:
+            _, ExpInfoClass, LogInfoClass = load_backend(backend)
+            children.append(
+                (self._build_backend(backend), ExpInfoClass, LogInfoClass)
             )
+        self.cfg = {'backend': 'multi', 'backends': backends}
+        self.ExpInfoClass = MultiExpInfo
+        self.LogInfoClass = MultiLogInfo
+        self.backend = MultiBackend(self.cfg, children)
 
-            self.ExpInfoClass = SlackExpInfo
-            self.LogInfoClass = SlackLogInfo
-            self.backend = SlackBackend(self.cfg)
-        elif backend == 'email':
-            from oven.backends.email import (
-                EmailBackend,
-                EmailExpInfo,
-                EmailLogInfo,
-            )
+    def _get_backends(self) -> List[NotifierBackendBase]:
+        """Get the backends that actually send messages."""
+        # Don't import the multi-backend for a single one, it's on the start-up path of every `ding`.
+        if self.cfg['backend'] == 'multi':
+            return self.backend.backends
+        return [self.backend]
+
+    def _build_backend(self, backend: str) -> NotifierBackendBase:
+        """Build a backend by name from the configuration, it may differ from the current one."""
+        backend_cfg = self.root_cfg[backend]
+        backend_cfg['backend'] = backend
+        BackendClass, _, _ = load_backend(backend)
+        return BackendClass(backend_cfg)
+
+    def _init_retry(self, retry_cfg) -> None:
+        """Initialize the retry policy, the backend's default one is used if it's not configured."""
+        if retry_cfg is None:
+            return
+        retry_policy = RetryPolicy(
+            max_attempts=retry_cfg.get('max_attempts', 3),
+            base_delay=retry_cfg.get('base_delay', 1.0),
+            max_delay=retry_cfg.get('max_delay', 30.0),
+            budget=retry_cfg.get('budget', 60.0),
+            sync_max_attempts=retry_cfg.get('sync_max_attempts', 2),
+        )
+        for backend in self._get_backends():
+            backend.retry_policy = retry_policy
+
+    def _init_outbox(self, outbox_cfg) -> None:
+        """Initialize the outbox, undelivered notifications are persisted if it's enabled."""
+        outbox = build_outbox(outbox_cfg)
+        # The multi-backend keeps a reference too, so that the dispatcher can replay it.
+        self.backend.outbox = outbox
+        for backend in self._get_backends():
+            backend.outbox = outbox
 
-            self.ExpInfoClass = EmailExpInfo
-            self.LogInfoClass = EmailLogInfo
-            self.backend = EmailBackend(self.cfg)
+    def _init_delivery(self, delivery_cfg) -> None:
+        """Initialize the delivery mode, notifications are sent in the caller's thread by default."""
+        mode = delivery_cfg.get('mode', 'sync')
+        if mode == 'sync':
+            pass
+        elif mode == 'async':
+            self.backend = QueuedBackend(self.backend, delivery_cfg)
         else:
-            self.ExpInfoClass = ...
-            self.LogInfoClass = ...
-            self.backend = ...
             raise NotImplementedError(
-                f'Notifier backend `{backend}` is not supported yet.'
+                f'Delivery mode `{mode}` is not supported yet.'
             )
 
 
@@ -165,7 +299,7 @@ def build_oven(
             raise FileNotFoundError(
                 f'Oven configuration file not found at `{cfg_path}`.'
             )
-        cfg = OmegaConf.load(cfg_path)
+        cfg = load_cfg(cfg_path)
         oven = Oven(cfg)
     except Exception as e:
         # Generate tips.
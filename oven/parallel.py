@@ -0,0 +1,189 @@
+import os
+import time
+from collections import deque
+from itertools import islice
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from oven.progress import ProgressBar
+
+# Seconds of work that an automatically sized chunk aims at, so that the dispatch overhead of a chunk
+# (tens of microseconds for threads, up to a millisecond for processes) stays negligible.
+TARGET_CHUNK_TIME = 0.02
+MAX_CHUNKSIZE = 10000
+# Weight of the latest chunk in the moving average of the per-item latency.
+LATENCY_SMOOTHING = 0.3
+
+_EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+
+def progress_map(
+    fn: Callable,
+    iterable: Iterable,
+    workers: Optional[int] = None,
+    executor: str = 'thread',
+    ordered: bool = True,
+    chunksize: Optional[int] = None,
+    max_inflight: Optional[int] = None,
+    total: Optional[int] = None,
+    desc: str = '',
+    **kwargs,
+) -> Iterator:
+    """
+    Apply `fn` to the items in a pool of workers, and lazily yield the results while tracking the completed
+    items with one progress bar.
+
+    The items are sent by chunks, whose size is picked from the per-item latency measured in the workers,
+    so that fast functions are not dominated by the dispatch overhead. The items are only read from the
+    iterable when there is room for a chunk, at most `max_inflight` chunks are submitted or waiting to be
+    consumed, so the memory stays bounded whatever the length of the iterable.
+
+    Usage:
+    ```
+    for result in oven.progress_map(preprocess, samples, workers=8, executor='process'):
+        save(result)
+    ```
+
+    Args:
+        fn: Function applied to each item, it should be picklable for the `process` executor
+        iterable: Items to process
+        workers: Number of workers, the number of CPUs by default
+        executor: `thread` for functions that release the GIL, e.g. I/O, or `process` for pure Python ones
+        ordered: Whether the results are yielded in the order of the items, or as soon as they are ready
+        chunksize: Number of items per task, picked automatically by default
+        max_inflight: Maximum number of chunks in flight, twice the number of workers by default
+        total: Number of items, `len(iterable)` by default if it's known
+        desc: Description prefix
+        **kwargs: Parameters of the `ProgressBar`
+    """
+    if executor not in _EXECUTORS:
+        raise NotImplementedError(
+            f'Executor `{executor}` is not supported yet.'
+        )
+    workers = workers or os.cpu_count() or 1
+    assert workers > 0, '`workers` should be positive!'
+    assert (
+        chunksize is None or chunksize > 0
+    ), '`chunksize` should be positive!'
+    max_inflight = max_inflight or 2 * workers
+    assert max_inflight > 0, '`max_inflight` should be positive!'
+    if total is None and hasattr(iterable, '__len__'):
+        total = len(iterable)
+
+    return _iter_map(
+        fn,
+        iter(iterable),
+        _EXECUTORS[executor],
+        _ChunkSizer(workers, chunksize),
+        ordered,
+        max_inflight,
+        dict(total=total, desc=desc, **kwargs),
+    )
+
+
+def _iter_map(
+    fn: Callable,
+    items: Iterator,
+    executor_class,
+    sizer: '_ChunkSizer',
+    ordered: bool,
+    max_inflight: int,
+    pbar_kwargs: dict,
+) -> Iterator:
+    # Created on the first `next()`, completed chunks may be counted from several threads.
+    pbar = ProgressBar(concurrent=True, **pbar_kwargs)
+
+    def on_done(future) -> None:
+        # Called by the thread that completes the chunk, the bar counts it in that thread's shard.
+        if future.cancelled() or future.exception() is not None:
+            return
+        results, elapsed = future.result()
+        sizer.observe(len(results), elapsed)
+        pbar.update(len(results))
+
+    pool = executor_class(max_workers=sizer.workers)
+    pending = deque()  # in submission order
+    n_submitted = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_inflight:
+                remaining = (
+                    None if pbar.total is None else pbar.total - n_submitted
+                )
+                chunk = list(islice(items, sizer.next_size(remaining)))
+                if not chunk:
+                    exhausted = True
+                    break
+                future = pool.submit(_run_chunk, fn, chunk)
+                future.add_done_callback(on_done)
+                pending.append(future)
+                n_submitted += len(chunk)
+            if not pending:
+                return
+
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(f for f in pending if f in done)
+                pending.remove(future)
+            results, _ = future.result()
+            yield from results
+    finally:
+        # Stopped early, or by an exception of `fn`, the chunks not started yet are dropped. Not through
+        # `shutdown(cancel_futures=True)`, which requires Python 3.9.
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+        pbar.close()
+
+
+def _run_chunk(fn: Callable, chunk: List) -> Tuple[List, float]:
+    start = time.perf_counter()
+    results = [fn(item) for item in chunk]
+    return results, time.perf_counter() - start
+
+
+class _ChunkSizer:
+    """
+    Pick the number of items per chunk, so that a chunk takes about `TARGET_CHUNK_TIME` in a worker.
+    Single items are sent until the first chunk is measured, and the last chunks are split over the
+    workers so that none of them is left with most of the tail.
+    """
+
+    def __init__(self, workers: int, chunksize: Optional[int] = None) -> None:
+        self.workers = workers
+        self.chunksize = chunksize
+        self.item_time: Optional[float] = None
+
+    def observe(self, n: int, elapsed: float) -> None:
+        """Record the time a chunk of n items took in a worker."""
+        item_time = elapsed / n
+        if self.item_time is None:
+            self.item_time = item_time
+        else:
+            self.item_time = (
+                LATENCY_SMOOTHING * item_time
+                + (1 - LATENCY_SMOOTHING) * self.item_time
+            )
+
+    def next_size(self, remaining: Optional[int] = None) -> int:
+        if self.chunksize is not None:
+            return self.chunksize
+        if self.item_time is None:
+            return 1
+        size = MAX_CHUNKSIZE
+        if self.item_time > 0:
+            size = min(size, int(TARGET_CHUNK_TIME / self.item_time))
+        if remaining is not None:
+            size = min(size, -(-remaining // self.workers))
+        return max(size, 1)
@@ -1,8 +1,15 @@
+import os
+import sys
 import time
+import atexit
+import functools
 import threading
-from typing import Optional, Iterable, Dict
+from collections import deque
+from typing import Callable, Optional, Iterable, Dict, List
 
 from oven.utils.time import milliseconds_to_adaptive_time_cost
+from oven.utils.rate import RateEstimator, build_rate_estimator
+from oven.render import Renderer, format_counts
 from oven.backends.api import Signal
 
 
@@ -51,6 +58,11 @@ class ProgressBar:
         notify_mode: str = 'http',  # "http" or "socket"
         notify_threshold: float = 0.05,  # Notify on 5% progress changes
         enable_notifications: bool = True,
+        concurrent: bool = False,  # `update()` is called from several threads
+        aggregate_ranks: bool = False,  # notify the progress summed over the local ranks
+        # Estimate the rate over the last samples.
+        rate_window: Optional[int] = None,
+        rate_warmup: float = 0.0,  # seconds excluded from the rate estimation
         **kwargs,
     ):
         """
@@ -64,6 +76,13 @@ class ProgressBar:
             notify_mode: "http" (time-based) or "socket" (trigger-based)
             notify_threshold: Minimum progress change to trigger notification
             enable_notifications: Whether to send notifications to messaging apps
+            concurrent: Whether `update()` is called from several threads, each thread then counts in its
+                own shard, and the shards are summed when rendering and notifying
+            aggregate_ranks: In a distributed launch, whether the primary rank notifies the progress summed
+                over the ranks on its host, the progress bars are matched by their creation order
+            rate_window: Number of samples of the sliding-window rate estimator, the rate is an exponential
+                moving average weighted by `smoothing` if it's not given
+            rate_warmup: Seconds after the first sample that are excluded from the rate and ETA
             **kwargs: Additional tqdm-compatible parameters
         """
         self.iterable = iterable
@@ -72,36 +91,104 @@ class ProgressBar:
         )
         self.desc = desc
         self.unit = unit
+        self.unit_scale = unit_scale
+        self.unit_divisor = unit_divisor
         self.disable = disable
         self.leave = leave
         self.mininterval = mininterval
         self.maxinterval = maxinterval
         self.initial = initial
         self.postfix = postfix or {}
+        # Frames are formatted from the compiled `bar_format`, and written to `file` (stdout by default).
+        self._renderer = None
+        if not disable:
+            self._renderer = Renderer(
+                file=file,
+                ncols=ncols,
+                bar_format=bar_format,
+                ascii=ascii,
+                dynamic_ncols=dynamic_ncols,
+                unit=unit,
+                unit_scale=unit_scale,
+                unit_divisor=unit_divisor,
+                position=position,
+            )
 
         # ExpOven specific attributes
         self.notify_interval = notify_interval
         self.notify_mode = notify_mode
         self.notify_threshold = notify_threshold
         self.enable_notifications = enable_notifications
+        if enable_notifications:
+            from oven.utils.dist import should_deliver
+
+            # Only the primary rank of a distributed launch notifies.
+            self.enable_notifications = should_deliver()
+
+        # The ranks publish their progress to a host-local channel, which the primary rank sums up.
+        self._rank_channel = None
+        if aggregate_ranks:
+            from oven.utils.dist import RankChannel
+
+            self._rank_channel = RankChannel.for_progress(desc)
+
+        self.smoothing = smoothing
+        # The rate and ETA are estimated from the `(n, time)` samples taken when the display is refreshed.
+        self._rate = build_rate_estimator(smoothing, rate_window, rate_warmup)
+        if self._rank_channel is not None:
+            # Sampled when the summed progress is read.
+            self._ranks_rate = build_rate_estimator(
+                smoothing, rate_window, rate_warmup
+            )
 
         # Progress tracking
         self.n = initial
         self.last_print_n = initial
         self.last_print_time = time.time()
+        # The time is only read every `miniters` iterations. If it's not given, it's learned from
+        # `mininterval` as tqdm does, so that the hot path is an integer increment and comparison.
+        self.dynamic_miniters = not miniters
+        self.miniters = miniters or 0
+        self._next_check_n = self.n + self.miniters
+        # Once more than one iteration is skipped, a timer makes sure that a slowdown is noticed within
+        # `maxinterval` seconds.
+        self._maxinterval_timer = None
+        self._closed = False
+
+        # Concurrent mode, each thread owns a shard `[count, next_check_count]`, so updates never contend.
+        self._shards = None
+        if concurrent:
+            self._shards = []
+            self._local = threading.local()
+            self._shards_lock = threading.Lock()
+            self._refresh_lock = threading.Lock()
+            self.update = self._update_concurrent
         self.start_time = time.time()
         self.last_notify_time = time.time()
         self.last_notify_progress = 0.0
 
         # ExpOven integration
         self.exp_info = None
+        # Set if created inside a running event loop, notifications are then delivered by tasks.
+        self._loop = None
+        self._tasks = set()
         self._setup_oven_integration()
 
-        # Threading for HTTP mode
-        self._stop_thread = False
-        self._notify_thread = None
+        # Progress notifications are delivered by a background worker, the caller never waits on the
+        # network. The latencies are measured from the trigger to the end of the delivery.
+        self._notify_pending = False
+        self._notify_triggered_at = 0.0
+        self._n_notified = 0
+        self._last_notify_latency = 0.0
+        self._max_notify_latency = 0.0
+
+        # Timer for HTTP mode, served by the process-wide scheduler thread.
+        self._notify_timer = None
         if self.notify_mode == 'http' and self.enable_notifications:
-            self._start_notify_thread()
+            self._start_notify_timer()
+
+        # Take a line on the terminal at once, so that nested bars are ordered by creation.
+        self._display_progress()
 
     def _setup_oven_integration(self):
         """Setup integration with ExpOven notification system."""
@@ -118,11 +205,19 @@ class ProgressBar:
                 meta['cmd'] = (
                     f'Progress: {self.desc}' if self.desc else 'Progress'
                 )
-                self.exp_info = oven.ExpInfoClass(
-                    backend=oven.backend,
-                    exp_meta_info=meta,
-                    description=self._format_progress_description(),
-                )
+                self._loop = self._get_running_loop()
+                if self._loop is None:
+                    self.exp_info = oven.ExpInfoClass(
+                        backend=oven.backend,
+                        exp_meta_info=meta,
+                        description=self._format_progress_description(),
+                    )
+                else:
+                    self._spawn(
+                        self._acreate_exp_info(
+                            oven, meta, self._format_progress_description()
+                        )
+                    )
         except Exception as e:
             # If oven setup fails, continue without notifications
             self.enable_notifications = False
@@ -130,51 +225,85 @@ class ProgressBar:
 
     def _format_progress_description(self) -> str:
         """Format the current progress for notifications."""
-        if not self.total:
-            return f'{self.desc}: {self.n} {self.unit} processed'
+        n, total, n_ranks = self._get_notify_progress()
+        ranks_str = f' on {n_ranks} ranks' if n_ranks > 1 else ''
+        if not total:
+            n_fmt, _, _ = self._format_counts(n, None, 0)
+            amount = (
+                f'{n_fmt}{self.unit}'
+                if self.unit_scale
+                else f'{n} {self.unit}'
+            )
+            return f'{self.desc}: {amount} processed{ranks_str}'
 
-        percentage = (self.n / self.total) * 100
+        percentage = (n / total) * 100
         elapsed = time.time() - self.start_time
 
-        if self.n > 0:
-            rate = self.n / elapsed
-            eta = (self.total - self.n) / rate if rate > 0 else 0
+        if n > 0:
+            rate = self._estimate_rate(
+                self._rate if self._rank_channel is None else self._ranks_rate,
+                n,
+                elapsed,
+            )
+            eta = (total - n) / rate if rate > 0 else 0
             eta_str = f', ETA: {self._format_time(eta)}'
         else:
             rate = 0
             eta_str = ''
 
+        n_fmt, total_fmt, rate_fmt = self._format_counts(n, total, rate)
+        if self.unit_scale:
+            n_fmt, total_fmt = n_fmt + self.unit, total_fmt + self.unit
         return (
-            f'{self.desc}: {percentage:.1f}% ({self.n}/{self.total}) '
-            f'[{self._format_time(elapsed)}<{eta_str}, {rate:.2f}{self.unit}/s]'
+            f'{self.desc}: {percentage:.1f}% ({n_fmt}/{total_fmt}) '
+            f'[{self._format_time(elapsed)}<{eta_str}, {rate_fmt}]{ranks_str}'
+        )
+
+    def _format_counts(self, n: int, total: Optional[int], rate: float):
+        return format_counts(
+            n, total, rate, self.unit, self.unit_scale, self.unit_divisor
         )
 
+    def _get_notify_progress(self):
+        """Return the `(n, total, n_ranks)` to notify, summed over the local ranks if they are aggregated."""
+        if self._rank_channel is None:
+            return self.n, self.total, 1
+        self._rank_channel.publish(self.n, self.total)
+        n, total, n_ranks = self._rank_channel.read()
+        self._ranks_rate.update(n, time.time())
+        return n, total, n_ranks
+
+    def _estimate_rate(
+        self, estimator: RateEstimator, n: int, elapsed: float
+    ) -> float:
+        """The smoothed rate, or the average one until the estimator has enough samples."""
+        rate = estimator.rate
+        if rate is None:
+            rate = n / elapsed if elapsed > 0 else 0
+        return rate
+
     def _format_time(self, seconds: float) -> str:
         """Format time duration in human readable format."""
         formated_time = milliseconds_to_adaptive_time_cost(int(seconds * 1000))
         return formated_time
 
-    def _start_notify_thread(self):
-        """Start background thread for HTTP-based notifications."""
+    def _start_notify_timer(self):
+        """Register the periodic HTTP-based notifications to the shared scheduler."""
+        from oven.utils.scheduler import get_scheduler
 
-        def notify_worker():
-            while not self._stop_thread:
-                time.sleep(self.notify_interval)
-                if not self._stop_thread:
-                    self._send_progress_notification()
-
-        self._notify_thread = threading.Thread(
-            target=notify_worker, daemon=True
+        self._notify_timer = get_scheduler().call_every(
+            self.notify_interval, self._send_progress_notification
         )
-        self._notify_thread.start()
 
     def _send_progress_notification(self):
-        """Send progress notification to messaging apps."""
+        """Trigger a progress notification if the thresholds are met, it's delivered in background."""
         if not self.enable_notifications or not self.exp_info:
             return
+        self._sync_n()
 
         current_time = time.time()
-        current_progress = (self.n / self.total) if self.total else 0
+        n, total, _ = self._get_notify_progress()
+        current_progress = (n / total) if total else 0
 
         # Check if we should send notification based on time and progress thresholds
         time_threshold_met = (
@@ -186,75 +315,209 @@ class ProgressBar:
         )
 
         if time_threshold_met or progress_threshold_met:
-            try:
-                self.exp_info.update_signal(
-                    signal=Signal.P,
-                    description=self._format_progress_description(),
-                )
-                self.last_notify_time = current_time
-                self.last_notify_progress = current_progress
-            except Exception as e:
-                print(f'Warning: Failed to send progress notification: {e}')
+            self.last_notify_time = current_time
+            self.last_notify_progress = current_progress
+            _get_notify_worker().submit(self)
+
+    def _deliver_progress_notification(self):
+        """Called by the notify worker, the description is formatted with the latest progress."""
+        self._sync_n()
+        try:
+            self.exp_info.update_signal(
+                signal=Signal.P,
+                description=self._format_progress_description(),
+            )
+        except Exception as e:
+            print(f'Warning: Failed to send progress notification: {e}')
+            return
+        latency = time.monotonic() - self._notify_triggered_at
+        self._n_notified += 1
+        self._last_notify_latency = latency
+        self._max_notify_latency = max(self._max_notify_latency, latency)
+
+    @property
+    def notify_stats(self) -> Dict:
+        """Statistics of the progress notifications, latencies are in seconds."""
+        return {
+            'queue_depth': _get_notify_worker().depth,
+            'pending': self._notify_pending,
+            'n_sent': self._n_notified,
+            'last_latency': self._last_notify_latency,
+            'max_latency': self._max_notify_latency,
+        }
 
     def update(self, n: int = 1):
         """Update progress by n steps."""
         self.n += n
-        self._refresh()
+        if self.n >= self._next_check_n:
+            self._refresh()
 
-        # For socket mode, send notification on manual updates
-        if self.notify_mode == 'socket':
-            self._send_progress_notification()
+    def _update_concurrent(self, n: int = 1):
+        """`update()` of the concurrent mode, only the shard of the calling thread is written."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[0] += n
+        if shard[0] >= shard[1]:
+            # Only one thread refreshes at a time, the others don't wait for it.
+            if self._refresh_lock.acquire(blocking=False):
+                try:
+                    self._refresh()
+                finally:
+                    self._refresh_lock.release()
+            # The shard sees about 1 / n_shards of the iterations.
+            shard[1] = shard[0] + self.miniters // len(self._shards)
+
+    def _new_shard(self):
+        shard = [0, 0]
+        self._local.shard = shard
+        with self._shards_lock:
+            self._shards.append(shard)
+        return shard
+
+    def _sync_n(self):
+        """Sum the shards up in the concurrent mode."""
+        if self._shards is not None:
+            self.n = self.initial + sum(shard[0] for shard in self._shards)
 
     def _refresh(self):
-        """Refresh the terminal display."""
-        if self.disable:
-            return
-
+        """Refresh the terminal display, it's called every `miniters` iterations."""
+        self._sync_n()
+        if self._rank_channel is not None:
+            self._rank_channel.publish(self.n, self.total)
         current_time = time.time()
-        if (current_time - self.last_print_time) >= self.mininterval:
+        delta_t = current_time - self.last_print_time
+        if delta_t >= self.mininterval:
+            if self.dynamic_miniters:
+                self._adapt_miniters(self.n - self.last_print_n, delta_t)
+            self._rate.update(self.n, current_time)
             self._display_progress()
             self.last_print_time = current_time
             self.last_print_n = self.n
 
+        # For socket mode, send notification on manual updates
+        if self.notify_mode == 'socket':
+            self._send_progress_notification()
+        self._next_check_n = self.n + self.miniters
+
+    def _adapt_miniters(self, delta_it: int, delta_t: float):
+        """Learn how many iterations fit in `mininterval`, and never more than fit in `maxinterval`."""
+        scale = self.mininterval / delta_t if delta_t > 0 else 1
+        if delta_t >= self.maxinterval:
+            # The iterations slowed down a lot, forget the history.
+            miniters = delta_it * scale
+        else:
+            miniters = (
+                self.smoothing * delta_it * scale
+                + (1 - self.smoothing) * self.miniters
+            )
+        if delta_t > 0:
+            miniters = min(miniters, delta_it / delta_t * self.maxinterval)
+        self.miniters = int(miniters)
+        if (
+            self.miniters > 1
+            and self.maxinterval > 0
+            and self._maxinterval_timer is None
+        ):
+            from oven.utils.scheduler import get_scheduler
+
+            self._maxinterval_timer = get_scheduler().call_every(
+                self.maxinterval, self._check_maxinterval
+            )
+
+    def _check_maxinterval(self):
+        """
+        Called by the scheduler. If the iterations slowed down so much that no refresh happened for
+        `maxinterval` seconds, the next iteration refreshes, and `miniters` is learned again.
+        """
+        if time.time() - self.last_print_time < self.maxinterval:
+            return
+        self.miniters = 0
+        self._next_check_n = 0
+        if self._shards is not None:
+            for shard in list(self._shards):
+                shard[1] = 0
+
+    def _stop_maxinterval_timer(self):
+        if self._maxinterval_timer is not None:
+            self._maxinterval_timer.cancel()
+            self._maxinterval_timer = None
+
     def _display_progress(self):
-        """Display progress bar in terminal (simplified tqdm-like display)."""
+        """Render the progress bar, the line is only formatted when a frame is drawn."""
         if self.disable:
             return
+        self._renderer.display(self._format_meter)
 
-        # Simple progress bar display
-        if self.total:
-            percentage = (self.n / self.total) * 100
-            bar_length = 30
-            filled_length = int(bar_length * self.n // self.total)
-            bar = '█' * filled_length + '-' * (bar_length - filled_length)
-
-            elapsed = time.time() - self.start_time
-            rate = self.n / elapsed if elapsed > 0 else 0
-
-            print(
-                f'\r{self.desc}: {percentage:6.2f}%|{bar}| {self.n}/{self.total} '
-                f'[{self._format_time(elapsed)}, {rate:.2f}{self.unit}/s]',
-                end='',
-                flush=True,
-            )
-        else:
-            elapsed = time.time() - self.start_time
-            rate = self.n / elapsed if elapsed > 0 else 0
-            print(
-                f'\r{self.desc}: {self.n}{self.unit} '
-                f'[{self._format_time(elapsed)}, {rate:.2f}{self.unit}/s]',
-                end='',
-                flush=True,
-            )
+    def _format_meter(self) -> str:
+        elapsed = time.time() - self.start_time
+        rate = self._estimate_rate(self._rate, self.n, elapsed)
+        return self._renderer.format_meter(
+            self.desc, self.n, self.total, elapsed, rate, self.postfix
+        )
 
     def __iter__(self):
         """Make this object iterable."""
         if self.iterable is None:
             raise TypeError("'ProgressBar' object is not iterable")
+        if self._shards is not None:
+            yield from self._iter_concurrent()
+            return
 
-        for item in self.iterable:
-            yield item
-            self.update(1)
+        # Hot loop, only an integer increment and comparison per item.
+        # The check point is read from the bar, so that the `maxinterval` watchdog can move it.
+        n = self.n
+        try:
+            for item in self.iterable:
+                yield item
+                n += 1
+                if n >= self._next_check_n:
+                    self.n = n
+                    self._refresh()
+        finally:
+            self.n = n
+            self.close()
+
+    def _iter_concurrent(self):
+        try:
+            for item in self.iterable:
+                yield item
+                self.update(1)
+        finally:
+            self.close()
+
+    async def __aiter__(self):
+        """
+        Make this object async iterable, for an async iterable or a plain one. The final notification is
+        awaited when the iteration ends, and the event loop is never blocked by the deliveries.
+        """
+        if self.iterable is None:
+            raise TypeError("'ProgressBar' object is not async iterable")
+        iterable = self.iterable
+        if not hasattr(iterable, '__aiter__'):
+            iterable = _aiterate(iterable)
+        if self._shards is not None:
+            try:
+                async for item in iterable:
+                    yield item
+                    self.update(1)
+            finally:
+                await self.aclose()
+            return
+
+        # Hot loop, the same as `__iter__()`.
+        n = self.n
+        try:
+            async for item in iterable:
+                yield item
+                n += 1
+                if n >= self._next_check_n:
+                    self.n = n
+                    self._refresh()
+        finally:
+            self.n = n
+            await self.aclose()
 
     def __enter__(self):
         """Context manager entry."""
@@ -264,29 +527,161 @@ class ProgressBar:
         """Context manager exit."""
         self.close()
 
+    async def __aenter__(self):
+        """Async context manager entry, it waits until the start notification is delivered."""
+        await self._wait_tasks()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
+
     def close(self):
         """Close the progress bar and clean up."""
-        if self._notify_thread:
-            self._stop_thread = True
-            self._notify_thread.join(timeout=1.0)
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_maxinterval_timer()
+        self._sync_n()
+        final = None
+        if self.enable_notifications:
+            final = functools.partial(
+                self._send_final_notification,
+                self._format_final_description(),
+            )
+
+        if final is not None and self._get_running_loop() is not None:
+            # Called from a coroutine, e.g. a `with` block in an async function. The final notification is
+            # delivered in background, the event loop is not blocked.
+            if self._notify_timer is not None:
+                self._notify_timer.cancel()
+                self._notify_timer = None
+            if self._tasks:
+                self._spawn(self._hand_over_final(list(self._tasks), final))
+            else:
+                _get_notify_worker().hand_over(self, final)
+        else:
+            # If a progress notification is being delivered, the worker sends the final one right after
+            # it, instead of waiting for it here.
+            deferred = self._stop_notifications(final=final)
+            if final is not None and not deferred:
+                final()
+        self._close_rank_channel()
+
+        if not self.disable:
+            # The last refresh may be a few iterations behind.
+            self._renderer.close(self._format_meter, self.leave)
+
+    async def aclose(self):
+        """Async counterpart of `close()`, the event loop is not blocked while delivering."""
+        import asyncio
+
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_maxinterval_timer()
+        # It may wait for a progress notification being delivered, don't block the event loop.
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._stop_notifications
+        )
+        await self._wait_tasks()
+        self._sync_n()
 
         if self.enable_notifications and self.exp_info:
             try:
                 # Send final notification
-                if self.total and self.n >= self.total:
-                    self.exp_info.update_signal(
-                        signal=Signal.T, description='Progress completed!'
-                    )
-                else:
-                    self.exp_info.update_signal(
-                        signal=Signal.T,
-                        description=self._format_progress_description(),
-                    )
+                await self.exp_info.aupdate_signal(
+                    signal=Signal.T,
+                    description=self._format_final_description(),
+                )
             except Exception as e:
                 print(f'Warning: Failed to send final notification: {e}')
+        self._close_rank_channel()
+
+        if not self.disable:
+            # The last refresh may be a few iterations behind.
+            self._renderer.close(self._format_meter, self.leave)
 
-        if not self.disable and self.leave:
-            print()  # New line after progress bar
+    def _stop_notifications(
+        self, final: Optional[Callable[[], None]] = None
+    ) -> bool:
+        """
+        Once cancelled, the timer never fires again, and no progress notification arrives after the final
+        one. Return True if `final` was handed over to the notify worker.
+        """
+        if self._notify_timer is not None:
+            self._notify_timer.cancel()
+            self._notify_timer = None
+        if _notify_worker is not None:
+            return _notify_worker.cancel(self, final)
+        return False
+
+    def _send_final_notification(self, description: str):
+        if self.enable_notifications and self.exp_info:
+            try:
+                self.exp_info.update_signal(
+                    signal=Signal.T, description=description
+                )
+            except Exception as e:
+                print(f'Warning: Failed to send final notification: {e}')
+
+    async def _hand_over_final(self, tasks: List, final: Callable[[], None]):
+        import asyncio
+
+        # The start notification is still being delivered by a task, the final one goes after it.
+        try:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            _get_notify_worker().hand_over(self, final)
+
+    def _format_final_description(self) -> str:
+        n, total, _ = self._get_notify_progress()
+        if total and n >= total:
+            return 'Progress completed!'
+        return self._format_progress_description()
+
+    def _close_rank_channel(self):
+        if self._rank_channel is not None:
+            self._rank_channel.publish(self.n, self.total)
+            self._rank_channel.close()
+            self._rank_channel = None
+
+    # ================================ #
+    # Utils functions for event loops. #
+    # ================================ #
+
+    def _get_running_loop(self):
+        # No event loop can be running if asyncio is not even imported, so don't pay for importing it.
+        asyncio = sys.modules.get('asyncio', None)
+        if asyncio is None:
+            return None
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _spawn(self, coro) -> None:
+        task = self._loop.create_task(coro)
+        # Keep a reference, otherwise the task may be garbage collected before it's done.
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _wait_tasks(self) -> None:
+        import asyncio
+
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def _acreate_exp_info(self, oven, meta: Dict, description: str):
+        try:
+            self.exp_info = await oven.ExpInfoClass.acreate(
+                backend=oven.backend,
+                exp_meta_info=meta,
+                description=description,
+            )
+        except Exception as e:
+            self.enable_notifications = False
+            print(f'Warning: Could not setup ExpOven notifications: {e}')
 
     def set_description(self, desc: str):
         """Set the description prefix."""
@@ -297,6 +692,144 @@ class ProgressBar:
         self.postfix.update(kwargs)
 
 
+class _NotifyWorker:
+    """
+    Deliver the progress notifications of all bars in one background thread. A bar has at most one
+    pending notification, a new trigger before it's delivered is merged into it. A bar closed while its
+    notification is being delivered, or closed inside a running event loop, hands its final notification
+    over, so that `close()` never waits on the network. The final notifications handed over are waited
+    for at exit.
+    """
+
+    # Seconds to wait at exit for the final notifications handed over.
+    exit_timeout = 30.0
+
+    def __init__(self) -> None:
+        self._queue = deque()
+        self._running: Optional[ProgressBar] = None
+        self._finals: Dict[ProgressBar, Callable[[], None]] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        atexit.register(self._wait_finals)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def depth(self) -> int:
+        """Number of bars waiting for delivery."""
+        return len(self._queue)
+
+    def submit(self, pbar: ProgressBar) -> None:
+        with self._cond:
+            if pbar._notify_pending:
+                return
+            pbar._notify_pending = True
+            pbar._notify_triggered_at = time.monotonic()
+            self._queue.append(pbar)
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def cancel(
+        self, pbar: ProgressBar, final: Optional[Callable[[], None]] = None
+    ) -> bool:
+        """
+        Drop the pending notification of the bar. If one is being delivered, `final` is called by the worker
+        right after it and True is returned, without `final` it's waited for.
+        """
+        with self._cond:
+            self._drop(pbar)
+            if threading.current_thread() is self._thread:
+                return False
+            if self._running is pbar and final is not None:
+                self._finals[pbar] = final
+                return True
+            while self._running is pbar:
+                self._cond.wait()
+            return False
+
+    def hand_over(self, pbar: ProgressBar, final: Callable[[], None]) -> None:
+        """Drop the pending notification of the bar, `final` is called by the worker without waiting for it."""
+        with self._cond:
+            self._drop(pbar)
+            self._finals[pbar] = final
+            if self._running is not pbar:
+                self._queue.append(pbar)
+                self._ensure_thread()
+                self._cond.notify_all()
+
+    def _drop(self, pbar: ProgressBar) -> None:
+        if pbar._notify_pending:
+            pbar._notify_pending = False
+            self._queue.remove(pbar)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._worker, name='oven-pbar-notify', daemon=True
+            )
+            self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                pbar = self._queue.popleft()
+                # Not pending if it's only queued for its final notification.
+                pending = pbar._notify_pending
+                pbar._notify_pending = False
+                self._running = pbar
+
+            if pending:
+                pbar._deliver_progress_notification()
+
+            # The bar may be closed meanwhile, until it's no longer running.
+            while True:
+                with self._cond:
+                    final = self._finals.pop(pbar, None)
+                    if final is None:
+                        self._running = None
+                        self._cond.notify_all()
+                        break
+                final()
+
+    def _wait_finals(self) -> None:
+        deadline = time.monotonic() + self.exit_timeout
+        with self._cond:
+            while self._finals or (
+                self._running is not None and self._running._closed
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(
+                        'Warning: Gave up waiting for the final progress notifications.'
+                    )
+                    return
+                self._cond.wait(remaining)
+
+    def _reset(self) -> None:
+        # The thread doesn't survive `fork()`, and the bars queued in the parent must be able to submit again.
+        for pbar in self._queue:
+            pbar._notify_pending = False
+        self._queue = deque()
+        self._running = None
+        self._finals = {}
+        self._cond = threading.Condition()
+        self._thread = None
+
+
+_notify_worker: Optional[_NotifyWorker] = None
+_notify_worker_lock = threading.Lock()
+
+
+def _get_notify_worker() -> _NotifyWorker:
+    global _notify_worker
+    with _notify_worker_lock:
+        if _notify_worker is None:
+            _notify_worker = _NotifyWorker()
+        return _notify_worker
+
+
 # Convenience functions similar to tqdm
 def progress(
     iterable=None,
@@ -387,3 +920,62 @@ def progress_range(*args, **kwargs):
     A shortcut for progress(range(*args), **kwargs).
     """
     return progress(range(*args), **kwargs)
+
+
+def aprogress(iterable=None, **kwargs):
+    """
+    A progress bar over an async iterable, the same as progress(iterable, **kwargs) but to be used with
+    `async for`. Plain iterables are also accepted.
+
+    Usage:
+    ```
+    async for record in oven.aprogress(stream, desc='Ingesting'):
+        await handle(record)
+    ```
+    """
+    return progress(iterable, **kwargs)
+
+
+async def as_completed_progress(
+    awaitables: Iterable, total=None, desc='', timeout=None, **kwargs
+):
+    """
+    Await the awaitables concurrently, and yield their results in completion order while tracking how many
+    are done, the same as `asyncio.as_completed()`. If the iteration stops early, e.g. by an exception of an
+    awaitable, a `break` or a timeout, the pending ones are cancelled and waited for.
+
+    Usage:
+    ```
+    async for page in oven.as_completed_progress([fetch(url) for url in urls], desc='Fetching'):
+        save(page)
+    ```
+
+    Args:
+        awaitables: Coroutines, tasks or futures
+        total: Number of awaitables, counted by default
+        desc: Description prefix
+        timeout: Seconds after which `asyncio.TimeoutError` is raised, as in `asyncio.as_completed()`
+        **kwargs: Parameters of the `ProgressBar`
+    """
+    import asyncio
+
+    tasks = [asyncio.ensure_future(aw) for aw in awaitables]
+    pbar = ProgressBar(
+        total=len(tasks) if total is None else total, desc=desc, **kwargs
+    )
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=timeout):
+            result = await next_done
+            pbar.update(1)
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Retrieve the exceptions too, so none is reported as never retrieved.
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await pbar.aclose()
+
+
+async def _aiterate(iterable):
+    for item in iterable:
+        yield item
@@ -0,0 +1,193 @@
+import io
+import os
+import mmap
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+from oven.progress import ProgressBar
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class ProgressFile:
+    """
+    A binary file reader that reports the bytes read through a `ProgressBar`.
+
+    The reads are forwarded to the underlying file, the tracking only counts the returned sizes, so it
+    adds no copy: `readinto()` fills the caller's buffer, and `iter_chunks()` yields views of a memory map
+    or of a reused buffer. Other attributes, e.g. `seek()` or `name`, are those of the underlying file.
+    """
+
+    def __init__(
+        self,
+        path_or_file: Union[str, Path, BinaryIO],
+        total: Optional[int] = None,
+        desc: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            path_or_file: Path of the file to open, or a binary file object, which is closed with the wrapper
+            total: Number of bytes to read, the rest of the file by default if its size is known
+            desc: Description prefix, the file name by default
+            **kwargs: Parameters of the `ProgressBar`
+        """
+        if isinstance(path_or_file, (str, Path)):
+            path_or_file = open(path_or_file, 'rb')
+        self.fileobj = path_or_file
+        if total is None:
+            total = self._get_remaining_size()
+        if desc is None:
+            desc = os.path.basename(str(getattr(self.fileobj, 'name', '')))
+        self.pbar = ProgressBar(total=total, desc=desc, **kwargs)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.pbar.update(len(data))
+        return data
+
+    def read1(self, size: int = -1) -> bytes:
+        data = self.fileobj.read1(size)
+        self.pbar.update(len(data))
+        return data
+
+    def readinto(self, b) -> Optional[int]:
+        n = self.fileobj.readinto(b)
+        if n:
+            self.pbar.update(n)
+        return n
+
+    def readinto1(self, b) -> Optional[int]:
+        n = self.fileobj.readinto1(b)
+        if n:
+            self.pbar.update(n)
+        return n
+
+    def readline(self, size: int = -1) -> bytes:
+        line = self.fileobj.readline(size)
+        self.pbar.update(len(line))
+        return line
+
+    def __iter__(self) -> Iterator[bytes]:
+        for line in self.fileobj:
+            self.pbar.update(len(line))
+            yield line
+
+    def iter_chunks(
+        self, chunk_size: int = DEFAULT_CHUNK_SIZE, use_mmap: bool = True
+    ) -> Iterator[memoryview]:
+        """
+        Iterate over the rest of the file by chunks of `chunk_size` bytes, without copying them.
+
+        The chunks are slices of a read-only memory map of the file, or of one buffer filled by `readinto()`
+        if the file can't be mapped (e.g. a pipe) or `use_mmap` is False. Either way, a chunk is only valid
+        until the next one is requested, copy it with `bytes(chunk)` to keep it.
+        """
+        assert chunk_size > 0, '`chunk_size` should be positive!'
+        mm = self._map() if use_mmap else None
+        if mm is None:
+            yield from self._iter_buffered(chunk_size)
+            return
+
+        pos = self.fileobj.tell()
+        view = memoryview(mm)
+        try:
+            while pos < len(view):
+                chunk = view[pos : pos + chunk_size]
+                # Counted when it's handed out, as the other reads do.
+                pos += len(chunk)
+                self.pbar.update(len(chunk))
+                yield chunk
+                _release(chunk)
+        finally:
+            self.fileobj.seek(pos)
+            _release(view)
+            _release(mm)
+
+    def close(self) -> None:
+        self.pbar.close()
+        self.fileobj.close()
+
+    def __enter__(self) -> 'ProgressFile':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__['fileobj'], name)
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _get_remaining_size(self) -> Optional[int]:
+        try:
+            return (
+                os.fstat(self.fileobj.fileno()).st_size - self.fileobj.tell()
+            )
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    def _map(self) -> Optional[mmap.mmap]:
+        try:
+            return mmap.mmap(self.fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            # Not a regular file, or an empty one.
+            return None
+
+    def _iter_buffered(self, chunk_size: int) -> Iterator[memoryview]:
+        buf = memoryview(bytearray(chunk_size))
+        while True:
+            n = self.readinto(buf)
+            if not n:
+                return
+            yield buf[:n]
+
+
+def _release(buffer) -> None:
+    # The caller may still export it, e.g. through `numpy.frombuffer()`, it's then left to the GC.
+    try:
+        if isinstance(buffer, memoryview):
+            buffer.release()
+        else:
+            buffer.close()
+    except BufferError:
+        pass
+
+
+def progress_file(
+    path_or_file: Union[str, Path, BinaryIO],
+    total: Optional[int] = None,
+    desc: Optional[str] = None,
+    unit: str = 'B',
+    unit_scale: bool = True,
+    unit_divisor: int = 1000,
+    **kwargs,
+) -> ProgressFile:
+    """
+    Track the bytes read from a file, the sizes and rates are scaled with SI prefixes (e.g. `MB/s`), or IEC
+    ones with `unit_divisor=1024` (e.g. `MiB/s`).
+
+    Usage:
+    ```
+    with oven.progress_file('dataset.bin') as f:
+        for chunk in f.iter_chunks():
+            process(chunk)
+    ```
+
+    Args:
+        path_or_file: Path of the file to open, or a binary file object
+        total: Number of bytes to read, the rest of the file by default
+        desc: Description prefix, the file name by default
+        **kwargs: Parameters of the `ProgressBar`, e.g. `file` is where it's displayed
+    """
+    return ProgressFile(
+        path_or_file,
+        total=total,
+        desc=desc,
+        unit=unit,
+        unit_scale=unit_scale,
+        unit_divisor=unit_divisor,
+        **kwargs,
+    )
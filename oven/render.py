@@ -0,0 +1,427 @@
+import os
+import sys
+import time
+import string
+import threading
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from oven.utils.time import milliseconds_to_adaptive_time_cost
+
+# `{l_bar}` and `{r_bar}` are expanded in `bar_format`, as tqdm does.
+L_BAR = '{desc}: {percentage:6.2f}%|'
+R_BAR = '| {n_fmt}/{total_fmt} [{elapsed}{eta}, {rate_fmt}{postfix}]'
+DEFAULT_BAR_FORMAT = L_BAR + '{bar}' + R_BAR
+# Without a total, there is neither a percentage nor a bar.
+DEFAULT_COUNTER_FORMAT = (
+    '{desc}: {n_fmt}{unit} [{elapsed}, {rate_fmt}{postfix}]'
+)
+
+FIELDS = {
+    'desc',
+    'percentage',
+    'n',
+    'total',
+    'n_fmt',
+    'total_fmt',
+    'elapsed',
+    'remaining',
+    'eta',
+    'rate',
+    'rate_fmt',
+    'unit',
+    'postfix',
+}
+
+# Characters of the bar, from empty to full, the ones between are the partially filled cells.
+UNICODE_BAR_CHARS = '-█'
+ASCII_BAR_CHARS = '-#'
+DEFAULT_BAR_WIDTH = 30
+
+SI_PREFIXES = ['', 'k', 'M', 'G', 'T', 'P', 'E', 'Z', 'Y']
+IEC_PREFIXES = ['', 'Ki', 'Mi', 'Gi', 'Ti', 'Pi', 'Ei', 'Zi', 'Yi']
+
+
+class BarFormat:
+    """
+    A `bar_format` compiled once into `(literal, field, format_spec)` segments, so that a frame is only a
+    join of the formatted fields. The `{bar}` field takes the width that is left by the other ones.
+    """
+
+    def __init__(self, fmt: str) -> None:
+        fmt = fmt.replace('{l_bar}', L_BAR).replace('{r_bar}', R_BAR)
+        self.left, self.right = [], []
+        self.has_bar = False
+        self.bar_width: Optional[int] = None  # fixed by `{bar:<width>}`
+        for literal, field, spec, conversion in string.Formatter().parse(fmt):
+            segments = self.right if self.has_bar else self.left
+            if field is None:
+                segments.append((literal, None, ''))
+            elif field == 'bar':
+                assert not self.has_bar, '`{bar}` should appear only once!'
+                segments.append((literal, None, ''))
+                self.has_bar = True
+                self.bar_width = int(spec) if spec else None
+            else:
+                assert (
+                    field in FIELDS
+                ), f'Unknown field `{field}` in bar_format, available ones are {sorted(FIELDS)}.'
+                assert (
+                    conversion is None
+                ), 'Conversions are not supported in bar_format.'
+                segments.append((literal, field, spec or ''))
+
+    def format(
+        self,
+        fields: Dict,
+        frac: float,
+        ncols: Optional[int],
+        bar_chars: str,
+    ) -> str:
+        left = self._join(self.left, fields)
+        if not self.has_bar:
+            return left
+        right = self._join(self.right, fields)
+        width = self.bar_width
+        if width is None:
+            width = (
+                ncols - len(left) - len(right) if ncols else DEFAULT_BAR_WIDTH
+            )
+        return left + make_bar(frac, max(width, 0), bar_chars) + right
+
+    def _join(self, segments, fields: Dict) -> str:
+        return ''.join(
+            [
+                literal + (format(fields[field], spec) if field else '')
+                for literal, field, spec in segments
+            ]
+        )
+
+
+def make_bar(frac: float, width: int, bar_chars: str) -> str:
+    frac = min(max(frac, 0.0), 1.0)
+    n_levels = len(bar_chars) - 1
+    n_full, level = divmod(int(frac * width * n_levels), n_levels)
+    bar = bar_chars[-1] * n_full
+    if n_full < width:
+        bar += bar_chars[level] + bar_chars[0] * (width - n_full - 1)
+    return bar
+
+
+def format_sizeof(num: float, divisor: int = 1000) -> str:
+    """Format a number with an SI prefix, e.g. `1.23M`, or an IEC one if the divisor is 1024, e.g. `1.23Mi`."""
+    prefixes = IEC_PREFIXES if divisor == 1024 else SI_PREFIXES
+    for prefix in prefixes:
+        if abs(num) < 999.5:
+            if abs(num) < 99.95:
+                if abs(num) < 9.995:
+                    return f'{num:1.2f}{prefix}'
+                return f'{num:2.1f}{prefix}'
+            return f'{num:3.0f}{prefix}'
+        num /= divisor
+    return f'{num * divisor:3.1f}{prefixes[-1]}'
+
+
+def format_counts(
+    n: int,
+    total: Optional[int],
+    rate: float,
+    unit: str = 'it',
+    unit_scale: Union[bool, float] = False,
+    unit_divisor: int = 1000,
+) -> Tuple[str, str, str]:
+    """Format `(n, total, rate)` as `(n_fmt, total_fmt, rate_fmt)`, scaled with a prefix if `unit_scale`."""
+    if not unit_scale:
+        return str(n), str(total) if total else '?', f'{rate:.2f}{unit}/s'
+    scale = 1 if unit_scale is True else unit_scale
+    return (
+        format_sizeof(n * scale, unit_divisor),
+        format_sizeof(total * scale, unit_divisor) if total else '?',
+        f'{format_sizeof(rate * scale, unit_divisor)}{unit}/s',
+    )
+
+
+def format_time(seconds: float) -> str:
+    return milliseconds_to_adaptive_time_cost(int(seconds * 1000))
+
+
+class Renderer:
+    """
+    Render the lines of a progress bar to its file, each line is formatted from a compiled `bar_format`.
+    On a terminal, the frames are drawn by the `RenderManager` of the terminal, which places the bar on its
+    own line. Pipes and log files get a plain line every `non_tty_interval` seconds and a last one at the
+    end instead, so they are not flooded by frames.
+    """
+
+    non_tty_interval = 10.0
+
+    def __init__(
+        self,
+        file=None,
+        ncols: Optional[int] = None,
+        bar_format: Optional[str] = None,
+        ascii: Optional[Union[bool, str]] = None,
+        dynamic_ncols: bool = False,
+        unit: str = 'it',
+        unit_scale: Union[bool, float] = False,
+        unit_divisor: int = 1000,
+        position: Optional[int] = None,
+    ) -> None:
+        self.file = file
+        self.ncols = ncols
+        self.dynamic_ncols = dynamic_ncols
+        self.unit = unit
+        self.unit_scale = unit_scale
+        self.unit_divisor = unit_divisor
+        if isinstance(ascii, str):
+            assert (
+                len(ascii) >= 2
+            ), '`ascii` should have at least 2 characters!'
+            self.bar_chars = ascii
+        else:
+            self.bar_chars = ASCII_BAR_CHARS if ascii else UNICODE_BAR_CHARS
+        self.bar_format = BarFormat(bar_format or DEFAULT_BAR_FORMAT)
+        # A custom format is used with or without a total.
+        self.counter_format = (
+            self.bar_format
+            if bar_format
+            else BarFormat(DEFAULT_COUNTER_FORMAT)
+        )
+
+        self.position = position
+        self._last_line_time = None
+
+    def get_file(self):
+        # Resolved on each frame, so that redirecting `sys.stdout` works.
+        return self.file if self.file is not None else sys.stdout
+
+    def is_tty(self) -> bool:
+        try:
+            return self.get_file().isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def get_ncols(self) -> Optional[int]:
+        if self.dynamic_ncols:
+            try:
+                return os.get_terminal_size(self.get_file().fileno()).columns
+            except (AttributeError, ValueError, OSError):
+                pass
+        return self.ncols
+
+    def format_meter(
+        self,
+        desc: str,
+        n: int,
+        total: Optional[int],
+        elapsed: float,
+        rate: float,
+        postfix: Optional[Dict] = None,
+        ncols: Optional[int] = None,
+    ) -> str:
+        """Format one line of the progress bar."""
+        n_fmt, total_fmt, rate_fmt = format_counts(
+            n, total, rate, self.unit, self.unit_scale, self.unit_divisor
+        )
+
+        remaining_fmt, eta = '?', ''
+        if total and rate > 0:
+            remaining_fmt = format_time(max(total - n, 0) / rate)
+            if n < total:
+                eta = f', ETA: {remaining_fmt}'
+
+        fields = {
+            'desc': desc,
+            'percentage': (n / total * 100) if total else 0.0,
+            'n': n,
+            'total': total or 0,
+            'n_fmt': n_fmt,
+            'total_fmt': total_fmt,
+            'elapsed': format_time(elapsed),
+            'remaining': remaining_fmt,
+            'eta': eta,
+            'rate': rate,
+            'rate_fmt': rate_fmt,
+            'unit': self.unit,
+            'postfix': (
+                ', ' + ', '.join(f'{k}={v}' for k, v in postfix.items())
+                if postfix
+                else ''
+            ),
+        }
+        ncols = ncols if ncols is not None else self.get_ncols()
+        fmt = self.bar_format if total else self.counter_format
+        line = fmt.format(
+            fields, (n / total) if total else 0.0, ncols, self.bar_chars
+        )
+        if ncols and len(line) > ncols:
+            line = line[:ncols]
+        return line
+
+    def display(self, get_line: Callable[[], str]) -> None:
+        """
+        Show the current line, `get_line()` formats it. On a terminal, the frames are drawn by the render
+        manager of the terminal. Otherwise the lines are rate-limited.
+        """
+        if self.is_tty():
+            get_render_manager(self.get_file()).update(self, get_line)
+        else:
+            now = time.monotonic()
+            if (
+                self._last_line_time is None
+                or now - self._last_line_time >= self.non_tty_interval
+            ):
+                self._last_line_time = now
+                self._write(get_line() + '\n')
+
+    def close(self, get_line: Callable[[], str], leave: bool) -> None:
+        """Show the last line and keep it if `leave`, or erase it."""
+        if self.is_tty():
+            get_render_manager(self.get_file()).release(self, get_line, leave)
+        elif leave:
+            self._write(get_line() + '\n')
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _write(self, s: str) -> None:
+        file = self.get_file()
+        file.write(s)
+        file.flush()
+
+
+class RenderManager:
+    """
+    Own a terminal for all the progress bars drawn on it, so that nested and positioned bars don't overwrite
+    each other. Each active bar has a line, ordered by position, and all of them are redrawn in one write
+    per frame using ANSI cursor movements. Updating a bar only marks it dirty: the frames are throttled to
+    `frame_interval` seconds whatever the number of bars, the late ones are drawn from the scheduler
+    thread. The lines of the closed bars that are left are moved above the active ones. The lines are clamped
+    to the width of the terminal, a wrapped line would shift the cursor movements.
+    """
+
+    frame_interval = 0.05
+
+    def __init__(self, file) -> None:
+        self.file = file
+        # Renderer -> `[position, get_line, line]`, the line is None if it's dirty.
+        self._entries: Dict[Renderer, list] = {}
+        # Lines of the closed bars, to be drawn once above the active ones.
+        self._left_lines = []
+        # Active lines on the screen, the cursor is at the first one.
+        self._n_drawn = 0
+        self._last_frame_time = 0.0
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def update(self, renderer: Renderer, get_line: Callable[[], str]) -> None:
+        with self._lock:
+            entry = self._entries.get(renderer, None)
+            if entry is None:
+                entry = self._entries[renderer] = [
+                    self._get_position(renderer),
+                    get_line,
+                    None,
+                ]
+            entry[1] = get_line
+            entry[2] = None
+            delay = (
+                self._last_frame_time + self.frame_interval - time.monotonic()
+            )
+            if delay <= 0:
+                self._draw()
+            elif self._timer is None:
+                from oven.utils.scheduler import get_scheduler
+
+                self._timer = get_scheduler().call_later(delay, self._on_timer)
+
+    def release(
+        self, renderer: Renderer, get_line: Callable[[], str], leave: bool
+    ) -> None:
+        """Remove the bar, its last line is kept above the others if `leave`. The frame is drawn at once."""
+        with self._lock:
+            self._entries.pop(renderer, None)
+            if leave:
+                self._left_lines.append(get_line())
+            self._draw()
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _get_position(self, renderer: Renderer) -> int:
+        if renderer.position is not None:
+            return renderer.position
+        # The lowest free one, e.g. 1 for the inner bar of a nested loop.
+        taken = {entry[0] for entry in self._entries.values()}
+        position = 0
+        while position in taken:
+            position += 1
+        return position
+
+    def _get_columns(self) -> Optional[int]:
+        # Resolved on each frame, the terminal may be resized.
+        try:
+            columns = os.get_terminal_size(self.file.fileno()).columns
+        except (AttributeError, ValueError, OSError):
+            columns = 0
+        return columns or None  # not clamped, `line[:None]` is the whole line
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            if any(entry[2] is None for entry in self._entries.values()):
+                self._draw()
+
+    def _draw(self) -> None:
+        """Redraw the frame in one write, called with the lock held."""
+        entries = sorted(self._entries.values(), key=lambda entry: entry[0])
+        columns = self._get_columns()
+        for entry in entries:
+            if entry[2] is None:
+                entry[2] = entry[1]()
+            entry[2] = entry[2][:columns]
+
+        parts = ['\r']
+        for line in self._left_lines:
+            parts.append(line[:columns] + CLEAR_LINE + '\n')
+        parts.append('\n'.join(entry[2] + CLEAR_LINE for entry in entries))
+        n_drawn = len(entries) + len(self._left_lines)
+        if n_drawn < self._n_drawn:
+            parts.append(CLEAR_BELOW)  # the lines of the bars that are gone
+        if len(entries) > 1:
+            # Back to the first line.
+            parts.append(f'\x1b[{len(entries) - 1}A\r')
+
+        self._left_lines = []
+        self._n_drawn = len(entries)
+        self._last_frame_time = time.monotonic()
+        self.file.write(''.join(parts))
+        self.file.flush()
+
+
+CLEAR_LINE = '\x1b[K'  # erase to the end of the line
+CLEAR_BELOW = '\x1b[J'  # erase to the end of the screen
+
+_managers: Dict[int, RenderManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_render_manager(file) -> RenderManager:
+    """Get the render manager of a terminal, there is one per file object in the process."""
+    with _managers_lock:
+        manager = _managers.get(id(file), None)
+        if manager is None or manager.file is not file:
+            manager = _managers[id(file)] = RenderManager(file)
+        return manager
+
+
+def _reset_managers() -> None:
+    # The locks may be held by threads that don't exist in the child.
+    global _managers, _managers_lock
+    _managers = {}
+    _managers_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_managers)
@@ -0,0 +1,256 @@
+import os
+import mmap
+import atexit
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows, slots are claimed without locking.
+    fcntl = None
+
+from oven.progress import ProgressBar
+
+_SLOT_SIZE = 8  # int64
+
+
+class SharedProgress:
+    """
+    A progress bar shared by several processes, e.g. the workers of a `multiprocessing.Pool`.
+
+    The counts live in a small mmap'd file, one int64 slot per worker thread, plus a header slot that
+    counts the claimed slots. A worker claims a slot on its first `update()` (the only locked step), then
+    it only writes its own slot, so there is no IPC round-trip. The process that creates the object is
+    the owner: it polls the sum of the slots from the shared scheduler thread, and renders and notifies
+    the global progress through a normal `ProgressBar`. The object can be pickled to `spawn`ed processes,
+    and inherited by `fork`ed ones.
+
+    Usage:
+    ```
+    def work(item, progress):
+        ...
+        progress.update(1)
+
+    with oven.SharedProgress(total=len(items), desc='Processing') as progress:
+        with multiprocessing.Pool(8) as pool:
+            pool.starmap(work, [(item, progress) for item in items])
+    ```
+    """
+
+    def __init__(
+        self,
+        total: Optional[int] = None,
+        desc: str = '',
+        n_slots: int = 256,
+        poll_interval: float = 0.1,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            total: Total number of iterations of all the workers
+            desc: Description prefix
+            n_slots: Maximum number of worker threads, the extra ones share the last slot under a lock
+            poll_interval: Seconds between the owner's polls of the slots
+            **kwargs: Parameters of the owner's `ProgressBar`
+        """
+        assert n_slots > 0, '`n_slots` should be positive!'
+        self.n_slots = n_slots
+        shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+        fd, self.path = tempfile.mkstemp(prefix='oven-progress-', dir=shm_dir)
+        os.ftruncate(fd, (n_slots + 1) * _SLOT_SIZE)
+        os.close(fd)
+
+        self._owner_pid = os.getpid()
+        self._init_local_state()
+
+        # Owner side.
+        self.pbar = ProgressBar(total=total, desc=desc, **kwargs)
+        self._polled_n = 0
+        from oven.utils.scheduler import get_scheduler
+
+        self._poll_timer = get_scheduler().call_every(
+            poll_interval, self._poll
+        )
+
+    @property
+    def is_owner(self) -> bool:
+        return os.getpid() == self._owner_pid
+
+    @property
+    def n(self) -> int:
+        """The global count, summed over all the slots."""
+        slots = self._get_slots()
+        return sum(slots[1:])
+
+    def update(self, n: int = 1) -> None:
+        """Update the progress by n steps, it can be called from any process and thread."""
+        slot = self._get_slot()
+        slots = self._get_slots()
+        if slot < self.n_slots:
+            slots[slot] += n
+        else:
+            # Out of slots, share the last one.
+            with self._locked():
+                slots[self.n_slots] += n
+
+    def close(self) -> None:
+        """Render and notify the final progress in the owner, and release the shared file."""
+        if self.is_owner and self.pbar is not None:
+            self._poll_timer.cancel()
+            self._poll()
+            self.pbar.close()
+            self.pbar = None
+            self._release()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+        elif not self.is_owner:
+            self._release()
+
+    def __enter__(self) -> 'SharedProgress':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __getstate__(self):
+        # Only the location of the slots is sent to other processes.
+        return {
+            'path': self.path,
+            'n_slots': self.n_slots,
+            '_owner_pid': self._owner_pid,
+        }
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self.pbar = None
+        self._init_local_state()
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _init_local_state(self) -> None:
+        self._attachment: Optional[_Attachment] = None
+
+    def _attach(self) -> '_Attachment':
+        # Every unpickled copy, e.g. one per task of `pool.starmap()`, shares the mapping and the slots of
+        # its process. A forked child attaches again, the parent's lock may be held by a missing thread.
+        attachment = self._attachment
+        if attachment is None or attachment.pid != os.getpid():
+            attachment = _attach(self.path, self.n_slots)
+            self._attachment = attachment
+        return attachment
+
+    def _get_slots(self) -> memoryview:
+        return self._attach().slots
+
+    def _get_slot(self) -> int:
+        attachment = self._attach()
+        slot = getattr(attachment.local, 'slot', None)
+        if slot is not None:
+            return slot
+        with self._locked():
+            attachment.slots[0] += 1
+            slot = attachment.slots[0]
+        attachment.local.slot = slot
+        return slot
+
+    def _locked(self):
+        attachment = self._attach()
+        return _FileLock(attachment.lock, attachment.fd)
+
+    def _poll(self) -> None:
+        if self.pbar is None:
+            return
+        n = self.n
+        if n > self._polled_n:
+            self.pbar.update(n - self._polled_n)
+            self._polled_n = n
+
+    def _release(self) -> None:
+        # Only the owner detaches at once, other processes may still hold copies that share the mapping,
+        # so they detach at exit.
+        if self.is_owner:
+            _detach(self.path)
+        self._attachment = None
+
+
+class _Attachment:
+    """The mapping of a slots file in one process, and the slot claimed by each of its threads."""
+
+    def __init__(self, path: str, n_slots: int) -> None:
+        self.pid = os.getpid()
+        self.fd = os.open(path, os.O_RDWR)
+        self.mm = mmap.mmap(self.fd, (n_slots + 1) * _SLOT_SIZE)
+        self.slots = memoryview(self.mm).cast('q')
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def release(self) -> None:
+        self.slots.release()
+        self.mm.close()
+        os.close(self.fd)
+
+
+# Keyed by `(path, pid)`, so that a forked child never uses the mappings of its parent.
+_attachments: Dict[Tuple[str, int], _Attachment] = {}
+_attachments_lock = threading.Lock()
+
+
+def _attach(path: str, n_slots: int) -> _Attachment:
+    key = (path, os.getpid())
+    with _attachments_lock:
+        attachment = _attachments.get(key)
+        if attachment is None:
+            attachment = _attachments[key] = _Attachment(path, n_slots)
+        return attachment
+
+
+def _detach(path: str) -> None:
+    with _attachments_lock:
+        attachment = _attachments.pop((path, os.getpid()), None)
+    if attachment is not None:
+        try:
+            attachment.release()
+        except BufferError:
+            # A slot view is still exported, it's left to the GC.
+            pass
+
+
+@atexit.register
+def _detach_all() -> None:
+    for path, pid in list(_attachments):
+        if pid == os.getpid():
+            _detach(path)
+
+
+def _reset_after_fork() -> None:
+    # The lock may be held by a thread that doesn't exist in the child, the parent's entries are kept
+    # until the child exits, they are simply never looked up.
+    global _attachments_lock
+    _attachments_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class _FileLock:
+    """Lock the threads of this process, then the other processes through `flock()`."""
+
+    def __init__(self, lock: threading.Lock, fd: int) -> None:
+        self.lock = lock
+        self.fd = fd
+
+    def __enter__(self) -> None:
+        self.lock.acquire()
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.lock.release()
@@ -1,14 +1,8 @@
 import os
 from typing import Union
 from pathlib import Path
-from omegaconf import OmegaConf
 
-from .cfg import (
-    get_cfg_temp,
-    modify_cfg_with_new_backend,
-    get_latest_cfg_version,
-)
-from .version import get_latest_oven_version
+# Heavy dependencies (omegaconf, requests) are imported inside the functions, so that the CLI starts fast.
 
 
 def get_home_path() -> Path:
@@ -33,6 +27,8 @@ def dump_cfg_temp(overwrite: bool = False) -> Union[str, Path]:
     if not overwrite and Path(path).exists():
         print(f'File already exists: {path}')
     else:
+        from .cfg import get_cfg_temp
+
         print(f'Dumping config template to: {path}')
         path.parent.mkdir(parents=True, exist_ok=True)
         with open(path, 'w') as f:
@@ -41,13 +37,18 @@ def dump_cfg_temp(overwrite: bool = False) -> Union[str, Path]:
 
 
 def toggle_backend(backend: str) -> None:
+    from .cfg import modify_cfg_with_new_backend
+
     cfg_fn = get_cfg_path()
     modify_cfg_with_new_backend(cfg_fn, backend)
 
 
 def check_version() -> None:
     print('🚧 Experimental function!')
+    from omegaconf import OmegaConf
     from oven import __version__
+    from .cfg import get_latest_cfg_version
+    from .version import get_latest_oven_version
 
     # Oven version.
     oven_version = __version__.strip()
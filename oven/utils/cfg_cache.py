@@ -0,0 +1,48 @@
+import os
+import json
+from pathlib import Path
+from typing import Dict, Union
+
+SNAPSHOT_VERSION = 1
+
+
+def get_snapshot_path(cfg_path: Union[Path, str]) -> Path:
+    cfg_path = Path(cfg_path)
+    return cfg_path.with_name(f'.{cfg_path.name}.snapshot.json')
+
+
+def load_cfg(cfg_path: Union[Path, str]) -> Dict:
+    """
+    Load the resolved configuration as plain dicts. Parsing YAML with omegaconf is slow to import, so the
+    result is kept in a JSON snapshot next to `cfg.yaml`, keyed on the file's mtime and size. The snapshot
+    is rebuilt automatically once the YAML changes.
+    """
+    cfg_path = Path(cfg_path)
+    stat = cfg_path.stat()
+    key = [SNAPSHOT_VERSION, stat.st_mtime_ns, stat.st_size]
+    snapshot_path = get_snapshot_path(cfg_path)
+
+    try:
+        with open(snapshot_path, 'r') as f:
+            snapshot = json.load(f)
+        if snapshot['key'] == key:
+            return snapshot['cfg']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # missing or broken snapshot, rebuild it
+
+    from omegaconf import OmegaConf
+
+    cfg = OmegaConf.to_container(OmegaConf.load(cfg_path), resolve=True)
+    try:
+        # Write atomically, concurrent `ding`s may rebuild it at the same time.
+        tmp_path = snapshot_path.with_name(
+            f'{snapshot_path.name}.{os.getpid()}.tmp'
+        )
+        # It may contain secrets, keep it private.
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'key': key, 'cfg': cfg}, f)
+        os.replace(tmp_path, snapshot_path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f'Warning: Could not write the configuration snapshot: {e}')
+    return cfg
@@ -0,0 +1,222 @@
+import os
+import mmap
+import hashlib
+import itertools
+from typing import NamedTuple, Optional, Tuple
+
+# (rank, local rank, world size, local world size) variables of the launchers, the first one set wins.
+_RANK_ENV_VARS = [
+    # torchrun, `torch.distributed.launch`, accelerate, deepspeed...
+    ('RANK', 'LOCAL_RANK', 'WORLD_SIZE', 'LOCAL_WORLD_SIZE'),
+    # srun
+    ('SLURM_PROCID', 'SLURM_LOCALID', 'SLURM_NTASKS', 'SLURM_NTASKS_PER_NODE'),
+]
+
+# Variables identifying the launch, shared by all its ranks.
+_JOB_ENV_VARS = [
+    'TORCHELASTIC_RUN_ID',
+    'MASTER_ADDR',
+    'MASTER_PORT',
+    'SLURM_JOB_ID',
+    'SLURM_STEP_ID',
+]
+
+_SLOT_FIELDS = 3  # (state, n, total) int64 per local rank
+# Bits of the state of a slot.
+_OPENED, _PUBLISHED, _CLOSED = 1, 2, 4
+
+
+class RankInfo(NamedTuple):
+    rank: int = 0
+    local_rank: int = 0
+    world_size: int = 1
+    local_world_size: int = 1
+
+    @property
+    def is_distributed(self) -> bool:
+        return self.world_size > 1
+
+    @property
+    def is_primary(self) -> bool:
+        return self.rank == 0
+
+
+def get_rank_info() -> RankInfo:
+    """Detect the rank of this process from the environment of the launcher, a single process by default."""
+    for rank_var, local_rank_var, world_var, local_world_var in _RANK_ENV_VARS:
+        if rank_var not in os.environ or world_var not in os.environ:
+            continue
+        try:
+            rank = int(os.environ[rank_var])
+            world_size = int(os.environ[world_var])
+            local_rank = int(os.environ.get(local_rank_var, rank))
+            # SLURM may give a list like `4(x2)`, the ranks of a node are contiguous anyway.
+            local_world_size = os.environ.get(local_world_var, '')
+            local_world_size = int(local_world_size.split('(')[0] or 0)
+        except ValueError:
+            continue
+        return RankInfo(
+            rank=rank,
+            local_rank=local_rank,
+            world_size=world_size,
+            local_world_size=local_world_size or world_size,
+        )
+    return RankInfo()
+
+
+def should_deliver() -> bool:
+    """
+    Only the primary rank delivers the notifications of a distributed launch, unless the environment variable
+    `OVEN_ALL_RANKS` is set. The exceptions of the other ranks are still delivered.
+    """
+    return get_rank_info().is_primary or bool(os.environ.get('OVEN_ALL_RANKS'))
+
+
+def format_rank() -> str:
+    """The prefix of the exceptions raised in a distributed launch, empty otherwise."""
+    info = get_rank_info()
+    if not info.is_distributed:
+        return ''
+    return f'[rank {info.rank}/{info.world_size}] '
+
+
+def get_job_key() -> str:
+    """An identifier of the launch, the same in all of its ranks on this host."""
+    values = [os.environ.get(var, '') for var in _JOB_ENV_VARS]
+    if not any(values):
+        # Started by a plain `multiprocessing` parent, it's the launcher.
+        values = [str(os.getppid())]
+    return hashlib.sha1('|'.join(values).encode()).hexdigest()[:16]
+
+
+class RankChannel:
+    """
+    Per-rank progress `(n, total)` in a small mmap'd file shared by the ranks on this host. Each rank only
+    overwrites its own slot, so publishing is lock-free, and the primary rank sums the slots up to notify
+    the progress of the whole launch. The ranks find the file by name, the first one creates it.
+
+    The name includes the launcher process, so that a new launch never reads the file left by a crashed
+    one. The file is unlinked by the last rank that closes it: a rank still to attach would otherwise create
+    a new file of its own. The files of the launchers that are gone are removed by the local rank 0.
+    """
+
+    _seq = itertools.count()
+    _swept = False
+
+    def __init__(self, name: str, info: Optional[RankInfo] = None) -> None:
+        self.info = info or get_rank_info()
+        self.n_slots = self.info.local_world_size
+        assert (
+            0 <= self.info.local_rank < self.n_slots
+        ), f'Invalid local rank {self.info.local_rank}!'
+        shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else '/tmp'
+        if self.info.local_rank == 0:
+            _sweep_channels(shm_dir)
+        self.path = os.path.join(
+            shm_dir, f'oven-ranks-{get_job_key()}-{_get_launcher_id()}-{name}'
+        )
+        size = self.n_slots * _SLOT_FIELDS * 8
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._slots = memoryview(self._mm).cast('q')
+        self._offset = self.info.local_rank * _SLOT_FIELDS
+        self._slots[self._offset] = _OPENED
+
+    @classmethod
+    def for_progress(cls, desc: str) -> Optional['RankChannel']:
+        """
+        The channel of a progress bar, None outside a distributed launch. The ranks are expected to create
+        their progress bars in the same order, the n-th ones of all the ranks share a channel.
+        """
+        info = get_rank_info()
+        if not info.is_distributed:
+            return None
+        name = hashlib.sha1(desc.encode()).hexdigest()[:8]
+        return cls(f'{name}-{next(cls._seq)}', info)
+
+    def publish(self, n: int, total: Optional[int]) -> None:
+        slots = self._slots
+        if slots is None:
+            return
+        i = self._offset
+        slots[i + 1] = n
+        slots[i + 2] = total or 0
+        slots[i] |= _PUBLISHED
+
+    def read(self) -> Tuple[int, int, int]:
+        """Return the summed `(n, total, n_ranks)` of the ranks that published, total is 0 if some are unknown."""
+        n, total, n_ranks, known = 0, 0, 0, True
+        slots = self._slots
+        for i in range(0, len(slots), _SLOT_FIELDS):
+            if slots[i] & _PUBLISHED:
+                n += slots[i + 1]
+                total += slots[i + 2]
+                known = known and slots[i + 2] > 0
+                n_ranks += 1
+        return n, total if known else 0, n_ranks
+
+    def close(self) -> None:
+        slots = self._slots
+        if slots is None:
+            return
+        slots[self._offset] |= _CLOSED
+        last = all(
+            slots[i] & _CLOSED for i in range(0, len(slots), _SLOT_FIELDS)
+        )
+        slots.release()
+        self._slots = None
+        self._mm.close()
+        # The ranks still running keep their mapping.
+        if last:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+# ================ #
+# Utils functions. #
+# ================ #
+
+
+def _get_launcher_id() -> str:
+    """The parent process shared by the ranks on this host, with its start time as pids are reused."""
+    ppid = os.getppid()
+    try:
+        with open(f'/proc/{ppid}/stat') as f:
+            # The command name may contain spaces, the fields after it are fixed.
+            start_time = f.read().rsplit(')', 1)[1].split()[19]
+    except (OSError, IndexError):
+        return str(ppid)
+    return f'{ppid}.{start_time}'
+
+
+def _sweep_channels(shm_dir: str) -> None:
+    """Remove the channel files left by the launchers that are gone, once per process."""
+    if RankChannel._swept:
+        return
+    RankChannel._swept = True
+    try:
+        names = os.listdir(shm_dir)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith('oven-ranks-'):
+            continue
+        try:
+            pid = int(name.split('-')[3].split('.')[0])
+            os.kill(pid, 0)
+        except (IndexError, ValueError):
+            continue
+        except ProcessLookupError:
+            try:
+                os.unlink(os.path.join(shm_dir, name))
+            except OSError:
+                pass
+        except OSError:
+            continue  # alive, owned by another user
@@ -0,0 +1,108 @@
+import os
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from oven.consts import HTTP_POOL_SIZE, REQ_CONNECT_TIMEOUT, REQ_READ_TIMEOUT
+
+# Per-process pooled session shared by the webhook backends.
+_session = None
+_session_lock = threading.Lock()
+_http_cfg = {
+    'pool_size': HTTP_POOL_SIZE,
+    'connect_timeout': REQ_CONNECT_TIMEOUT,
+    'read_timeout': REQ_READ_TIMEOUT,
+}
+# `time.monotonic()` before which the current delivery should end, set by `NotifierBackendBase.deliver()`.
+_deadline: 'ContextVar[Optional[float]]' = ContextVar('deadline', default=None)
+# Timeouts are never capped below it, so that an attempt can still get through.
+MIN_TIMEOUT = 0.1
+
+
+def configure_http(cfg: Optional[Dict] = None) -> None:
+    """Update the pool size and timeouts. The session will be re-created on next use."""
+    global _session
+    cfg = cfg or {}
+    with _session_lock:
+        for k in _http_cfg.keys():
+            if cfg.get(k, None) is not None:
+                _http_cfg[k] = cfg[k]
+        _session = None
+
+
+def get_session():
+    """Get the keep-alive session of current process, create it lazily."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_http_cfg['pool_size'],
+                pool_maxsize=_http_cfg['pool_size'],
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def post(url: str, **kwargs):
+    """
+    `requests.post()` through the pooled session, with split connect/read timeouts by default, capped to
+    the deadline of the current delivery.
+    """
+    kwargs.setdefault(
+        'timeout',
+        (
+            cap_timeout(_http_cfg['connect_timeout']),
+            cap_timeout(_http_cfg['read_timeout']),
+        ),
+    )
+    return get_session().post(url, **kwargs)
+
+
+@contextmanager
+def deadline(at: Optional[float]):
+    """Cap the timeouts of the requests made in this context to the `time.monotonic()` deadline."""
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def cap_timeout(timeout: float) -> float:
+    """The timeout left before the deadline of the current delivery, if any."""
+    at = _deadline.get()
+    if at is None:
+        return timeout
+    return max(min(timeout, at - time.monotonic()), MIN_TIMEOUT)
+
+
+def _close_session() -> None:
+    # Otherwise urllib3 fails to close the pool while the interpreter shuts down, and prints a traceback.
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _reset_after_fork() -> None:
+    # Sockets and the lock may be inherited in a broken state, never share them with the parent.
+    global _session, _session_lock
+    _session = None
+    _session_lock = threading.Lock()
+
+
+# Registered at import, i.e. before the exit hooks of the dispatcher and the progress bars, which may still
+# deliver, so it runs after them.
+atexit.register(_close_session)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
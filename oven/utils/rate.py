@@ -0,0 +1,140 @@
+from typing import Optional
+
+
+class RateEstimator:
+    """
+    Estimate the rate of a progress from its `(n, time)` samples, each sample is O(1).
+
+    The time before the first sample, and the samples in the first `warmup` seconds after it, only move
+    the origin, so a slow start (loading, compiling, warming caches up) doesn't bias the estimation.
+    """
+
+    def __init__(self, warmup: float = 0.0) -> None:
+        self.warmup = warmup
+        self._origin_t: Optional[float] = None
+        self._last_n = 0
+        self._last_t = 0.0
+
+    def update(self, n: int, t: float) -> None:
+        if self._origin_t is None or t - self._origin_t < self.warmup:
+            # Still warming up, the sample becomes the reference.
+            if self._origin_t is None:
+                self._origin_t = t
+            self._reset(n, t)
+        elif t > self._last_t:
+            self._add(n - self._last_n, t - self._last_t, n, t)
+        else:
+            return
+        self._last_n = n
+        self._last_t = t
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Units per second, None until there are enough samples."""
+        raise NotImplementedError()
+
+    def eta(self, remaining: int) -> Optional[float]:
+        """Seconds to process the remaining units, None if the rate is unknown."""
+        rate = self.rate
+        if not rate:
+            return None
+        return remaining / rate
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _reset(self, n: int, t: float) -> None:
+        pass
+
+    def _add(self, dn: int, dt: float, n: int, t: float) -> None:
+        raise NotImplementedError()
+
+
+class EMARateEstimator(RateEstimator):
+    """
+    Exponential moving average of the rate, as tqdm does. `smoothing` is the weight of the latest sample,
+    from 0 (the average since the origin) to 1 (the instantaneous rate).
+    """
+
+    def __init__(self, smoothing: float = 0.3, warmup: float = 0.0) -> None:
+        assert 0 <= smoothing <= 1, '`smoothing` should be in [0, 1]!'
+        super().__init__(warmup)
+        self.smoothing = smoothing
+        self._reset(0, 0.0)
+
+    @property
+    def rate(self) -> Optional[float]:
+        if self._dt <= 0:
+            return None
+        return self._dn / self._dt
+
+    def _reset(self, n: int, t: float) -> None:
+        self._ema_dn = 0.0
+        self._ema_dt = 0.0
+        self._n_samples = 0
+        self._dn = 0.0
+        self._dt = 0.0
+
+    def _add(self, dn: int, dt: float, n: int, t: float) -> None:
+        if self.smoothing == 0:
+            # Plain sums, i.e. the average since the origin.
+            self._dn += dn
+            self._dt += dt
+            return
+        # The increments are averaged separately, so that long and short intervals are weighted by their
+        # duration. The averages are debiased from their zero initialization, their ratio is the rate.
+        beta = 1 - self.smoothing
+        self._n_samples += 1
+        self._ema_dn = self.smoothing * dn + beta * self._ema_dn
+        self._ema_dt = self.smoothing * dt + beta * self._ema_dt
+        debias = 1 - beta**self._n_samples
+        self._dn = self._ema_dn / debias
+        self._dt = self._ema_dt / debias
+
+
+class WindowRateEstimator(RateEstimator):
+    """
+    Rate over the last `window` samples, kept in a fixed-size ring buffer. It follows changes of the
+    throughput exactly once they fill the window, and forgets everything older.
+    """
+
+    def __init__(self, window: int = 32, warmup: float = 0.0) -> None:
+        assert window >= 2, '`window` should hold at least 2 samples!'
+        super().__init__(warmup)
+        self.window = window
+        self._ns = [0] * window
+        self._ts = [0.0] * window
+        self._reset(0, 0.0)
+
+    @property
+    def rate(self) -> Optional[float]:
+        if self._size < 2:
+            return None
+        oldest = (self._head - self._size) % self.window
+        newest = (self._head - 1) % self.window
+        dt = self._ts[newest] - self._ts[oldest]
+        if dt <= 0:
+            return None
+        return (self._ns[newest] - self._ns[oldest]) / dt
+
+    def _reset(self, n: int, t: float) -> None:
+        # Rewinding is enough, the stale slots are out of `_size` and overwritten before being read.
+        self._head = 0  # next slot to write
+        self._size = 0
+        self._add(0, 0.0, n, t)
+
+    def _add(self, dn: int, dt: float, n: int, t: float) -> None:
+        self._ns[self._head] = n
+        self._ts[self._head] = t
+        self._head = (self._head + 1) % self.window
+        self._size = min(self._size + 1, self.window)
+
+
+def build_rate_estimator(
+    smoothing: float = 0.3, window: Optional[int] = None, warmup: float = 0.0
+) -> RateEstimator:
+    """A sliding-window estimator if `window` is given, an exponential moving average otherwise."""
+    if window:
+        return WindowRateEstimator(window, warmup)
+    return EMARateEstimator(smoothing, warmup)
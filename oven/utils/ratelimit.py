@@ -0,0 +1,83 @@
+import os
+import time
+import struct
+import hashlib
+import threading
+from pathlib import Path
+from typing import Union
+
+try:
+    import fcntl
+except ImportError:  # Windows, the budget is only shared inside the process.
+    fcntl = None
+
+_STATE = struct.Struct('<dd')  # (tokens, timestamp)
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter whose budget is shared by all processes on the host.
+
+    The state lives in a tiny file guarded by `flock()`, so 16 jobs posting to the same hook share one
+    budget of `capacity` messages per `period` seconds. Tokens are reserved in arrival order, thus a
+    caller computes its own waiting time under the lock and sleeps outside of it.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        capacity: float,
+        period: float,
+        state_dir: Union[Path, str],
+    ) -> None:
+        self.capacity = float(capacity)
+        self.rate = self.capacity / float(period)  # tokens per second
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        self.path = Path(state_dir) / f'{digest}.bucket'
+
+        # Statistics.
+        self.n_acquired = 0
+        self.n_waited = 0
+        self.total_wait = 0.0
+
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleep until it's available. Return the waiting time in seconds."""
+        # The token is reserved under the lock, the other threads don't wait for our sleep to reserve theirs.
+        with self._lock:
+            wait = self._reserve()
+            self.n_acquired += 1
+            if wait > 0:
+                self.n_waited += 1
+                self.total_wait += wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _reserve(self) -> float:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            raw = os.read(fd, _STATE.size)
+            if len(raw) == _STATE.size:
+                tokens, last = _STATE.unpack(raw)
+                tokens = min(
+                    self.capacity, tokens + max(0.0, now - last) * self.rate
+                )
+            else:
+                tokens = self.capacity  # fresh bucket
+            # Tokens may go negative, which means the following callers are queued behind us.
+            tokens -= 1.0
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, _STATE.pack(tokens, now))
+        finally:
+            os.close(fd)  # also releases the lock
+        return max(0.0, -tokens / self.rate)
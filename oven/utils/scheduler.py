@@ -0,0 +1,185 @@
+import os
+import time
+import heapq
+import itertools
+import threading
+from typing import Callable, Optional
+
+
+class TimerHandle:
+    """Returned by `Scheduler.call_later()` / `call_every()`, use it to cancel the timer."""
+
+    __slots__ = (
+        'scheduler',
+        'callback',
+        'interval',
+        'deadline',
+        'cancelled',
+        'in_heap',
+    )
+
+    def __init__(
+        self,
+        scheduler: 'Scheduler',
+        callback: Callable[[], None],
+        interval: Optional[float],
+        deadline: float,
+    ) -> None:
+        self.scheduler = scheduler
+        self.callback = callback
+        self.interval = interval
+        self.deadline = deadline
+        self.cancelled = False
+        self.in_heap = False
+
+    def cancel(self) -> None:
+        self.scheduler.cancel(self)
+
+
+class Scheduler:
+    """
+    One thread serving the deadlines of all the timers in the process, kept in a heap.
+
+    Scheduling is O(log n). Cancelling marks the timer, which is skipped when it reaches the top of the
+    heap, and the heap is compacted if most of it is cancelled. Once `cancel()` returns, the callback won't
+    be called anymore: a callback that is running at that moment is waited for. Periodic timers are
+    re-scheduled `interval` seconds after their callback returns. Callbacks run on the scheduler thread,
+    so they should return quickly.
+    """
+
+    def __init__(self) -> None:
+        self._heap = []
+        self._seq = itertools.count()  # ties are served in order
+        self._n_cancelled = 0
+        self._running: Optional[TimerHandle] = None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def call_later(
+        self, delay: float, callback: Callable[[], None]
+    ) -> TimerHandle:
+        """Call `callback()` once after `delay` seconds."""
+        return self._schedule(callback, None, delay)
+
+    def call_every(
+        self, interval: float, callback: Callable[[], None]
+    ) -> TimerHandle:
+        """Call `callback()` every `interval` seconds until it's cancelled."""
+        return self._schedule(callback, interval, interval)
+
+    def cancel(self, handle: TimerHandle) -> None:
+        with self._cond:
+            if handle.cancelled:
+                return
+            handle.cancelled = True
+            if handle.in_heap:
+                self._n_cancelled += 1
+                if (
+                    self._n_cancelled > 64
+                    and self._n_cancelled > len(self._heap) // 2
+                ):
+                    self._compact()
+            if threading.current_thread() is not self._thread:
+                while self._running is handle:
+                    self._cond.wait()
+            self._cond.notify_all()
+
+    def __len__(self) -> int:
+        """Number of active timers."""
+        with self._cond:
+            return len(self._heap) - self._n_cancelled
+
+    # ================ #
+    # Utils functions. #
+    # ================ #
+
+    def _schedule(
+        self,
+        callback: Callable[[], None],
+        interval: Optional[float],
+        delay: float,
+    ) -> TimerHandle:
+        handle = TimerHandle(
+            self, callback, interval, time.monotonic() + delay
+        )
+        with self._cond:
+            self._push(handle)
+            self._ensure_thread()
+            self._cond.notify_all()
+        return handle
+
+    def _push(self, handle: TimerHandle) -> None:
+        handle.in_heap = True
+        heapq.heappush(self._heap, (handle.deadline, next(self._seq), handle))
+
+    def _pop(self) -> TimerHandle:
+        handle = heapq.heappop(self._heap)[2]
+        handle.in_heap = False
+        return handle
+
+    def _compact(self) -> None:
+        self._heap = [e for e in self._heap if not e[2].cancelled]
+        heapq.heapify(self._heap)
+        self._n_cancelled = 0
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._worker, name='oven-scheduler', daemon=True
+            )
+            self._thread.start()
+
+    def _next_due(self) -> TimerHandle:
+        """Wait until the earliest timer is due and pop it, called with the lock held."""
+        while True:
+            while self._heap and self._heap[0][2].cancelled:
+                self._pop()
+                self._n_cancelled -= 1
+            if not self._heap:
+                self._cond.wait()
+                continue
+            timeout = self._heap[0][0] - time.monotonic()
+            if timeout <= 0:
+                return self._pop()
+            self._cond.wait(timeout)
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                handle = self._next_due()
+                self._running = handle
+
+            try:
+                handle.callback()
+            except Exception as e:
+                print(f'Warning: Scheduled callback failed: {e}')
+
+            with self._cond:
+                self._running = None
+                if handle.interval is not None and not handle.cancelled:
+                    handle.deadline = time.monotonic() + handle.interval
+                    self._push(handle)
+                self._cond.notify_all()
+
+    def _reset(self) -> None:
+        # The thread doesn't survive `fork()`, and the parent's timers don't belong to the child.
+        self._heap = []
+        self._n_cancelled = 0
+        self._running = None
+        self._cond = threading.Condition()
+        self._thread = None
+
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """Get the process-wide scheduler, it's created lazily."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
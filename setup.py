@@ -30,5 +30,12 @@ setup(
             'bake = oven.cli:bake',  # Shortcuts for baking a command.
             'ding = oven.cli:ding',  # Shortcuts for logging.
         ],
+        # Notifier backends, third-party packages can register theirs in the same group.
+        'oven.backends': [
+            'dingtalk = oven.backends.dingtalk:BACKEND_CLASSES',
+            'feishu = oven.backends.feishu:BACKEND_CLASSES',
+            'slack = oven.backends.slack:BACKEND_CLASSES',
+            'email = oven.backends.email:BACKEND_CLASSES',
+        ],
     },
 )
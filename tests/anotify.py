@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test the notifications sent from coroutines: `oven.anotify()`, coroutine functions under `oven.monitor`,
+and a sync `ProgressBar` closed inside an async function.
+
+The notifications are delivered to a local stand-in hook that answers slowly, and a ticker task measures
+how long the event loop is blocked meanwhile.
+
+Usage: python tests/anotify.py
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HOOK_DELAY = 0.3
+MAX_STALL = 0.1
+
+messages = []
+
+
+class SlowHook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(HOOK_DELAY)
+        messages.append(json.dumps(json.loads(body), ensure_ascii=False))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+async def measure_stall(coro):
+    """Run the coroutine, and return its result and the longest time the event loop was blocked."""
+    stall, stop = 0.0, False
+
+    async def tick():
+        nonlocal stall
+        last = time.monotonic()
+        while not stop:
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            stall = max(stall, now - last - 0.01)
+            last = now
+
+    ticker = asyncio.create_task(tick())
+    try:
+        result = await coro
+    finally:
+        stop = True
+        await ticker
+    return result, stall
+
+
+def count(*markers):
+    return sum(all(m in message for m in markers) for message in messages)
+
+
+async def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def test_anotify(oven):
+    _, stall = await measure_stall(
+        asyncio.gather(*[oven.anotify(f'hello-{i}') for i in range(3)])
+    )
+    assert all(count(f'hello-{i}') == 1 for i in range(3)), 'not delivered'
+    assert stall < MAX_STALL, f'event loop blocked for {stall:.3f}s'
+    print(f'✓ anotify: loop blocked for at most {stall * 1e3:.0f}ms')
+
+
+async def test_monitor(oven):
+    @oven.monitor
+    async def finished(x):
+        await asyncio.sleep(0.05)
+        return x * 2
+
+    @oven.monitor
+    async def failed():
+        await asyncio.sleep(0.05)
+        raise ValueError('broken-job')
+
+    result, stall = await measure_stall(finished(21))
+    assert result == 42, result
+    assert count('finished(') == 2, f'{count("finished(")} messages'
+    assert count('finished(', 'Done!') == 1, 'end not delivered'
+    assert stall < MAX_STALL, f'event loop blocked for {stall:.3f}s'
+
+    result, stall = await measure_stall(failed())
+    assert result is None, result
+    assert count('failed(') == 2, f'{count("failed(")} messages'
+    assert count('failed(', 'Error!', 'broken-job') == 1, 'error not sent'
+    assert stall < MAX_STALL, f'event loop blocked for {stall:.3f}s'
+    print(f'✓ monitor: loop blocked for at most {stall * 1e3:.0f}ms')
+
+
+async def test_sync_close(oven):
+    async def run(desc, n_steps):
+        # A sync `with` in a coroutine, the start notification is still being delivered at first.
+        with oven.ProgressBar(
+            total=n_steps,
+            desc=desc,
+            disable=True,
+            notify_mode='socket',
+            notify_threshold=0.1,
+            miniters=1,
+        ) as pbar:
+            for _ in range(n_steps):
+                await asyncio.sleep(0.02)
+                pbar.update(1)
+
+    _, stall = await measure_stall(run('early', 2))
+    assert stall < MAX_STALL, f'event loop blocked for {stall:.3f}s'
+    _, stall_late = await measure_stall(run('late', 30))
+    assert stall_late < MAX_STALL, f'event loop blocked for {stall_late:.3f}s'
+
+    for desc in ['early', 'late']:
+        assert await wait_for(
+            lambda: count(desc, 'Done!') == 1
+        ), f'{desc}: final not sent'
+        sent = [m for m in messages if f'Progress: {desc}' in m]
+        assert 'Done!' in sent[-1], f'{desc}: progress sent after the final'
+    stall = max(stall, stall_late)
+    print(
+        f'✓ sync close: loop blocked for at most {stall * 1e3:.0f}ms, '
+        'final sent in background'
+    )
+
+
+async def amain(oven):
+    await test_anotify(oven)
+    await test_monitor(oven)
+    await test_sync_close(oven)
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as home:
+        with open(os.path.join(home, 'cfg.yaml'), 'w') as f:
+            f.write(
+                'backend: slack\n'
+                'slack:\n'
+                f'  hook: http://127.0.0.1:{server.server_address[1]}/hook\n'
+            )
+        os.environ.update(OVEN_HOME=home, OVEN_NO_DAEMON='1')
+        import oven
+
+        try:
+            asyncio.run(amain(oven))
+        except AssertionError as e:
+            print(f'✗ {e}')
+            sys.exit(1)
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test the async iteration of progress bars: `async for` over a `ProgressBar`, `oven.aprogress()` and
+`oven.as_completed_progress()`.
+
+The notifications are delivered to a local stand-in hook that answers slowly, and a ticker task measures
+how long the event loop is blocked meanwhile.
+
+Usage: python tests/aprogress.py
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HOOK_DELAY = 0.3
+MAX_STALL = 0.1
+
+messages = []
+
+
+class SlowHook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(HOOK_DELAY)
+        messages.append(json.dumps(json.loads(body)))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+async def stream(n, delay=0.01):
+    for i in range(n):
+        await asyncio.sleep(delay)
+        yield i
+
+
+async def measure_stall(coro):
+    """Run the coroutine, and return its result and the longest time the event loop was blocked."""
+    stall, stop = 0.0, False
+
+    async def tick():
+        nonlocal stall
+        last = time.monotonic()
+        while not stop:
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            stall = max(stall, now - last - 0.01)
+            last = now
+
+    ticker = asyncio.create_task(tick())
+    try:
+        result = await coro
+    finally:
+        stop = True
+        await ticker
+    return result, stall
+
+
+def count(marker):
+    return sum(marker in message for message in messages)
+
+
+async def test_async_for(oven):
+    async def run():
+        items = []
+        async for item in oven.aprogress(
+            stream(40, 0.02),
+            total=40,
+            desc='stream',
+            disable=True,
+            notify_mode='socket',
+            notify_threshold=0.2,
+            miniters=1,
+        ):
+            items.append(item)
+        return items
+
+    items, stall = await measure_stall(run())
+    assert items == list(range(40)), items
+    assert stall < MAX_STALL, f'event loop blocked for {stall:.3f}s'
+    assert (
+        count('Progress: stream') >= 3
+    ), f'{count("Progress: stream")} messages'
+
+    # Plain iterables, and a `ProgressBar` directly.
+    pbar = oven.ProgressBar(range(5), disable=True, enable_notifications=False)
+    assert [i async for i in pbar] == list(range(5))
+    assert pbar.n == 5 and pbar._closed, f'counted {pbar.n}'
+
+    # Stopped early, `async with` closes the bar at once with what was counted.
+    async with oven.ProgressBar(
+        stream(10, 0), total=10, disable=True, enable_notifications=False
+    ) as pbar:
+        async for i in pbar:
+            if i == 3:
+                break
+    assert pbar.n == 3 and pbar._closed, f'counted {pbar.n}'
+    print(f'✓ async for: loop blocked for at most {stall * 1e3:.0f}ms')
+
+
+async def test_as_completed(oven):
+    async def job(i):
+        await asyncio.sleep(0.05 * (5 - i))
+        return i
+
+    async def run():
+        return [
+            result
+            async for result in oven.as_completed_progress(
+                [job(i) for i in range(5)],
+                desc='jobs',
+                disable=True,
+                notify_mode='socket',
+                notify_threshold=0.2,
+                miniters=1,
+            )
+        ]
+
+    results, stall = await measure_stall(run())
+    assert results == [4, 3, 2, 1, 0], results
+    assert stall < MAX_STALL, f'event loop blocked for {stall:.3f}s'
+    assert count('Progress: jobs') >= 2, f'{count("Progress: jobs")} messages'
+    print(f'✓ as_completed: loop blocked for at most {stall * 1e3:.0f}ms')
+
+
+async def test_as_completed_stopped(oven):
+    cancelled = []
+
+    async def job(i, delay, fail=False):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(i)
+            raise
+        if fail:
+            raise ValueError('job failed')
+        return i
+
+    def run(first_fails=False, **kwargs):
+        cancelled.clear()
+        jobs = [job(0, 0.05, fail=first_fails)]
+        jobs += [job(i, 10) for i in range(1, 5)]
+        return oven.as_completed_progress(
+            jobs, disable=True, enable_notifications=False, **kwargs
+        )
+
+    # An exception of an awaitable.
+    try:
+        async for _ in run(first_fails=True):
+            pass
+        assert False, 'not raised'
+    except ValueError:
+        pass
+    assert sorted(cancelled) == [1, 2, 3, 4], f'raised: cancelled {cancelled}'
+
+    # A `break`, `async for` doesn't close the generator by itself.
+    results = run()
+    async for result in results:
+        assert result == 0, result
+        break
+    await results.aclose()
+    assert sorted(cancelled) == [1, 2, 3, 4], f'break: cancelled {cancelled}'
+
+    # A timeout.
+    try:
+        async for _ in run(timeout=0.2):
+            pass
+        assert False, 'not timed out'
+    except asyncio.TimeoutError:
+        pass
+    assert sorted(cancelled) == [1, 2, 3, 4], f'timeout: cancelled {cancelled}'
+    print('✓ as_completed stopped early: the pending awaitables cancelled')
+
+
+async def amain(oven):
+    await test_async_for(oven)
+    await test_as_completed(oven)
+    await test_as_completed_stopped(oven)
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as home:
+        with open(os.path.join(home, 'cfg.yaml'), 'w') as f:
+            f.write(
+                'backend: slack\n'
+                'slack:\n'
+                f'  hook: http://127.0.0.1:{server.server_address[1]}/hook\n'
+            )
+        os.environ.update(OVEN_HOME=home, OVEN_NO_DAEMON='1')
+        import oven
+
+        try:
+            asyncio.run(amain(oven))
+        except AssertionError as e:
+            print(f'✗ {e}')
+            sys.exit(1)
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
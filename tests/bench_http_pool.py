@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pooled keep-alive session against plain `requests.post()`.
+
+A local HTTP/1.1 server stands in for the webhook, so the numbers only contain the TCP handshake part
+of the saving. Against real HTTPS hooks the TLS handshake makes the gap much larger.
+
+Usage: python tests/bench_http_pool.py [n_requests]
+"""
+
+import os
+import sys
+import time
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from oven.utils.http import post
+
+
+class StandInHook(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    # As real servers do, avoid the delayed ACK stall.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = json.dumps({'errcode': 0, 'errmsg': 'ok'}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def bench(fn, url, n):
+    data = {'msgtype': 'markdown', 'markdown': {'title': 't', 'text': 'x'}}
+    costs = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn(url, json=data, timeout=(10, 60))
+        costs.append(time.perf_counter() - start)
+    costs.sort()
+    return sum(costs) / n, costs[n // 2], costs[int(n * 0.99) - 1]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/hook'
+
+    print(f'{n} requests against {url}')
+    for name, fn in [('requests.post', requests.post), ('pooled post', post)]:
+        mean, p50, p99 = bench(fn, url, n)
+        print(
+            f'{name:>14}: mean {mean * 1e3:.3f}ms, p50 {p50 * 1e3:.3f}ms, p99 {p99 * 1e3:.3f}ms'
+        )
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
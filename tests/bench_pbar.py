@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the progress bar overhead, in nanoseconds per iteration.
+
+Notifications are disabled and the display goes to /dev/null, so only the bookkeeping is measured.
+tqdm is included for reference if it's installed.
+
+Usage: python tests/bench_pbar.py [n_iterations]
+"""
+
+import os
+import sys
+import time
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oven
+
+
+def bench_bare(n):
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        pass
+    return time.perf_counter_ns() - start
+
+
+def bench_iter(n, **kwargs):
+    start = time.perf_counter_ns()
+    for _ in oven.progress(range(n), enable_notifications=False, **kwargs):
+        pass
+    return time.perf_counter_ns() - start
+
+
+def bench_update(n, **kwargs):
+    start = time.perf_counter_ns()
+    with oven.ProgressBar(
+        total=n, enable_notifications=False, **kwargs
+    ) as pbar:
+        for _ in range(n):
+            pbar.update(1)
+    return time.perf_counter_ns() - start
+
+
+def bench_tqdm_iter(n):
+    from tqdm import tqdm
+
+    start = time.perf_counter_ns()
+    for _ in tqdm(range(n), file=sys.stdout):
+        pass
+    return time.perf_counter_ns() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    cases = [
+        ('bare loop', lambda: bench_bare(n)),
+        ('__iter__', lambda: bench_iter(n)),
+        ('__iter__, disable', lambda: bench_iter(n, disable=True)),
+        ('__iter__, miniters=1', lambda: bench_iter(n // 10, miniters=1)),
+        ('update', lambda: bench_update(n)),
+        ('update, miniters=1', lambda: bench_update(n // 10, miniters=1)),
+    ]
+    try:
+        import tqdm
+
+        cases.append(('tqdm __iter__', lambda: bench_tqdm_iter(n)))
+    except ImportError:
+        pass
+
+    print(f'{n} iterations (n / 10 for miniters=1)')
+    for name, fn in cases:
+        with open(os.devnull, 'w') as devnull:
+            with contextlib.redirect_stdout(devnull):
+                cost = fn()
+        n_iters = n // 10 if 'miniters=1' in name else n
+        print(f'{name:>22}: {cost / n_iters:.1f}ns/it')
+
+
+if __name__ == '__main__':
+    main()
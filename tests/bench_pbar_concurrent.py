@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark of concurrent `update()`, from 1 to 32 threads.
+
+The concurrent mode (per-thread shards) is compared with a plain bar guarded by one shared lock, which
+is what you would need otherwise to get exact counts.
+
+Usage: python tests/bench_pbar_concurrent.py [n_updates_per_thread]
+"""
+
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oven
+
+
+def run(update, n_threads, n_updates):
+    barrier = threading.Barrier(n_threads + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(n_updates):
+            update(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    return n_threads * n_updates / (time.perf_counter() - start)
+
+
+def bench_sharded(n_threads, n_updates):
+    pbar = oven.ProgressBar(
+        total=None, concurrent=True, disable=True, enable_notifications=False
+    )
+    return run(pbar.update, n_threads, n_updates)
+
+
+def bench_locked(n_threads, n_updates):
+    pbar = oven.ProgressBar(
+        total=None, disable=True, enable_notifications=False
+    )
+    lock = threading.Lock()
+
+    def update(n):
+        with lock:
+            pbar.update(n)
+
+    return run(update, n_threads, n_updates)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f'{n} updates per thread, million updates per second')
+    print(f'{"threads":>8} {"sharded":>10} {"one lock":>10}')
+    for n_threads in [1, 2, 4, 8, 16, 32]:
+        sharded = bench_sharded(n_threads, n)
+        locked = bench_locked(n_threads, n)
+        print(f'{n_threads:>8} {sharded / 1e6:>10.2f} {locked / 1e6:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
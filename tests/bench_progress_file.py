@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark the reads of a file, raw and tracked by `oven.progress_file()`, in GB/s.
+
+The file is read once before the runs, so they are served by the page cache. Every chunk is consumed
+by a CRC32, so that the memory-mapped pages are actually read. Notifications are disabled and the display
+goes to /dev/null.
+
+Usage: python tests/bench_progress_file.py [size_in_MB] [chunk_size_in_KB]
+"""
+
+import os
+import sys
+import mmap
+import time
+import zlib
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oven
+
+
+def raw_readinto(path, chunk_size):
+    buf = memoryview(bytearray(chunk_size))
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            zlib.crc32(buf[:n])
+
+
+def tracked_readinto(path, chunk_size, file):
+    buf = memoryview(bytearray(chunk_size))
+    with open(path, 'rb', buffering=0) as raw:
+        with oven.progress_file(
+            raw, enable_notifications=False, file=file
+        ) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                zlib.crc32(buf[:n])
+
+
+def raw_mmap(path, chunk_size):
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            for pos in range(0, len(view), chunk_size):
+                chunk = view[pos : pos + chunk_size]
+                zlib.crc32(chunk)
+                chunk.release()
+            view.release()
+
+
+def tracked_mmap(path, chunk_size, file):
+    with oven.progress_file(path, enable_notifications=False, file=file) as f:
+        for chunk in f.iter_chunks(chunk_size):
+            zlib.crc32(chunk)
+
+
+def raw_read(path, chunk_size):
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            zlib.crc32(data)
+
+
+def tracked_read(path, chunk_size, file):
+    with oven.progress_file(path, enable_notifications=False, file=file) as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            zlib.crc32(data)
+
+
+def bench(fn, *args, n_runs=5):
+    costs = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        fn(*args)
+        costs.append(time.perf_counter() - start)
+    return min(costs)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    chunk_size = (int(sys.argv[2]) if len(sys.argv) > 2 else 1024) * 1024
+    shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+    with tempfile.NamedTemporaryFile(dir=shm_dir) as tmp:
+        block = os.urandom(1 << 20)
+        for _ in range(size):
+            tmp.write(block)
+        tmp.flush()
+        raw_read(tmp.name, chunk_size)  # warm the page cache up
+
+        print(f'{size}MB file, {chunk_size // 1024}KB chunks')
+        with open(os.devnull, 'w') as devnull:
+            for name, raw, tracked in [
+                ('read', raw_read, tracked_read),
+                ('readinto', raw_readinto, tracked_readinto),
+                ('mmap', raw_mmap, tracked_mmap),
+            ]:
+                raw_cost = bench(raw, tmp.name, chunk_size)
+                tracked_cost = bench(tracked, tmp.name, chunk_size, devnull)
+                print(
+                    f'{name:>8}: raw {size / 1e3 / raw_cost:.2f}GB/s, '
+                    f'tracked {size / 1e3 / tracked_cost:.2f}GB/s '
+                    f'({(tracked_cost / raw_cost - 1) * 100:+.1f}%)'
+                )
+
+
+if __name__ == '__main__':
+    main()
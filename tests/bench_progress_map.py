@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scaling of `oven.progress_map()` from 1 to N workers, against the serial loop
+`for x in oven.progress(items): f(x)`.
+
+- cpu: pure Python work of about 0.2ms per item on processes, it scales up to the number of cores.
+- io: a 1ms sleep per item on threads, as a stand-in for I/O that releases the GIL.
+- tiny: a trivial function on processes, with the automatic chunk size and with one item per chunk.
+
+Notifications are disabled and the display goes to /dev/null.
+
+Usage: python tests/bench_progress_map.py [max_workers]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oven
+
+
+def cpu_work(x):
+    acc = 0
+    for i in range(4000):
+        acc += i * x % 7
+    return acc
+
+
+def io_work(x):
+    time.sleep(0.001)
+    return x
+
+
+def tiny_work(x):
+    return x + 1
+
+
+def serial(fn, items, file):
+    for x in oven.progress(items, enable_notifications=False, file=file):
+        fn(x)
+
+
+def parallel(fn, items, file, **kwargs):
+    for _ in oven.progress_map(
+        fn, items, enable_notifications=False, file=file, **kwargs
+    ):
+        pass
+
+
+def bench(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def report(name, items, base_cost, cost):
+    print(
+        f'{name:>24}: {len(items) / cost:10.0f} items/s '
+        f'(x{base_cost / cost:.2f})'
+    )
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    n_workers = [1]
+    while n_workers[-1] * 2 <= max_workers:
+        n_workers.append(n_workers[-1] * 2)
+    if n_workers[-1] != max_workers:
+        n_workers.append(max_workers)
+    print(f'{os.cpu_count()} CPUs')
+
+    with open(os.devnull, 'w') as devnull:
+        items = list(range(10000))
+        print('cpu, processes')
+        base_cost = bench(serial, cpu_work, items, devnull)
+        report('serial', items, base_cost, base_cost)
+        for workers in n_workers:
+            cost = bench(
+                parallel,
+                cpu_work,
+                items,
+                devnull,
+                workers=workers,
+                executor='process',
+            )
+            report(f'{workers} workers', items, base_cost, cost)
+
+        items = list(range(1000))
+        print('io, threads')
+        base_cost = bench(serial, io_work, items, devnull)
+        report('serial', items, base_cost, base_cost)
+        for workers in sorted(set(n_workers + [8, 32])):
+            cost = bench(parallel, io_work, items, devnull, workers=workers)
+            report(f'{workers} workers', items, base_cost, cost)
+
+        items = list(range(200000))
+        print(f'tiny, processes, {max_workers} workers')
+        base_cost = bench(serial, tiny_work, items, devnull)
+        report('serial', items, base_cost, base_cost)
+        for name, chunksize in [
+            ('auto chunks', None),
+            ('1 item per chunk', 1),
+        ]:
+            cost = bench(
+                parallel,
+                tiny_work,
+                items,
+                devnull,
+                workers=max_workers,
+                executor='process',
+                chunksize=chunksize,
+            )
+            report(name, items, base_cost, cost)
+
+
+if __name__ == '__main__':
+    main()
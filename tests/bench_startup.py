@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark the startup of `ding`, with and without the configuration snapshot.
+
+Each run is a fresh interpreter sending one message to a local stand-in hook, as `ding` does in a shell
+loop. Without the snapshot, every run parses `cfg.yaml` with omegaconf.
+
+Usage: python tests/bench_startup.py [n_runs]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from oven.utils.cfg_cache import get_snapshot_path
+
+DING = (
+    'import sys\n'
+    'from oven.cli import ding\n'
+    'sys.argv = ["ding", "Hello World!"]\n'
+    'ding()\n'
+    'assert ("omegaconf" in sys.modules) == {cold}, "unexpected omegaconf import"\n'
+)
+
+
+class StandInHook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+def bench(env, cfg_path, n, cold):
+    costs = []
+    for _ in range(n):
+        if cold:
+            get_snapshot_path(cfg_path).unlink(missing_ok=True)
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-c', DING.format(cold=cold)],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        costs.append(time.perf_counter() - start)
+    costs.sort()
+    return sum(costs) / n, costs[n // 2]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as home:
+        cfg_path = os.path.join(home, 'cfg.yaml')
+        with open(cfg_path, 'w') as f:
+            f.write(
+                'backend: slack\n'
+                'slack:\n'
+                f'  hook: http://127.0.0.1:{server.server_address[1]}/hook\n'
+            )
+        env = dict(os.environ, OVEN_HOME=home, OVEN_NO_DAEMON='1')
+        env['PYTHONPATH'] = os.pathsep.join(
+            [ROOT] + [p for p in [env.get('PYTHONPATH', None)] if p]
+        )
+
+        print(f'{n} `ding` runs')
+        for name, cold in [
+            ('without snapshot', True),
+            ('with snapshot', False),
+        ]:
+            mean, p50 = bench(env, cfg_path, n, cold)
+            print(
+                f'{name:>16}: mean {mean * 1e3:.1f}ms, p50 {p50 * 1e3:.1f}ms'
+            )
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test the `oven serve` daemon and its clients: the signals handed over to the daemon, an outbox replay
+that takes longer than the client timeout, and the direct delivery once the daemon goes away.
+
+The daemon runs in a subprocess, and delivers to a local stand-in hook, whose answers can be made slow or
+failing.
+
+Usage: python tests/daemon.py
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+messages = []
+hook_state = {'status': 200, 'delay': 0.0}
+
+
+class StandInHook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(hook_state['delay'])
+        status = hook_state['status']
+        if status == 200:
+            messages.append(json.dumps(json.loads(body), ensure_ascii=False))
+        answer = b'ok' if status == 200 else b'error'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(answer)))
+        self.end_headers()
+        self.wfile.write(answer)
+
+    def log_message(self, *args):
+        pass
+
+
+def count(marker):
+    return sum(marker in message for message in messages)
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def start_daemon():
+    from oven.daemon import connect_daemon
+
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop('OVEN_NO_DAEMON', None)
+    proc = subprocess.Popen(
+        [sys.executable, '-c', 'from oven.daemon import serve; serve()'],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    assert wait_for(
+        lambda: connect_daemon() is not None
+    ), 'daemon did not start'
+    return proc, connect_daemon()
+
+
+def test_client(daemon_oven):
+    daemon_oven.ding_log('hello-daemon')
+    assert wait_for(lambda: count('hello-daemon') == 1), 'log not delivered'
+    print('✓ client: log delivered through the daemon')
+
+
+def test_long_replay(daemon_oven):
+    from oven.oven import build_oven
+
+    # Kept in the outbox by a direct delivery while the hook is down.
+    hook_state['status'] = 500
+    local_oven = build_oven()
+    for i in range(3):
+        try:
+            local_oven.ding_log(f'kept-{i}')
+        except ConnectionError:
+            pass
+    assert len(local_oven.backend.outbox) == 3, 'messages not kept'
+
+    # The replay takes about 1.2s, longer than the client timeout.
+    hook_state.update(status=200, delay=0.4)
+    daemon_oven.backend.client.timeout = 0.5
+    try:
+        n_sent, n_left = daemon_oven.flush_outbox()
+    finally:
+        hook_state['delay'] = 0.0
+        daemon_oven.backend.client.timeout = 10.0
+    assert (n_sent, n_left) == (3, 0), f'{n_sent} sent, {n_left} left'
+    assert daemon_oven.backend._fallback is None, 'fell back on a slow daemon'
+    time.sleep(0.5)
+    assert all(
+        count(f'kept-{i}') == 1 for i in range(3)
+    ), f'delivered {[count(f"kept-{i}") for i in range(3)]} times'
+    print('✓ long replay: waited for the daemon, each message sent once')
+
+
+def test_fallback(proc, daemon_oven):
+    from oven.daemon import RemoteExpInfo
+    from oven.backends.api import Signal
+
+    meta = daemon_oven.backend.get_meta()
+    meta['cmd'] = 'fallback-exp'
+    info = RemoteExpInfo(daemon_oven.backend, meta, 'starting')
+    assert wait_for(lambda: count('fallback-exp') == 1), 'start not delivered'
+
+    proc.send_signal(signal.SIGTERM)
+    proc.wait(10)
+    info.update_signal(signal=Signal.P, description='halfway')
+    info.update_signal(signal=Signal.T, description='done')
+    assert daemon_oven.backend._fallback is not None, 'no direct delivery'
+    assert (
+        count('fallback-exp') == 3
+    ), f'{count("fallback-exp")} messages for start, progress and end'
+    assert count('Running!') == 1 and count('Done!') == 1, messages[-2:]
+    print('✓ fallback: delivered directly without a second start')
+
+
+def test_fallback_without_cfg(daemon_oven):
+    from oven.daemon import DaemonBackend, DaemonClient
+
+    backend = DaemonBackend(DaemonClient(daemon_oven.backend.client.path))
+    with tempfile.TemporaryDirectory() as empty_home:
+        os.environ['OVEN_HOME'] = empty_home
+        try:
+            resp = backend.request({'op': 'ping'})
+        except SystemExit:
+            raise AssertionError('exited without a configuration')
+        finally:
+            os.environ['OVEN_HOME'] = os.path.dirname(
+                str(daemon_oven.backend.client.path)
+            )
+    assert not resp['ok'], resp
+    print('✓ no configuration to fall back on: reported, not exited')
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    proc = None
+    with tempfile.TemporaryDirectory() as home:
+        with open(os.path.join(home, 'cfg.yaml'), 'w') as f:
+            f.write(
+                'backend: slack\n'
+                'slack:\n'
+                f'  hook: http://127.0.0.1:{server.server_address[1]}/hook\n'
+                'retry:\n'
+                '  max_attempts: 1\n'
+                'outbox:\n'
+                '  enabled: true\n'
+            )
+        os.environ['OVEN_HOME'] = home
+        try:
+            proc, daemon_oven = start_daemon()
+            test_client(daemon_oven)
+            test_long_replay(daemon_oven)
+            test_fallback(proc, daemon_oven)
+            test_fallback_without_cfg(daemon_oven)
+        except AssertionError as e:
+            print(f'✗ {e}')
+            sys.exit(1)
+        finally:
+            if proc is not None and proc.poll() is None:
+                proc.kill()
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
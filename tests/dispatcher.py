@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Test the async delivery dispatcher: progress signals coalesced per experiment behind a slow backend,
+without reordering the start, error and end signals, the bounded queue, the flush at exit, a clean exit of
+the async delivery mode, the reset after `fork()`, and the attributes forwarded by `QueuedBackend`.
+
+Usage: python tests/dispatcher.py
+"""
+
+import os
+import sys
+import io
+import copy
+import time
+import contextlib
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from oven.backends.api import (
+    NotifierBackendBase,
+    ExpInfoBase,
+    RespStatus,
+    Signal,
+)
+from oven.dispatcher import Dispatcher, QueuedBackend
+
+
+class SlowBackend(NotifierBackendBase):
+    """Record the delivered signals, each delivery takes `delay` seconds."""
+
+    def __init__(self, delay: float) -> None:
+        self.cfg = {'backend': 'slow'}
+        self.delay = delay
+        self.delivered = []
+
+    def notify(self, info) -> RespStatus:
+        time.sleep(self.delay)
+        self.delivered.append(
+            (info.name, info.current_signal, info.current_description)
+        )
+        return RespStatus(has_err=False)
+
+
+class GatedBackend(SlowBackend):
+    """Hold every delivery until the gate is opened."""
+
+    def __init__(self) -> None:
+        super().__init__(delay=0)
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+
+    def notify(self, info) -> RespStatus:
+        self.entered.set()
+        self.gate.wait()
+        return super().notify(info)
+
+
+class Info(ExpInfoBase):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.current_signal = Signal.S
+        self.current_description = 'start'
+
+    def signal(self, dispatcher, signal, description=''):
+        self.current_signal = signal
+        self.current_description = description
+        return dispatcher.submit(self)
+
+
+def test_coalesced():
+    backend = SlowBackend(delay=0.02)
+    dispatcher = Dispatcher(backend)
+    exps = [Info('a'), Info('b')]
+    for info in exps:
+        dispatcher.submit(info)
+    for phase, end in [(0, Signal.E), (1, Signal.T)]:
+        for i in range(1000):
+            for info in exps:
+                info.signal(dispatcher, Signal.P, f'{phase}-{i}')
+        for info in exps:
+            info.signal(dispatcher, end, f'{phase}-end')
+    assert dispatcher.flush(timeout=10), 'not flushed'
+
+    for info in exps:
+        delivered = [
+            (s, d) for name, s, d in backend.delivered if name == info.name
+        ]
+        signals = [s for s, _ in delivered]
+        assert signals[0] == Signal.S, 'start not first'
+        assert (
+            signals.count(Signal.E) == 1 and signals[-1] == Signal.T
+        ), signals
+        error_at = signals.index(Signal.E)
+        for phase, part in enumerate(
+            [delivered[:error_at], delivered[error_at:]]
+        ):
+            progress = [d for s, d in part if s == Signal.P]
+            assert progress, f'{info.name}: no progress in phase {phase}'
+            assert all(d.startswith(f'{phase}-') for d in progress), progress
+            steps = [int(d.split('-')[1]) for d in progress]
+            assert steps == sorted(steps), f'{info.name}: progress reordered'
+            assert steps[-1] == 999, f'{info.name}: latest progress not sent'
+    n_progress = sum(s == Signal.P for _, s, _ in backend.delivered)
+    assert n_progress < 40, f'{n_progress} progress signals for 4000'
+    assert dispatcher.n_coalesced + n_progress == 4000, dispatcher.n_coalesced
+    print(
+        f'✓ coalesced: {n_progress} of 4000 progress signals sent, '
+        'start, error and end kept in order'
+    )
+
+
+def test_queue_full():
+    backend = GatedBackend()
+    dispatcher = Dispatcher(backend, queue_size=4)
+    busy = Info('busy')
+    dispatcher.submit(busy)
+    assert backend.entered.wait(5), 'not delivering'
+
+    # The queue is full of progress, a start signal takes the place of the oldest one.
+    exps = [Info(f'exp-{i}') for i in range(6)]
+    for info in exps[:4]:
+        info.signal(dispatcher, Signal.P, 'progress')
+    assert not exps[4].signal(dispatcher, Signal.P, 'progress'), 'not full'
+    assert dispatcher.n_dropped == 1, dispatcher.n_dropped
+    dispatcher.submit(exps[5])
+    assert dispatcher.n_dropped == 2 and dispatcher.depth == 5, (
+        dispatcher.n_dropped,
+        dispatcher.depth,
+    )
+
+    # The end signals evict the remaining progress, then there is nothing left to evict.
+    for info in exps[1:4]:
+        assert info.signal(dispatcher, Signal.T, 'end'), 'end signal dropped'
+    assert dispatcher.n_dropped == 5, dispatcher.n_dropped
+    assert not dispatcher.submit(Info('extra')), 'submitted to a full queue'
+
+    backend.gate.set()
+    assert dispatcher.flush(timeout=5), 'not flushed'
+    delivered = [(name, s) for name, s, _ in backend.delivered]
+    assert ('exp-0', Signal.P) not in delivered, 'oldest progress not evicted'
+    assert ('exp-5', Signal.S) in delivered, 'start signal dropped'
+    assert dispatcher.n_dropped == 6 and len(delivered) == 5, delivered
+    print(
+        f'✓ queue full: progress evicted first, {dispatcher.n_dropped} dropped'
+    )
+
+
+EXIT_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {tests!r})
+from dispatcher import SlowBackend, Info
+from oven.dispatcher import Dispatcher
+
+
+class PrintBackend(SlowBackend):
+    def notify(self, info):
+        resp = super().notify(info)
+        print('delivered', info.name, flush=True)
+        return resp
+
+
+dispatcher = Dispatcher(PrintBackend(delay={delay}), flush_timeout={flush_timeout})
+for i in range(5):
+    dispatcher.submit(Info(f'exp-{{i}}'))
+"""
+
+
+def run_exit_script(delay, flush_timeout):
+    script = EXIT_SCRIPT.format(
+        root=ROOT,
+        tests=os.path.join(ROOT, 'tests'),
+        delay=delay,
+        flush_timeout=flush_timeout,
+    )
+    start = time.monotonic()
+    proc = subprocess.run(
+        [sys.executable, '-c', script],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout, time.monotonic() - start
+
+
+def test_exit_flush():
+    out, _ = run_exit_script(delay=0.1, flush_timeout=10)
+    assert out.count('delivered') == 5, out
+    assert 'not delivered before exit' not in out, out
+
+    # A hung backend doesn't hold the exit for more than `flush_timeout`.
+    out, cost = run_exit_script(delay=30, flush_timeout=0.5)
+    assert '5 notification(s) are not delivered before exit' in out, out
+    assert cost < 10, f'exit took {cost:.2f}s'
+    print('✓ exit: the queue flushed, a hung backend given up on in time')
+
+
+class Hook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+def test_exit_clean():
+    # The pooled HTTP session is closed after the flush, nothing is printed while shutting down.
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Hook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as home:
+            with open(os.path.join(home, 'cfg.yaml'), 'w') as f:
+                f.write(
+                    'backend: slack\n'
+                    'slack:\n'
+                    f'  hook: http://127.0.0.1:{server.server_address[1]}/hook\n'
+                    'delivery:\n'
+                    '  mode: async\n'
+                )
+            proc = subprocess.run(
+                [sys.executable, '-c', 'import oven; oven.notify("clean")'],
+                env=dict(
+                    os.environ,
+                    PYTHONPATH=ROOT,
+                    OVEN_HOME=home,
+                    OVEN_NO_DAEMON='1',
+                ),
+                capture_output=True,
+                text=True,
+                timeout=60,
+            )
+    finally:
+        server.shutdown()
+    assert proc.returncode == 0 and proc.stderr == '', proc.stderr
+    print('✓ clean exit: the HTTP session closed after the flush')
+
+
+def test_fork():
+    backend = GatedBackend()
+    dispatcher = Dispatcher(backend)
+    dispatcher.submit(Info('busy'))
+    assert backend.entered.wait(5), 'not delivering'
+    dispatcher.submit(Info('queued'))
+
+    pid = os.fork()
+    if pid == 0:
+        # The parent's queue and thread are gone, a new thread serves the child.
+        ok = dispatcher.depth == 0
+        backend.gate.set()
+        backend.delivered.clear()
+        dispatcher.submit(Info('child'))
+        ok = ok and dispatcher.flush(timeout=5)
+        ok = ok and [name for name, _, _ in backend.delivered] == ['child']
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    backend.gate.set()
+    assert dispatcher.flush(timeout=5), 'parent not flushed'
+    assert os.WEXITSTATUS(status) == 0, 'child not reset'
+    names = [name for name, _, _ in backend.delivered]
+    assert names == ['busy', 'queued'], names
+    print(
+        '✓ fork: the child starts from an empty queue, the parent keeps its queue'
+    )
+
+
+def test_queued_backend():
+    backend = SlowBackend(delay=0)
+    backend.outbox = None
+    queued = QueuedBackend(backend, {})
+    assert queued.delay == 0 and queued.outbox is None, 'not forwarded'
+    try:
+        queued.missing
+    except AttributeError:
+        pass
+    else:
+        assert False, 'missing attribute found'
+
+    # Before `__init__()` there is nothing to forward to, e.g. while copying.
+    bare = QueuedBackend.__new__(QueuedBackend)
+    assert not hasattr(bare, 'delay'), 'found before init'
+    assert copy.copy(queued).backend is backend, 'not copied'
+    print('✓ QueuedBackend: attributes forwarded, missing ones before init')
+
+
+def test_drop_warning():
+    backend = GatedBackend()
+    queued = QueuedBackend(backend, {'queue_size': 1})
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        queued.notify(Info('busy'))
+        assert backend.entered.wait(5), 'not delivering'
+        evicted, kept = Info('evicted'), Info('kept')
+        evicted.current_signal = Signal.P
+        queued.notify(evicted)
+        queued.notify(kept)  # takes the place of the progress
+        assert queued.dispatcher.n_dropped == 1, 'progress not evicted'
+        assert out.getvalue() == '', 'warned for an evicted progress'
+        for name in ['dropped-0', 'dropped-1']:
+            queued.notify(Info(name))
+    backend.gate.set()
+    assert queued.flush(timeout=5), 'not flushed'
+    assert queued.dispatcher.n_dropped == 3, queued.dispatcher.n_dropped
+    assert out.getvalue().count('notifications are dropped') == 1, repr(
+        out.getvalue()
+    )
+    print('✓ drop warning: once for a real drop, not for an eviction')
+
+
+def main():
+    try:
+        test_coalesced()
+        test_queue_full()
+        test_exit_flush()
+        test_exit_clean()
+        test_fork()
+        test_queued_backend()
+        test_drop_warning()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test the rank-aware notification gating with a distributed launch emulated by plain CPU processes.
+
+Each process gets the `RANK` / `LOCAL_RANK` / `WORLD_SIZE` variables of torchrun, and delivers to a local
+stand-in hook. Only the primary rank notifies, except the exception raised by another rank, and the
+primary rank notifies the progress summed over the ranks.
+
+Usage: python tests/dist_gating.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORLD_SIZE = 4
+FAILING_RANK = 2
+N_STEPS = 10
+
+messages = []
+
+
+class StandInHook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        messages.append(json.dumps(json.loads(body)))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+def run_rank(rank, barrier):
+    os.environ.update(
+        RANK=str(rank),
+        LOCAL_RANK=str(rank),
+        WORLD_SIZE=str(WORLD_SIZE),
+        LOCAL_WORLD_SIZE=str(WORLD_SIZE),
+    )
+    import oven
+
+    oven.notify(f'hello-rank-{rank}')
+
+    @oven.monitor
+    def ok_job():
+        return rank
+
+    @oven.monitor
+    def bad_job():
+        if rank == FAILING_RANK:
+            raise ValueError('boom')
+
+    assert ok_job() == rank
+    bad_job()
+
+    pbar = oven.ProgressBar(
+        total=N_STEPS, desc='agg', disable=True, aggregate_ranks=True
+    )
+    for _ in range(N_STEPS):
+        pbar.update(1)
+    pbar._refresh()  # publish
+    barrier.wait()
+    if rank == 0:
+        description = pbar._format_progress_description()
+        expected = f'({N_STEPS * WORLD_SIZE}/{N_STEPS * WORLD_SIZE})'
+        assert expected in description, description
+        assert f'on {WORLD_SIZE} ranks' in description, description
+    barrier.wait()  # the primary rank reads the channel before it's released
+    pbar.close()
+
+
+def count(marker):
+    return sum(marker in message for message in messages)
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as home:
+        with open(os.path.join(home, 'cfg.yaml'), 'w') as f:
+            f.write(
+                'backend: slack\n'
+                'slack:\n'
+                f'  hook: http://127.0.0.1:{server.server_address[1]}/hook\n'
+            )
+        os.environ.update(OVEN_HOME=home, OVEN_NO_DAEMON='1')
+
+        ctx = multiprocessing.get_context('spawn')
+        barrier = ctx.Barrier(WORLD_SIZE)
+        procs = [
+            ctx.Process(target=run_rank, args=(rank, barrier))
+            for rank in range(WORLD_SIZE)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+    server.shutdown()
+
+    try:
+        assert all(
+            proc.exitcode == 0 for proc in procs
+        ), f'exit codes {[proc.exitcode for proc in procs]}'
+        assert count('hello-rank-0') == 1, 'primary rank log not delivered'
+        assert all(
+            count(f'hello-rank-{rank}') == 0 for rank in range(1, WORLD_SIZE)
+        ), 'other ranks delivered logs'
+        assert count('ok_job') == 2, f'ok_job: {count("ok_job")} messages'
+        assert count('bad_job') == 3, f'bad_job: {count("bad_job")} messages'
+        assert (
+            count(f'[rank {FAILING_RANK}/{WORLD_SIZE}] Function internal') == 1
+        ), 'exception of the other rank not forwarded'
+        assert count('Progress: agg') == 2, 'progress not gated'
+        assert count('Progress completed!') == 1, 'final progress not summed'
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+    print(f'✓ {WORLD_SIZE} ranks: {len(messages)} messages delivered')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Check the SMTP session reuse of `EmailBackend` against a local stand-in SMTP server.
+No real mail server or ExpOven configuration is required.
+
+Usage: python tests/email_session.py
+"""
+
+import os
+import sys
+import time
+import atexit
+import threading
+import socketserver
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oven.backends.email import EmailBackend, EmailLogInfo
+
+
+class StandInSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough ESMTP (no TLS) for `smtplib`: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, NOOP, QUIT."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode('utf-8'))
+
+    def handle(self):
+        stats = self.server.stats
+        stats['connects'] += 1
+        self.server.conns.append(self.connection)
+        try:
+            self.serve(stats)
+        finally:
+            stats['disconnects'] += 1
+
+    def serve(self, stats):
+        self.reply('220 stand-in ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            cmd = line.decode('utf-8').strip().upper()
+            if cmd.startswith('EHLO'):
+                self.reply('250-stand-in')
+                self.reply('250 AUTH PLAIN')
+            elif cmd.startswith('AUTH'):
+                stats['logins'] += 1
+                self.reply('235 Authentication successful')
+            elif cmd.startswith('DATA'):
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                stats['mails'] += 1
+                self.reply('250 OK')
+            elif cmd.startswith('NOOP'):
+                stats['noops'] += 1
+                self.reply('250 OK')
+            elif cmd.startswith('QUIT'):
+                self.reply('221 Bye')
+                return
+            else:  # MAIL, RCPT, RSET...
+                self.reply('250 OK')
+
+
+class StandInSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StandInSMTPHandler)
+        self.stats = {
+            'connects': 0,
+            'disconnects': 0,
+            'logins': 0,
+            'mails': 0,
+            'noops': 0,
+        }
+        self.conns = []
+
+    def kill_connections(self):
+        for conn in self.conns:
+            try:
+                conn.shutdown(2)
+            except OSError:
+                pass
+
+
+def build_backend(port, **kwargs):
+    cfg = {
+        'backend': 'email',
+        'smtp_server': '127.0.0.1',
+        'smtp_port': port,
+        'sender_email': 'sender@localhost',
+        'sender_pwd': 'pwd',
+        'receiver_email': 'receiver@localhost',
+        'smtp_starttls': False,
+    }
+    cfg.update(kwargs)
+    return EmailBackend(cfg)
+
+
+def send(backend, msg):
+    EmailLogInfo(backend, exp_meta_info=backend.get_meta(), description=msg)
+
+
+def test_session_reuse(server, port):
+    print('\n=== Testing Session Reuse ===')
+    backend = build_backend(port)
+    for i in range(5):
+        send(backend, f'message {i}')
+    assert server.stats['mails'] == 5, server.stats
+    assert server.stats['logins'] == 1, server.stats
+    print(f'✓ 5 mails over {server.stats["connects"]} connection')
+    backend.session.close()
+
+
+def test_reconnect(server, port):
+    print('\n=== Testing Transparent Reconnect ===')
+    backend = build_backend(port)
+    send(backend, 'before drop')
+    server.kill_connections()
+    time.sleep(0.1)
+    send(backend, 'after drop')  # would raise ConnectionError if it failed
+    assert backend.session.n_connects == 2
+    print('✓ Reconnected after the server dropped the session')
+    backend.session.close()
+
+
+def test_noop_and_idle_timeout(server, port):
+    print('\n=== Testing NOOP Check & Idle Timeout ===')
+    backend = build_backend(port, smtp_idle_timeout=0.6)
+    backend.session.noop_after = 0.1
+    send(backend, 'first')
+    time.sleep(0.3)
+    n_noops = server.stats['noops']
+    send(backend, 'after short idle')
+    assert server.stats['noops'] == n_noops + 1
+    assert backend.session.n_connects == 1
+    time.sleep(0.8)
+    send(backend, 'after long idle')
+    assert backend.session.n_connects == 2
+    print('✓ Liveness checked with NOOP, idle session re-created')
+    backend.session.close()
+
+
+def test_idle_close(server, port):
+    print('\n=== Testing Idle Session Closed Without Sending ===')
+    backend = build_backend(port, smtp_idle_timeout=0.3)
+    n_disconnects = server.stats['disconnects']
+    send(backend, 'before idle')
+    time.sleep(0.15)
+    send(backend, 'keeps it open')
+    time.sleep(0.2)
+    assert server.stats['disconnects'] == n_disconnects, 'closed while used'
+    deadline = time.monotonic() + 2
+    while server.stats['disconnects'] == n_disconnects:
+        assert time.monotonic() < deadline, 'idle session left open'
+        time.sleep(0.01)
+    assert backend.session._smtp is None
+    send(backend, 'after idle')
+    assert backend.session.n_connects == 2
+    print('✓ Idle session closed by the timer, re-created on the next mail')
+    backend.session.close()
+
+
+def test_atexit_once(server, port):
+    print('\n=== Testing Exit Hook Registration ===')
+    n_callbacks = atexit._ncallbacks()
+    backends = [build_backend(port) for _ in range(3)]
+    assert atexit._ncallbacks() == n_callbacks, 'registered before use'
+    for i in range(3):
+        send(backends[0], f'message {i}')
+    server.kill_connections()
+    time.sleep(0.1)
+    send(backends[0], 'after drop')
+    assert atexit._ncallbacks() == n_callbacks + 1, 'registered per connection'
+    print('✓ Exit hook registered once, on the first connection')
+    backends[0].session.close()
+
+
+def main():
+    server = StandInSMTPServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    test_session_reuse(server, port)
+    test_reconnect(server, port)
+    test_noop_and_idle_timeout(server, port)
+    test_idle_close(server, port)
+    test_atexit_once(server, port)
+    server.shutdown()
+    print('\n✓ All tests completed successfully!')
+
+
+if __name__ == '__main__':
+    main()
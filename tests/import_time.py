@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Import-time regression test, based on `python -X importtime`.
+
+`import oven` and a progress bar without notifications must not load the notifier machinery or its
+heavy dependencies. The cumulative import time of `oven` is reported as well.
+
+Usage: python tests/import_time.py
+"""
+
+import os
+import sys
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only be loaded once a notification is actually sent.
+HEAVY_MODULES = [
+    'omegaconf',
+    'yaml',
+    'requests',
+    'asyncio',
+    'sqlite3',
+    'subprocess',
+    'oven.oven',
+    'oven.dispatcher',
+    'oven.outbox',
+]
+
+CASES = {
+    'import oven': 'import oven',
+    'progress without notifications': (
+        'import oven\n'
+        'for _ in oven.progress(range(3), enable_notifications=False, disable=True):\n'
+        '    pass\n'
+    ),
+}
+
+
+# Modules that a single backend should not load while the oven is built, e.g. at the start of `ding`.
+MULTI_BACKEND_MODULES = ['oven.backends.multi', 'asyncio']
+
+
+def get_imported_modules(code, **env_vars):
+    """Return {module: cumulative import time in us} reported by `-X importtime`."""
+    env = dict(os.environ, **env_vars)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [ROOT] + [p for p in [env.get('PYTHONPATH', None)] if p]
+    )
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:') :].split('|')
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_case(name, code):
+    modules = get_imported_modules(code)
+    loaded = [m for m in HEAVY_MODULES if m in modules]
+    assert len(loaded) == 0, f'{name}: unexpected imports {loaded}'
+    print(f'✓ {name}: oven imported in {modules["oven"] / 1e3:.1f}ms')
+
+
+def test_single_backend():
+    with tempfile.TemporaryDirectory() as home:
+        with open(os.path.join(home, 'cfg.yaml'), 'w') as f:
+            f.write(
+                'backend: slack\nslack:\n  hook: http://127.0.0.1:9/hook\n'
+            )
+        modules = get_imported_modules(
+            'import oven; oven.get_lazy_oven()',
+            OVEN_HOME=home,
+            OVEN_NO_DAEMON='1',
+        )
+    assert 'oven.oven' in modules, 'oven not built'
+    loaded = [m for m in MULTI_BACKEND_MODULES if m in modules]
+    assert len(loaded) == 0, f'single backend: unexpected imports {loaded}'
+    print(
+        f'✓ single backend: oven built in {modules["oven.oven"] / 1e3:.1f}ms, '
+        'without the multi-backend'
+    )
+
+
+def main():
+    try:
+        for name, code in CASES.items():
+            test_case(name, code)
+        test_single_backend()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
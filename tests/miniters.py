@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test the learned `miniters` of `ProgressBar`: learned from `mininterval`, capped to what fits in
+`maxinterval`, and a sudden slowdown still refreshes the bar within `maxinterval`.
+
+Usage: python tests/miniters.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oven
+
+MAXINTERVAL = 0.3
+
+
+def make_bar(iterable=None, **kwargs):
+    return oven.ProgressBar(
+        iterable, disable=True, enable_notifications=False, **kwargs
+    )
+
+
+def test_capped():
+    pbar = make_bar(total=10**6, mininterval=100.0, maxinterval=1.0)
+    pbar._adapt_miniters(1000, 1.0)
+    pbar.close()
+    assert pbar.miniters <= 1000, f'{pbar.miniters} iterations for 1s'
+    print(f'✓ capped: {pbar.miniters} iterations checked at most every 1s')
+
+
+def test_slowdown():
+    slow_start = None
+    refreshes = []
+
+    def items():
+        nonlocal slow_start
+        start = time.time()
+        while time.time() - start < 0.5:
+            yield
+        slow_start = time.time()
+        for _ in range(30):
+            time.sleep(0.05)
+            yield
+
+    pbar = make_bar(items(), mininterval=0.05, maxinterval=MAXINTERVAL)
+    for _ in pbar:
+        if slow_start is not None:
+            refreshes.append(pbar.last_print_time)
+    times = [slow_start] + sorted(set(t for t in refreshes if t >= slow_start))
+    gap = max(b - a for a, b in zip(times, times[1:] + [time.time()]))
+    assert (
+        gap < 2 * MAXINTERVAL + 0.1
+    ), f'no refresh for {gap:.2f}s after a slowdown, maxinterval {MAXINTERVAL}s'
+    assert pbar._maxinterval_timer is None, 'watchdog not cancelled on close'
+    print(f'✓ slowdown: refreshed at least every {gap:.2f}s')
+
+
+def main():
+    try:
+        test_slowdown()
+        test_capped()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test the delivery to several backends: a failing backend and a raising one don't stop the others, and the
+merged response names the failing ones, for both `deliver()` and `adeliver()`.
+
+The backends are a Slack hook that works, a DingTalk hook that answers with an error, and a registered
+backend whose delivery raises, all listed in `backend` of the configuration file.
+
+Usage: python tests/multi_backend.py
+"""
+
+import os
+import sys
+import json
+import asyncio
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+messages = []
+
+
+class Hook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.startswith('/slack'):
+            messages.append(json.dumps(json.loads(body), ensure_ascii=False))
+            status, answer = 200, b'ok'
+        else:
+            status, answer = 500, b'broken'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(answer)))
+        self.end_headers()
+        self.wfile.write(answer)
+
+    def log_message(self, *args):
+        pass
+
+
+def count(marker):
+    return sum(marker in message for message in messages)
+
+
+def register_raising_backend():
+    from oven.backends.api import NotifierBackendBase
+    from oven.backends.registry import register_backend
+    from oven.backends.slack import SlackExpInfo, SlackLogInfo
+
+    class RaisingBackend(NotifierBackendBase):
+        def __init__(self, cfg):
+            self.cfg = cfg
+
+        def get_meta(self):
+            return {'backend': 'RaisingBackend'}
+
+        def deliver(self, info, persist=True, retry=True):
+            raise RuntimeError('plugin crashed')
+
+        async def adeliver(self, info, persist=True, retry=True):
+            raise RuntimeError('plugin crashed')
+
+    register_backend('raising', RaisingBackend, SlackExpInfo, SlackLogInfo)
+
+
+def check_resp(resp, marker):
+    assert count(marker) == 1, f'{marker}: not delivered to the working one'
+    assert resp.has_err, f'{marker}: the failures are not reported'
+    assert '[dingtalk]' in resp.err_msg, resp.err_msg
+    assert '[raising] plugin crashed' in resp.err_msg, resp.err_msg
+    assert '[slack]' not in resp.err_msg, resp.err_msg
+    assert not resp.details['slack'].has_err, resp.details
+    assert resp.details['dingtalk'].has_err, resp.details
+
+
+def make_info(oven, marker):
+    backend = oven.backend
+    return oven.LogInfoClass.create_muted(
+        backend, exp_meta_info=backend.get_meta(), description=marker
+    )
+
+
+def test_deliver(oven):
+    resp = oven.backend.deliver(
+        make_info(oven, 'fan-out-sync'), persist=False, retry=False
+    )
+    check_resp(resp, 'fan-out-sync')
+    print('✓ deliver: sent to the working backend, 2 failures reported')
+
+
+def test_adeliver(oven):
+    resp = asyncio.run(
+        oven.backend.adeliver(
+            make_info(oven, 'fan-out-async'), persist=False, retry=False
+        )
+    )
+    check_resp(resp, 'fan-out-async')
+    print('✓ adeliver: sent to the working backend, 2 failures reported')
+
+
+def test_notify(oven):
+    try:
+        oven.notify('fan-out-notify')
+    except ConnectionError as e:
+        assert '[raising]' in f'{e}', e
+    assert count('fan-out-notify') == 1, 'not delivered to the working one'
+    print('✓ notify: delivered to the working backend')
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Hook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    with tempfile.TemporaryDirectory() as home:
+        with open(os.path.join(home, 'cfg.yaml'), 'w') as f:
+            f.write(
+                'backend: [slack, dingtalk, raising]\n'
+                'slack:\n'
+                f'  hook: {url}/slack\n'
+                'dingtalk:\n'
+                f'  hook: {url}/dingtalk?access_token=test\n'
+                '  secure_key: test\n'
+                'raising: {}\n'
+            )
+        os.environ.update(OVEN_HOME=home, OVEN_NO_DAEMON='1')
+        import oven
+        from oven import get_lazy_oven
+
+        register_raising_backend()
+        try:
+            test_deliver(get_lazy_oven())
+            test_adeliver(get_lazy_oven())
+            test_notify(oven)
+        except AssertionError as e:
+            print(f'✗ {e}')
+            sys.exit(1)
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test the background delivery of progress notifications: triggers merged while a delivery is pending,
+`notify_stats`, `close()` not waiting on the network, the final notification kept at exit, and the
+worker reset after `fork()`.
+
+The notifications are delivered to a local stand-in hook that answers slowly.
+
+Usage: python tests/notify_worker.py
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HOOK_DELAY = 0.5
+
+messages = []
+
+
+class SlowHook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(HOOK_DELAY)
+        messages.append(json.dumps(json.loads(body), ensure_ascii=False))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+def count(*markers):
+    return sum(all(m in message for m in markers) for message in messages)
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def make_bar(oven, desc, total=1000):
+    return oven.ProgressBar(
+        total=total,
+        desc=desc,
+        disable=True,
+        notify_mode='socket',
+        notify_threshold=0.01,
+        miniters=1,
+    )
+
+
+def test_merged(oven):
+    pbar = make_bar(oven, 'merged')
+    assert wait_for(lambda: count('merged') == 1), 'start not delivered'
+
+    start = time.monotonic()
+    for _ in range(500):
+        pbar.update(1)
+        time.sleep(0.002)
+    cost = time.monotonic() - start
+    stats = pbar.notify_stats
+    assert cost < 1.5 + HOOK_DELAY / 2, f'update loop waited, {cost:.2f}s'
+    assert stats['queue_depth'] <= 1, stats
+    assert wait_for(lambda: not pbar.notify_stats['pending']), 'still pending'
+    pbar.close()
+    assert wait_for(lambda: count('merged', 'Done!') == 1), 'final not sent'
+
+    stats = pbar.notify_stats
+    n_progress = count('merged', 'Running!')
+    assert 1 <= stats['n_sent'] == n_progress < 50, (stats, n_progress)
+    assert stats['last_latency'] >= HOOK_DELAY * 0.9, stats
+    assert stats['max_latency'] >= stats['last_latency'], stats
+    print(
+        f'✓ merged: 50 triggers, {n_progress} notifications, '
+        f'max latency {stats["max_latency"]:.2f}s'
+    )
+
+
+def test_close(oven):
+    from oven.progress import _get_notify_worker
+
+    pbar = make_bar(oven, 'closing')
+    assert wait_for(lambda: count('closing') == 1), 'start not delivered'
+    pbar.update(100)
+    worker = _get_notify_worker()
+    assert wait_for(lambda: worker._running is pbar), 'not being delivered'
+
+    start = time.monotonic()
+    pbar.close()
+    cost = time.monotonic() - start
+    assert cost < HOOK_DELAY / 2, f'close() waited {cost:.2f}s on the network'
+    assert wait_for(lambda: count('closing', 'Done!') == 1), 'final not sent'
+    closing = [m for m in messages if 'closing' in m]
+    assert 'Running!' in closing[-2] and 'Done!' in closing[-1], 'out of order'
+    print(
+        f'✓ close: returned in {cost * 1e3:.0f}ms, final sent after progress'
+    )
+
+
+def test_exit():
+    # The final notification handed over to the worker is sent before the process exits.
+    subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            'import time, oven\n'
+            'from oven.progress import _get_notify_worker\n'
+            'pbar = oven.ProgressBar(total=10, desc="exiting", disable=True, '
+            'notify_mode="socket", notify_threshold=0.01, miniters=1)\n'
+            'pbar.update(5)\n'
+            'while _get_notify_worker()._running is not pbar:\n'
+            '    time.sleep(0.01)\n'
+            'pbar.close()\n',
+        ],
+        env=dict(os.environ, PYTHONPATH=ROOT),
+        timeout=60,
+        check=True,
+    )
+    assert count('exiting', 'Done!') == 1, 'final lost at exit'
+    print('✓ exit: final notification sent before exiting')
+
+
+def test_fork(oven):
+    from oven.progress import _get_notify_worker
+
+    busy = make_bar(oven, 'busy')
+    queued = make_bar(oven, 'queued')
+    assert wait_for(lambda: count('queued') == 1), 'start not delivered'
+    busy.update(100)
+    worker = _get_notify_worker()
+    assert wait_for(lambda: worker._running is busy), 'not being delivered'
+    queued.update(100)
+    assert queued._notify_pending, 'not queued'
+
+    pid = os.fork()
+    if pid == 0:
+        ok = not queued._notify_pending and worker.depth == 0
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    busy.close()
+    queued.close()
+    assert os.WEXITSTATUS(status) == 0, 'queued bar still pending in child'
+    print('✓ fork: the bars queued in the parent are not pending in the child')
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as home:
+        with open(os.path.join(home, 'cfg.yaml'), 'w') as f:
+            f.write(
+                'backend: slack\n'
+                'slack:\n'
+                f'  hook: http://127.0.0.1:{server.server_address[1]}/hook\n'
+            )
+        os.environ.update(OVEN_HOME=home, OVEN_NO_DAEMON='1')
+        import oven
+
+        try:
+            test_merged(oven)
+            test_close(oven)
+            test_exit()
+            test_fork(oven)
+        except AssertionError as e:
+            print(f'✗ {e}')
+            sys.exit(1)
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
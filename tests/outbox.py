@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Test the outbox of undelivered notifications: kept without raising in the caller, replayed in order by
+`flush_outbox()` and `oven flush-outbox`, bounded, only readable by the owner, and without credentials on
+disk.
+
+The notifications are delivered to a local stand-in hook, which can be made to fail.
+
+Usage: python tests/outbox.py
+"""
+
+import os
+import sys
+import json
+import stat
+import time
+import sqlite3
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+messages = []
+hook_state = {'fail': (), 'delay': 0}
+
+
+class StandInHook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        message = json.dumps(json.loads(body), ensure_ascii=False)
+        failed = any(marker in message for marker in hook_state['fail'])
+        time.sleep(hook_state['delay'])
+        if not failed:
+            messages.append(message)
+        answer = b'error' if failed else b'ok'
+        self.send_response(500 if failed else 200)
+        self.send_header('Content-Length', str(len(answer)))
+        self.end_headers()
+        self.wfile.write(answer)
+
+    def log_message(self, *args):
+        pass
+
+
+def count(marker):
+    return sum(marker in message for message in messages)
+
+
+def test_kept(oven):
+    hook_state['fail'] = ('kept-',)
+    for i in range(3):
+        try:
+            oven.ding_log(f'kept-{i}')
+        except ConnectionError:
+            raise AssertionError('raised although kept in the outbox')
+    outbox = oven.backend.outbox
+    assert len(outbox) == 3, f'{len(outbox)} kept'
+
+    mode = stat.S_IMODE(os.stat(outbox.path).st_mode)
+    assert mode == 0o600, f'outbox created with mode {oct(mode)}'
+    print('✓ kept: nothing raised, outbox only readable by the owner')
+
+
+def test_replay(oven):
+    # Stops at the first failure to keep the order.
+    hook_state['fail'] = ('kept-1',)
+    assert oven.flush_outbox() == (1, 2), 'did not stop at the failure'
+
+    hook_state['fail'] = ()
+    assert oven.flush_outbox() == (2, 0), 'not all replayed'
+    order = [m for m in messages if 'kept-' in m]
+    assert all(f'kept-{i}' in m for i, m in enumerate(order)), 'out of order'
+    assert count('kept-') == 3, f'{count("kept-")} messages for 3 logs'
+    print('✓ replay: in order, stopped at the first failure')
+
+
+def flush_in_subprocess():
+    return subprocess.Popen(
+        [
+            sys.executable,
+            '-c',
+            'import sys; from oven.cli import oven; '
+            'sys.argv = ["oven", "flush-outbox"]; oven()',
+        ],
+        env=dict(os.environ, PYTHONPATH=ROOT),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+
+def test_cli(oven):
+    hook_state['fail'] = ('cli-',)
+    oven.ding_log('cli-log')
+    hook_state['fail'] = ()
+    out, _ = flush_in_subprocess().communicate(timeout=60)
+    assert '1 notification(s) sent, 0 left' in out, out
+    assert count('cli-log') == 1, 'not delivered by `oven flush-outbox`'
+    print('✓ oven flush-outbox: kept log delivered')
+
+
+def test_concurrent(oven):
+    # Two processes replaying at once, e.g. `oven flush-outbox` and the dispatcher of a running job.
+    hook_state['fail'] = ('race-',)
+    for i in range(4):
+        oven.ding_log(f'race-{i}')
+    hook_state['fail'], hook_state['delay'] = (), 0.2
+    try:
+        procs = [flush_in_subprocess() for _ in range(2)]
+        outs = [proc.communicate(timeout=60)[0] for proc in procs]
+    finally:
+        hook_state['delay'] = 0
+    counts = [count(f'race-{i}') for i in range(4)]
+    assert counts == [1] * 4, f'sent {counts} times'
+    assert len(oven.backend.outbox) == 0, 'left in the outbox'
+    assert sorted(outs) == sorted(
+        f'📮 {n} notification(s) sent, 0 left in the outbox.\n' for n in [0, 4]
+    ), outs
+    print('✓ concurrent replays: each kept notification sent once')
+
+
+def test_bounded():
+    from oven.outbox import Outbox
+    from oven.backends.slack import SlackBackend
+    from oven.backends.slack.info import SlackLogInfo
+
+    backend = SlackBackend({'backend': 'slack', 'hook': 'http://127.0.0.1:9'})
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = Outbox(os.path.join(tmp, 'outbox.db'), max_entries=2)
+        for i in range(5):
+            info = SlackLogInfo.create_muted(
+                backend, backend.get_meta(), f'bounded-{i}'
+            )
+            outbox.append('slack', info)
+        assert len(outbox) == 2, f'{len(outbox)} entries kept'
+        kept = [
+            row[0]
+            for row in sqlite3.connect(outbox.path).execute(
+                'SELECT payload FROM outbox ORDER BY id'
+            )
+        ]
+        assert (
+            'bounded-3' in kept[0] and 'bounded-4' in kept[1]
+        ), 'evicted newest'
+    print('✓ bounded: the oldest entries are evicted')
+
+
+def test_secrets():
+    from oven.outbox import Outbox
+    from oven.backends.api import ExpInfoBase
+    from oven.backends.registry import load_backend
+
+    # The secret of each backend's meta information, and the configuration it comes from.
+    backends = {
+        'email': (
+            'sender_pwd',
+            {
+                'smtp_server': 'smtp.example.com',
+                'smtp_port': 465,
+                'sender_email': 'oven@example.com',
+                'sender_pwd': 'email-password',
+                'receiver_email': 'me@example.com',
+            },
+        ),
+        'feishu': (
+            'signature',
+            {'hook': 'http://127.0.0.1:9', 'signature': 'feishu-secret'},
+        ),
+        'dingtalk': (
+            'sec_key',
+            {
+                'hook': 'http://127.0.0.1:9?access_token=x',
+                'secure_key': 'dingtalk-secret',
+            },
+        ),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = Outbox(os.path.join(tmp, 'outbox.db'))
+        built = {}
+        for name, (field, cfg) in backends.items():
+            BackendClass, _, LogInfoClass = load_backend(name)
+            backend = BackendClass(dict(cfg, backend=name))
+            secret = backend.get_meta()[field]
+            assert secret, f'{name}: no `{field}` in the meta information'
+            info = LogInfoClass.create_muted(
+                backend, backend.get_meta(), 'exp'
+            )
+            outbox.append(name, info)
+            built[name] = backend, field, secret
+        outbox._get_conn().execute('PRAGMA wal_checkpoint(FULL)')
+
+        for path in os.listdir(tmp):
+            with open(os.path.join(tmp, path), 'rb') as f:
+                data = f.read()
+            for name, (_, field, secret) in built.items():
+                assert (
+                    secret.encode() not in data
+                ), f'{name} `{field}` in {path}'
+
+        rows = outbox._get_conn().execute(
+            'SELECT backend, payload FROM outbox ORDER BY id'
+        )
+        payloads = {name: json.loads(payload) for name, payload in rows}
+    for name, (backend, field, secret) in built.items():
+        info = ExpInfoBase.from_payload(payloads[name], backend)
+        meta = info.exp_meta_info
+        assert meta.get(field, secret) == secret, f'{name}: not rebuilt'
+        assert getattr(info, field, secret) == secret, f'{name}: not rebuilt'
+    print('✓ secrets: left out on disk, rebuilt from the configuration')
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as home:
+        with open(os.path.join(home, 'cfg.yaml'), 'w') as f:
+            f.write(
+                'backend: slack\n'
+                'slack:\n'
+                f'  hook: http://127.0.0.1:{server.server_address[1]}/hook\n'
+                'retry:\n'
+                '  max_attempts: 1\n'
+                'outbox:\n'
+                '  enabled: true\n'
+            )
+        os.environ.update(OVEN_HOME=home, OVEN_NO_DAEMON='1')
+        from oven.oven import build_oven
+
+        try:
+            oven = build_oven()
+            test_kept(oven)
+            test_replay(oven)
+            test_cli(oven)
+            test_concurrent(oven)
+            test_bounded()
+            test_secrets()
+        except AssertionError as e:
+            print(f'✗ {e}')
+            sys.exit(1)
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
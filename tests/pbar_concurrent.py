@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Stress test of the concurrent mode of the progress bar: many threads update the same bar, and the
+final count must be exact.
+
+Usage: python tests/pbar_concurrent.py
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oven
+
+
+def hammer(pbar, n_threads, n_updates, step):
+    barrier = threading.Barrier(n_threads)
+
+    def worker():
+        barrier.wait()  # start together to maximize the interleaving
+        for _ in range(n_updates):
+            pbar.update(step)
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_exact_count(n_threads, n_updates=20000, step=3):
+    expected = n_threads * n_updates * step
+    pbar = oven.ProgressBar(
+        total=expected,
+        initial=7,
+        concurrent=True,
+        mininterval=0,  # refresh as often as possible while counting
+        disable=True,
+        enable_notifications=False,
+    )
+    hammer(pbar, n_threads, n_updates, step)
+    pbar.close()
+    assert (
+        pbar.n == expected + 7
+    ), f'{n_threads} threads: expected {expected + 7}, got {pbar.n}'
+    print(f'✓ {n_threads} threads: {pbar.n} counted exactly')
+
+
+def test_thread_pool():
+    from concurrent.futures import ThreadPoolExecutor
+
+    with oven.ProgressBar(
+        total=1000, concurrent=True, disable=True, enable_notifications=False
+    ) as pbar:
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda _: pbar.update(1), range(1000)))
+    assert pbar.n == 1000, f'thread pool: expected 1000, got {pbar.n}'
+    print('✓ ThreadPoolExecutor: 1000 counted exactly')
+
+
+def main():
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    try:
+        for n_threads in [1, 2, 4, 8, 16, 32]:
+            test_exact_count(n_threads)
+        test_thread_pool()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test the bytes counted by `oven.progress_file()` with each way of reading, and their formatting.
+
+Usage: python tests/progress_file.py
+"""
+
+import io
+import os
+import re
+import sys
+import zlib
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oven
+
+SIZE = 3 * 1000 * 1000 + 123
+CHUNK_SIZE = 64 * 1024
+
+
+def open_tracked(path_or_file, **kwargs):
+    return oven.progress_file(
+        path_or_file, enable_notifications=False, disable=True, **kwargs
+    )
+
+
+def test_reads(path, expected_crc):
+    def read(f):
+        crc = 0
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                return crc
+            crc = zlib.crc32(data, crc)
+
+    def readinto(f):
+        crc, buf = 0, memoryview(bytearray(CHUNK_SIZE))
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                return crc
+            crc = zlib.crc32(buf[:n], crc)
+
+    def chunks(f, **kwargs):
+        crc = 0
+        for chunk in f.iter_chunks(CHUNK_SIZE, **kwargs):
+            crc = zlib.crc32(chunk, crc)
+        return crc
+
+    for name, fn in [
+        ('read', read),
+        ('readinto', readinto),
+        ('mmap', chunks),
+        ('buffered', lambda f: chunks(f, use_mmap=False)),
+    ]:
+        with open_tracked(path) as f:
+            assert f.pbar.total == SIZE, f'{name}: total {f.pbar.total}'
+            assert fn(f) == expected_crc, f'{name}: wrong data'
+            assert f.pbar.n == SIZE, f'{name}: counted {f.pbar.n}'
+    print('✓ read, readinto, mmap and buffered chunks counted exactly')
+
+
+def test_partial(path):
+    # Stop in the middle, then go on with plain reads from where the chunks stopped.
+    with open_tracked(path) as f:
+        for i, _ in enumerate(f.iter_chunks(CHUNK_SIZE)):
+            if i == 2:
+                break
+        assert f.tell() == 3 * CHUNK_SIZE, f'position {f.tell()}'
+        f.read()
+        assert f.pbar.n == SIZE, f'counted {f.pbar.n}'
+
+    # A file object whose size is unknown.
+    with open(path, 'rb') as raw:
+        stream = io.BytesIO(raw.read())
+    with open_tracked(stream) as f:
+        assert f.pbar.total is None, f'total {f.pbar.total}'
+        n = sum(len(chunk) for chunk in f.iter_chunks(CHUNK_SIZE))
+        assert n == SIZE and f.pbar.n == SIZE, f'counted {f.pbar.n}'
+    print('✓ partial reads and streams counted exactly')
+
+
+def test_format(path):
+    with open_tracked(path) as f:
+        f.read(SIZE // 2)
+        description = f.pbar._format_progress_description()
+        assert '/3.00MB)' in description, description
+        assert re.search(r'\d[kMGT]B/s', description), description
+    with open_tracked(path, unit_divisor=1024) as f:
+        f.read()
+        description = f.pbar._format_progress_description()
+        assert '(2.86MiB/2.86MiB)' in description, description
+    print(f'✓ formatted: {description}')
+
+
+def main():
+    with tempfile.NamedTemporaryFile() as tmp:
+        data = os.urandom(SIZE)
+        tmp.write(data)
+        tmp.flush()
+        try:
+            test_reads(tmp.name, zlib.crc32(data))
+            test_partial(tmp.name)
+            test_format(tmp.name)
+        except AssertionError as e:
+            print(f'✗ {e}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test `oven.progress_map()`: results and their order with threads and processes, the completed items
+counted, the automatic chunk size, the bounded number of items read ahead, and early stops.
+
+Usage: python tests/progress_map.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oven
+from oven.parallel import _ChunkSizer, TARGET_CHUNK_TIME
+
+N = 20000
+
+
+def square(x):
+    return x * x
+
+
+def fail_at_100(x):
+    if x == 100:
+        raise ValueError('boom')
+    return x
+
+
+def jittered(x):
+    # Later items finish first, so that the completion order differs from the items order.
+    time.sleep(0.001 * (x % 5 == 0))
+    return x
+
+
+def run_map(fn, iterable, **kwargs):
+    return oven.progress_map(
+        fn, iterable, disable=True, enable_notifications=False, **kwargs
+    )
+
+
+def test_results():
+    expected = [x * x for x in range(N)]
+    for executor in ['thread', 'process']:
+        results = run_map(square, range(N), workers=3, executor=executor)
+        assert list(results) == expected, f'{executor}: wrong results'
+
+    results = list(run_map(jittered, range(200), workers=4, ordered=False))
+    assert sorted(results) == list(range(200)), 'unordered: wrong results'
+    assert results != list(range(200)), 'unordered: yielded in items order'
+    print('✓ ordered and unordered results, with threads and processes')
+
+
+def test_counted():
+    # The bar counts the completed items, not the consumed ones.
+    results = run_map(square, iter(range(N)), workers=2, total=N)
+    next(results)
+    pbar = results.gi_frame.f_locals['pbar']
+    time.sleep(0.2)
+    pbar._sync_n()
+    assert pbar.n > 1, f'{pbar.n} items counted'
+    results.close()
+    assert pbar._closed, 'bar not closed after an early stop'
+    print(f'✓ completed items counted: {pbar.n} before consuming')
+
+
+def test_chunksize():
+    sizer = _ChunkSizer(workers=4)
+    assert sizer.next_size() == 1, 'no single item before any measurement'
+    sizer.observe(10, 10 * 1e-5)
+    assert sizer.next_size() == int(
+        TARGET_CHUNK_TIME / 1e-5
+    ), sizer.next_size()
+    assert sizer.next_size(remaining=100) == 25, 'tail not split over workers'
+    sizer.observe(1, 1.0)
+    assert sizer.next_size() == 1, 'slow items not sent one by one'
+    print('✓ chunk size follows the per-item latency')
+
+
+def test_bounded():
+    read = 0
+
+    def items():
+        nonlocal read
+        for x in range(10**9):
+            read += 1
+            yield x
+
+    results = run_map(
+        square, items(), workers=2, max_inflight=4, chunksize=8, total=None
+    )
+    for x in results:
+        if x == 10000:
+            break
+    results.close()
+    ahead = read - 101
+    assert ahead <= 4 * 8, f'{ahead} items read ahead'
+    print(f'✓ bounded: {ahead} items read ahead')
+
+
+def test_error():
+    try:
+        list(run_map(fail_at_100, range(1000), workers=2))
+    except ValueError:
+        print('✓ exception of the function raised to the caller')
+        return
+    raise AssertionError('exception swallowed')
+
+
+def main():
+    try:
+        test_results()
+        test_counted()
+        test_chunksize()
+        test_bounded()
+        test_error()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test the host-local progress channel of the ranks: the file is kept until the last rank closes it, a rank
+attaching late still shares it, and the files left by a crashed launch are neither read nor kept.
+
+The ranks are emulated by channels of different local ranks in one process.
+
+Usage: python tests/rank_channel.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oven.utils.dist import RankChannel, RankInfo, get_job_key
+
+N_RANKS = 3
+
+
+def make_channel(name, local_rank):
+    info = RankInfo(
+        rank=local_rank,
+        local_rank=local_rank,
+        world_size=N_RANKS,
+        local_world_size=N_RANKS,
+    )
+    return RankChannel(name, info)
+
+
+def test_late_rank():
+    primary = make_channel('late', 0)
+    early = make_channel('late', 1)
+    early.publish(10, 10)
+    early.close()
+    assert os.path.exists(primary.path), 'unlinked while a rank is running'
+
+    late = make_channel('late', 2)
+    assert late.path == primary.path
+    late.publish(5, 10)
+    primary.publish(7, 10)
+    n, total, n_ranks = primary.read()
+    assert (n, total, n_ranks) == (22, 30, 3), (n, total, n_ranks)
+
+    primary.close()
+    assert os.path.exists(late.path), 'unlinked while a rank is running'
+    late.close()
+    assert not os.path.exists(late.path), 'left behind by the last rank'
+    print('✓ late rank: shared the file, unlinked by the last one')
+
+
+def test_stale():
+    # The file of a crashed launch, with the name of this launch but another launcher.
+    shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else '/tmp'
+    dead_pid = 2**22 + 12345  # above the default `pid_max`
+    stale_path = os.path.join(
+        shm_dir, f'oven-ranks-{get_job_key()}-{dead_pid}.1-stale-0'
+    )
+    with open(stale_path, 'wb') as f:
+        f.write(b'\x07' * 8 * 3 * N_RANKS)
+
+    RankChannel._swept = False
+    channel = make_channel('stale-0', 0)
+    try:
+        assert channel.path != stale_path, 'stale file reused'
+        assert channel.read() == (0, 0, 0), f'read {channel.read()}'
+        assert not os.path.exists(stale_path), 'stale file not removed'
+    finally:
+        channel.close()  # not the last rank, the file is kept
+        for path in [channel.path, stale_path]:
+            if os.path.exists(path):
+                os.unlink(path)
+    print('✓ stale: the file of a crashed launch ignored and removed')
+
+
+def main():
+    try:
+        test_late_rank()
+        test_stale()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the rate estimators with a synthetic progress: a slow warm-up, then 100it/s, then 400it/s.
+
+The average since the start, which was used before, is reported for reference.
+
+Usage: python tests/rate.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oven.utils.rate import (
+    EMARateEstimator,
+    WindowRateEstimator,
+    build_rate_estimator,
+)
+
+
+def synthetic_samples():
+    """(n, t) samples every 0.1s: 5s of warm-up at 2it/s, 10s at 100it/s, 10s at 400it/s."""
+    n, t = 0, 0.0
+    for rate, duration in [(2, 5.0), (100, 10.0), (400, 10.0)]:
+        for _ in range(int(duration * 10)):
+            n += rate * 0.1
+            t += 0.1
+            yield int(round(n)), t
+
+
+def feed(estimator, until=None):
+    for n, t in synthetic_samples():
+        if until is not None and t > until + 1e-9:
+            break
+        estimator.update(n, t)
+    return n, t
+
+
+def assert_close(name, value, expected, rel=0.05):
+    assert value is not None, f'{name}: no rate'
+    assert (
+        abs(value - expected) <= rel * expected
+    ), f'{name}: {value:.1f}it/s, expected {expected}it/s'
+
+
+def test_warmup():
+    # Only the 100it/s phase counts once the warm-up is excluded, even with the plain average.
+    estimator = EMARateEstimator(smoothing=0, warmup=5.0)
+    feed(estimator, until=15.0)
+    assert_close('warm-up excluded', estimator.rate, 100)
+    n, t = feed(EMARateEstimator(smoothing=0), until=15.0)
+    print(
+        f'✓ warm-up: {estimator.rate:.1f}it/s excluding it, {n / t:.1f}it/s including it'
+    )
+
+
+def test_throughput_change():
+    for name, estimator in [
+        ('EMA', EMARateEstimator(smoothing=0.3, warmup=5.0)),
+        ('window', WindowRateEstimator(window=16, warmup=5.0)),
+    ]:
+        n, t = feed(estimator)
+        assert_close(name, estimator.rate, 400)
+        eta = estimator.eta(4000)
+        assert abs(eta - 10) < 0.5, f'{name}: ETA {eta:.1f}s, expected 10s'
+        print(
+            f'✓ {name}: {estimator.rate:.1f}it/s after the change, average since start {n / t:.1f}it/s'
+        )
+
+
+def test_warmup_cost():
+    # Each warm-up sample rewinds the window, which must not cost its size.
+    estimator = WindowRateEstimator(window=1_000_000, warmup=5.0)
+    elapsed = 0.0
+    for n, t in synthetic_samples():
+        start = time.perf_counter()
+        estimator.update(n, t)
+        if t <= 5.0:
+            elapsed += time.perf_counter() - start
+    assert elapsed < 0.05, f'{elapsed:.2f}s for 50 warm-up samples'
+    # The window holds everything after the warm-up: 1000 + 4000 units in 20s.
+    assert_close('window after warm-up', estimator.rate, 250)
+    print(
+        f'✓ warm-up cost: {elapsed * 1e3:.1f}ms for 50 samples with a 1M window'
+    )
+
+
+def test_no_samples():
+    for estimator in [build_rate_estimator(), build_rate_estimator(window=4)]:
+        assert estimator.rate is None, 'rate without samples'
+        assert estimator.eta(10) is None, 'ETA without samples'
+        estimator.update(0, 1.0)
+        assert estimator.rate is None, 'rate with a single sample'
+    print('✓ no rate until there are two samples')
+
+
+def main():
+    try:
+        test_warmup()
+        test_throughput_change()
+        test_warmup_cost()
+        test_no_samples()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
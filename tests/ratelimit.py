@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test the token bucket shared by the processes on the host: the budget holds across processes, and a thread
+waiting for its token doesn't hold the lock of the others.
+
+Usage: python tests/ratelimit.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oven.utils.ratelimit import TokenBucket
+
+CAPACITY = 5
+PERIOD = 1.0
+N_PROCS = 4
+N_TOKENS = 5
+
+
+def make_bucket(state_dir):
+    return TokenBucket('hook', CAPACITY, PERIOD, state_dir)
+
+
+def acquire_tokens(state_dir, queue):
+    bucket = make_bucket(state_dir)
+    for _ in range(N_TOKENS):
+        bucket.acquire()
+        queue.put(time.time())
+
+
+def test_processes():
+    with tempfile.TemporaryDirectory() as state_dir:
+        ctx = multiprocessing.get_context('spawn')
+        queue = ctx.Queue()
+        procs = [
+            ctx.Process(target=acquire_tokens, args=(state_dir, queue))
+            for _ in range(N_PROCS)
+        ]
+        for proc in procs:
+            proc.start()
+        grants = sorted(
+            queue.get(timeout=30) for _ in range(N_PROCS * N_TOKENS)
+        )
+        for proc in procs:
+            proc.join()
+
+    # At most `capacity + rate * t` tokens in any window of `t` seconds.
+    rate = CAPACITY / PERIOD
+    for i, start in enumerate(grants):
+        for j in range(i, len(grants)):
+            n, t = j - i + 1, grants[j] - start
+            assert n <= CAPACITY + rate * t + 1, f'{n} tokens in {t:.2f}s'
+    span = grants[-1] - grants[0]
+    expected = (N_PROCS * N_TOKENS - CAPACITY) / rate
+    assert span >= expected * 0.9, f'{span:.2f}s, expected {expected:.2f}s'
+    print(f'✓ {N_PROCS} processes: {len(grants)} tokens in {span:.2f}s')
+
+
+def test_sleep_outside_lock():
+    with tempfile.TemporaryDirectory() as state_dir:
+        bucket = make_bucket(state_dir)
+        for _ in range(CAPACITY):
+            bucket.acquire()
+        waiter = threading.Thread(target=bucket.acquire)
+        waiter.start()
+        time.sleep(0.05)
+        locked = bucket._lock.acquire(timeout=0.05)
+        if locked:
+            bucket._lock.release()
+        waiter.join()
+    assert locked, 'lock held while sleeping'
+    assert bucket.n_acquired == CAPACITY + 1 and bucket.n_waited == 1
+    print(f'✓ waiting thread: slept {bucket.total_wait:.2f}s outside the lock')
+
+
+def main():
+    try:
+        test_sleep_outside_lock()
+        test_processes()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test the discovery of third-party backends through the `oven.backends` entry points: a plugin is listed
+without being imported, a built-in backend can't be shadowed, a name declared twice keeps the first
+declaration, and a plugin failing to import is reported by its name without breaking the others.
+
+The plugins are fake distributions written to temporary directories put on `sys.path`.
+
+Usage: python tests/registry.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PLUGIN_MODULE = """
+from oven.backends.api import NotifierBackendBase
+from oven.backends.slack import SlackExpInfo, SlackLogInfo
+
+
+class {name}Backend(NotifierBackendBase):
+    def __init__(self, cfg):
+        self.cfg = cfg
+
+
+BACKEND_CLASSES = ({name}Backend, SlackExpInfo, SlackLogInfo)
+"""
+
+BROKEN_MODULE = """
+import oven_missing_dependency
+"""
+
+
+def write_dist(root, dist, entry_points, modules):
+    """Write a distribution declaring `entry_points`, with its `modules` next to it."""
+    info_dir = os.path.join(root, f'{dist}-0.1.dist-info')
+    os.makedirs(info_dir)
+    with open(os.path.join(info_dir, 'METADATA'), 'w') as f:
+        f.write(f'Metadata-Version: 2.1\nName: {dist}\nVersion: 0.1\n')
+    with open(os.path.join(info_dir, 'entry_points.txt'), 'w') as f:
+        f.write('[oven.backends]\n')
+        for name, value in entry_points.items():
+            f.write(f'{name} = {value}\n')
+    for module, source in modules.items():
+        with open(os.path.join(root, f'{module}.py'), 'w') as f:
+            f.write(source)
+
+
+def setup_plugins(tmp):
+    # The first directory on `sys.path` is scanned first.
+    first, second = os.path.join(tmp, 'first'), os.path.join(tmp, 'second')
+    write_dist(
+        first,
+        'oven_fake_plugin',
+        {
+            'fake': 'oven_fake_plugin:BACKEND_CLASSES',
+            'twin': 'oven_fake_plugin:BACKEND_CLASSES',
+            'slack': 'oven_fake_plugin:BACKEND_CLASSES',
+            'broken': 'oven_broken_plugin:BACKEND_CLASSES',
+        },
+        {
+            'oven_fake_plugin': PLUGIN_MODULE.format(name='Fake'),
+            'oven_broken_plugin': BROKEN_MODULE,
+        },
+    )
+    write_dist(
+        second,
+        'oven_twin_plugin',
+        {'twin': 'oven_twin_plugin:BACKEND_CLASSES'},
+        {'oven_twin_plugin': PLUGIN_MODULE.format(name='Twin')},
+    )
+    sys.path[:0] = [first, second]
+
+
+def test_discovery(registry):
+    names = registry.list_backends()
+    assert {'fake', 'twin', 'broken', 'slack'} <= set(names), names
+    assert 'oven_fake_plugin' not in sys.modules, 'imported while listing'
+
+    BackendClass, _, _ = registry.load_backend('fake')
+    assert BackendClass.__name__ == 'FakeBackend', BackendClass
+    assert registry.load_backend('fake') is registry.load_backend('fake')
+    print('✓ discovery: listed without importing, loaded by name')
+
+
+def test_clash(registry):
+    BackendClass, _, _ = registry.load_backend('slack')
+    assert BackendClass.__module__ == 'oven.backends.slack', BackendClass
+    BackendClass, _, _ = registry.load_backend('twin')
+    assert BackendClass.__name__ == 'FakeBackend', 'the first one not kept'
+    assert 'oven_twin_plugin' not in sys.modules, 'the second one imported'
+    print('✓ clash: built-in kept, the first declaration wins')
+
+
+def test_broken(registry):
+    try:
+        registry.load_backend('broken')
+    except ImportError as e:
+        assert '`broken`' in f'{e}', e
+        assert 'oven_missing_dependency' in f'{e}', e
+    else:
+        assert False, 'a broken plugin loaded'
+    assert 'broken' in registry.list_backends(), 'listing broken'
+    BackendClass, _, _ = registry.load_backend('fake')
+    assert BackendClass.__name__ == 'FakeBackend', 'other plugins broken'
+    print('✓ broken: reported by name, the others still load')
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_plugins(tmp)
+        from oven.backends import registry
+
+        try:
+            test_discovery(registry)
+            test_clash(registry)
+            test_broken(registry)
+        except AssertionError as e:
+            print(f'✗ {e}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
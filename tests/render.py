@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Test the progress bar renderer: `bar_format`, `ncols`, `ascii`, `unit_scale`, and the terminal and
+non-terminal outputs.
+
+Usage: python tests/render.py
+"""
+
+import io
+import os
+import re
+import pty
+import sys
+import time
+import fcntl
+import struct
+import termios
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oven
+from oven.render import Renderer, RenderManager, BarFormat
+
+
+ANSI = re.compile(r'\x1b\[\d*[A-Z]')
+
+
+class FakeTerminal(io.StringIO):
+    n_writes = 0
+
+    def isatty(self):
+        return True
+
+    def write(self, s):
+        self.n_writes += 1
+        return super().write(s)
+
+
+def run_bar(file, n=100, desc='test', **kwargs):
+    with oven.ProgressBar(
+        total=n,
+        desc=desc,
+        file=file,
+        miniters=1,
+        mininterval=0,
+        enable_notifications=False,
+        **kwargs,
+    ) as pbar:
+        for _ in range(n):
+            pbar.update(1)
+    return file.getvalue()
+
+
+def test_terminal():
+    # The frames are throttled, whatever `mininterval` is.
+    out = ANSI.sub('', run_bar(FakeTerminal(), ncols=60))
+    frames = [frame for frame in out.split('\r') if frame]
+    assert len(frames) <= 3, f'{len(frames)} frames on a terminal'
+    assert out.endswith('\n'), 'line not ended'
+    last = frames[-1].rstrip('\n')
+    assert len(last) == 60, f'frame of {len(last)} columns, expected 60'
+    assert '100/100' in last, last
+    print(f'✓ terminal: {len(frames)} frames of 60 columns')
+
+
+def test_not_terminal():
+    out = run_bar(io.StringIO())
+    lines = out.splitlines()
+    assert '\r' not in out, 'carriage returns written to a file'
+    assert len(lines) == 2, f'{len(lines)} lines written to a file'
+    assert '100/100' in lines[-1], lines[-1]
+    print(f'✓ not a terminal: {len(lines)} lines')
+
+
+def test_not_left():
+    out = run_bar(FakeTerminal(), leave=False)
+    assert out.endswith('\r\x1b[J'), 'line not cleared'
+    assert run_bar(io.StringIO(), leave=False).count('\n') == 1
+    print('✓ not left: cleared')
+
+
+def test_nested():
+    file = FakeTerminal()
+    kwargs = dict(file=file, mininterval=0, enable_notifications=False)
+    outer = oven.ProgressBar(total=2, desc='outer', **kwargs)
+    for _ in range(2):
+        inner = oven.ProgressBar(total=3, desc='inner', leave=False, **kwargs)
+        for _ in range(3):
+            time.sleep(RenderManager.frame_interval)
+            inner.update(1)
+        assert inner._renderer.position is None
+        inner.close()
+        outer.update(1)
+    outer.close()
+    out = file.getvalue()
+    assert '\x1b[1A' in out, 'bars drawn on the same line'
+    out = ANSI.sub('', out)
+    assert re.search(
+        r'outer[^\r\n]*\ninner', out
+    ), 'inner bar not below the outer one'
+    assert '2/2' in out.split('\r')[-1], 'outer bar not left'
+    print('✓ nested: inner bar drawn below the outer one')
+
+
+def test_throttled():
+    # 100 bars updated 100 times each, the frames don't grow with the number of bars.
+    file = FakeTerminal()
+    bars = [
+        oven.ProgressBar(
+            total=100,
+            file=file,
+            miniters=1,
+            mininterval=0,
+            leave=False,
+            enable_notifications=False,
+        )
+        for _ in range(100)
+    ]
+    n_writes = file.n_writes
+    for _ in range(100):
+        for pbar in bars:
+            pbar.update(1)
+    n_writes = file.n_writes - n_writes
+
+    # The last updates are drawn by a late frame.
+    time.sleep(RenderManager.frame_interval * 4)
+    last = ANSI.sub('', [f for f in file.getvalue().split('\r') if f][-1])
+    for pbar in bars:
+        pbar.close()
+    assert n_writes < 100, f'{n_writes} frames for 10000 updates'
+    assert (
+        last.count('100/100') == 100
+    ), f'{last.count("100/100")} bars complete in the last frame'
+    print(f'✓ throttled: {n_writes} frames for 10000 updates of 100 bars')
+
+
+def test_clamped():
+    # A line wider than the terminal would wrap, and the cursor movements would be off.
+    master, slave = pty.openpty()
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack('HHHH', 24, 40, 0, 0))
+
+    class NarrowTerminal(FakeTerminal):
+        def fileno(self):
+            return slave
+
+    try:
+        out = ANSI.sub('', run_bar(NarrowTerminal(), desc='a' * 60))
+    finally:
+        os.close(master)
+        os.close(slave)
+    lines = [line for frame in out.split('\r') for line in frame.split('\n')]
+    width = max(len(line) for line in lines)
+    assert width <= 40, f'line of {width} columns on a 40 columns terminal'
+    print('✓ clamped: lines no wider than the terminal')
+
+
+def test_bar_format():
+    out = run_bar(
+        FakeTerminal(),
+        n=2048,
+        bar_format='{desc}|{bar:10}|{n_fmt}{unit}',
+        ascii=True,
+        unit='B',
+        unit_scale=True,
+        unit_divisor=1024,
+    )
+    last = ANSI.sub('', out).split('\r')[-1].rstrip('\n')
+    assert last == 'test|##########|2.00KiB', last
+
+    renderer = Renderer(bar_format='{l_bar}{bar}{r_bar}', ascii=' 123456789#')
+    line = renderer.format_meter('half', 55, 100, 1.0, 55.0, ncols=80)
+    assert len(line) == 80, f'{len(line)} columns, expected 80'
+    bar = line.split('|')[1]
+    assert bar.rstrip(' ').rstrip('123456789').strip('#') == '', bar
+    print(f'✓ bar_format: {last!r}')
+
+
+def test_invalid_bar_format():
+    for fmt in ['{foo}', '{bar}{bar}', '{desc!r}']:
+        try:
+            BarFormat(fmt)
+        except AssertionError:
+            continue
+        raise AssertionError(f'{fmt} is accepted')
+    print('✓ invalid bar_format rejected')
+
+
+def main():
+    try:
+        test_terminal()
+        test_not_terminal()
+        test_not_left()
+        test_nested()
+        test_throttled()
+        test_clamped()
+        test_bar_format()
+        test_invalid_bar_format()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
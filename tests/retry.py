@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test the retry policy of `NotifierBackendBase.deliver()`: the classification of the failures, the
+exponential backoff with jitter, the attempts in the caller's thread, and the budget, which also caps the
+timeouts of each attempt and doesn't count the wait for the rate limiter.
+
+Usage: python tests/retry.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oven.backends.api import NotifierBackendBase, RespStatus, RetryPolicy
+from oven.backends.slack import SlackBackend, SlackLogInfo
+from oven.backends.dingtalk import DingTalkBackend
+from oven.backends.email import EmailBackend
+
+
+class ScriptedBackend(NotifierBackendBase):
+    """Answer with the scripted responses in turn."""
+
+    def __init__(self, resps, policy) -> None:
+        self.cfg = {'backend': 'scripted'}
+        self.resps = list(resps)
+        self.retry_policy = policy
+        self.n_calls = 0
+
+    def notify(self, info) -> RespStatus:
+        self.n_calls += 1
+        return self.resps.pop(0) if self.resps else RespStatus(has_err=False)
+
+
+class SlowHook(BaseHTTPRequestHandler):
+    delay = 3.0
+    # Statuses of the next answers, then 200.
+    statuses = []
+    n_requests = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        SlowHook.n_requests += 1
+        time.sleep(self.delay)
+        status = self.statuses.pop(0) if self.statuses else 200
+        answer = b'ok' if status == 200 else b'error'
+        try:
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(answer)))
+            self.end_headers()
+            self.wfile.write(answer)
+        except OSError:
+            pass  # the client gave up at the end of its budget
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_hook(delay, statuses=()):
+    SlowHook.delay, SlowHook.statuses = delay, list(statuses)
+    SlowHook.n_requests = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    backend = SlackBackend(
+        {
+            'backend': 'slack',
+            'hook': f'http://127.0.0.1:{server.server_address[1]}/hook',
+        }
+    )
+    return server, backend
+
+
+class Message:
+    def format_information(self):
+        return {'text': 'test'}
+
+
+def failure(status_code=None, code=None):
+    return RespStatus(
+        has_err=True, err_msg='failed', code=code, status_code=status_code
+    )
+
+
+def test_is_retryable():
+    backend = ScriptedBackend([], RetryPolicy())
+    for resp, expected in [
+        (failure(), True),  # no response, e.g. a timeout
+        (failure(429), True),
+        (failure(502), True),
+        (failure(400), False),
+        (failure(404), False),
+        (failure(200, code=1), False),
+    ]:
+        assert backend.is_retryable(resp) == expected, resp.status_code
+
+    dingtalk = DingTalkBackend.__new__(DingTalkBackend)
+    assert dingtalk.is_retryable(failure(200, code=130101)), 'sending too fast'
+    assert not dingtalk.is_retryable(failure(200, code=310000))
+
+    email = EmailBackend.__new__(EmailBackend)
+    assert email.is_retryable(failure(code=451)), 'transient SMTP reply'
+    assert not email.is_retryable(failure(code=550)), 'permanent SMTP reply'
+    print('✓ is_retryable: transport errors, 429 / 5xx and backend codes')
+
+
+def test_backoff():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    for n_retry in range(1, 8):
+        bound = min(5.0, 2 ** (n_retry - 1))
+        delays = [policy.get_delay(n_retry) for _ in range(200)]
+        assert all(0 <= d <= bound for d in delays), f'retry {n_retry}'
+        assert max(delays) > bound / 2, f'retry {n_retry}: no jitter spread'
+
+    fast = RetryPolicy(max_attempts=4, base_delay=0.01, max_delay=0.01)
+    backend = ScriptedBackend([failure(503)] * 2, fast)
+    resp = backend.deliver(None, persist=False)
+    assert not resp.has_err and resp.attempts == 3, resp.attempts
+
+    backend = ScriptedBackend([failure(503)] * 10, fast)
+    resp = backend.deliver(None, persist=False)
+    assert resp.has_err and resp.attempts == 4, resp.attempts
+
+    backend = ScriptedBackend([failure(400)] * 10, fast)
+    resp = backend.deliver(None, persist=False)
+    assert resp.attempts == 1, 'fatal failure retried'
+
+    print('✓ backoff: jittered delays, retries up to `max_attempts`')
+
+
+def test_sync():
+    # Fewer attempts in the caller's thread, none but the first if so configured.
+    fast = RetryPolicy(max_attempts=4, base_delay=0.01, max_delay=0.01)
+    backend = ScriptedBackend([failure(503)] * 10, fast)
+    resp = backend.deliver(None, persist=False, retry=False)
+    assert resp.attempts == 2, f'{resp.attempts} attempts in the caller thread'
+    fast.sync_max_attempts = 1
+    backend = ScriptedBackend([failure(503)] * 10, fast)
+    resp = backend.deliver(None, persist=False, retry=False)
+    assert resp.attempts == 1, 'retried in the caller thread'
+
+    # A notification sent in the caller's thread survives a single 502.
+    server, backend = serve_hook(0, statuses=[502])
+    backend.retry_policy = RetryPolicy(base_delay=0.01, max_delay=0.01)
+    try:
+        SlackLogInfo(
+            backend, exp_meta_info=backend.get_meta(), description='x'
+        )
+    except ConnectionError as e:
+        raise AssertionError(f'lost after a single 502: {e}')
+    finally:
+        server.shutdown()
+    assert SlowHook.n_requests == 2, f'{SlowHook.n_requests} requests'
+    print('✓ sync: a 502 retried in the caller thread')
+
+
+def test_budget():
+    # No retry whose delay would exceed the budget.
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, budget=0.5)
+    backend = ScriptedBackend([failure(503)] * 10, policy)
+    start = time.monotonic()
+    resp = backend.deliver(None, persist=False)
+    cost = time.monotonic() - start
+    assert cost < 0.6, f'{cost:.2f}s for a 0.5s budget'
+
+    # An attempt is cut at the end of the budget, not at the read timeout.
+    server, backend = serve_hook(3.0)
+    try:
+        backend.retry_policy = RetryPolicy(max_attempts=3, budget=1.0)
+        start = time.monotonic()
+        resp = backend.deliver(Message(), persist=False)
+        cost = time.monotonic() - start
+    finally:
+        server.shutdown()
+    assert resp.has_err, 'timed out attempt reported as delivered'
+    assert cost < 1.5, f'{cost:.2f}s for a 1s budget'
+    print(f'✓ budget: a 3s hook gave up after {cost:.2f}s of a 1s budget')
+
+
+def test_rate_limited():
+    # A throttled notification is delayed, not failed: the budget starts once the token is acquired.
+    from oven.utils.ratelimit import TokenBucket
+
+    server, backend = serve_hook(0.3)
+    backend.retry_policy = RetryPolicy(max_attempts=1, budget=1.0)
+    with tempfile.TemporaryDirectory() as state_dir:
+        backend._rate_limiter = TokenBucket('retry', 1, 1.5, state_dir)
+        backend._rate_limiter.acquire()
+        try:
+            resp = backend.deliver(Message(), persist=False)
+        finally:
+            server.shutdown()
+    assert not resp.has_err, f'failed after the rate limiter: {resp.err_msg}'
+    assert resp.wait_time > 1.0, f'waited {resp.wait_time:.2f}s for a token'
+    print(
+        f'✓ rate limited: waited {resp.wait_time:.2f}s for a token, '
+        'then delivered within a 1s budget'
+    )
+
+
+def main():
+    try:
+        test_is_retryable()
+        test_backoff()
+        test_sync()
+        test_budget()
+        test_rate_limited()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test the process-wide timer scheduler: the order of the deadlines, periodic timers, cancelling, waiting for
+a callback that is running while it's cancelled, and the cost of many timers.
+
+Usage: python tests/scheduler.py
+"""
+
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from oven.utils.scheduler import Scheduler
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_order():
+    scheduler = Scheduler()
+    fired = []
+    for delay in [0.3, 0.1, 0.2, 0.1]:
+        scheduler.call_later(delay, lambda d=delay: fired.append(d))
+    assert wait_for(lambda: len(fired) == 4), f'{len(fired)} fired'
+    assert fired == [0.1, 0.1, 0.2, 0.3], fired
+    assert len(scheduler) == 0, f'{len(scheduler)} timers left'
+    print('✓ order: fired by deadline, ties in order')
+
+
+def test_periodic():
+    scheduler = Scheduler()
+    ticks = []
+    handle = scheduler.call_every(0.05, lambda: ticks.append(time.monotonic()))
+    time.sleep(0.35)
+    handle.cancel()
+    n_ticks = len(ticks)
+    time.sleep(0.15)
+    assert 3 <= n_ticks <= 8, f'{n_ticks} ticks in 0.35s'
+    assert len(ticks) == n_ticks, 'fired after cancel'
+    print(f'✓ periodic: {n_ticks} ticks, none after cancel')
+
+
+def test_cancel():
+    scheduler = Scheduler()
+    fired = []
+    handles = [
+        scheduler.call_later(0.1, lambda i=i: fired.append(i))
+        for i in range(1000)
+    ]
+    for handle in handles[::2]:
+        handle.cancel()
+    handles[1].cancel()
+    handles[1].cancel()  # cancelling twice is fine
+    assert len(scheduler) == 499, f'{len(scheduler)} active timers'
+    assert len(scheduler._heap) < 1000, 'cancelled timers never compacted'
+    assert wait_for(lambda: len(fired) == 499), f'{len(fired)} fired'
+    assert all(i % 2 == 1 and i != 1 for i in fired), 'a cancelled one fired'
+    print('✓ cancel: cancelled timers skipped, heap compacted')
+
+
+def test_cancel_running():
+    # `cancel()` returns once the running callback is done, and the periodic timer never fires again.
+    scheduler = Scheduler()
+    started, done = threading.Event(), []
+
+    def slow():
+        started.set()
+        time.sleep(0.3)
+        done.append(time.monotonic())
+
+    handle = scheduler.call_every(0.01, slow)
+    assert started.wait(2), 'not started'
+    handle.cancel()
+    returned = time.monotonic()
+    assert done and done[0] <= returned, 'returned while the callback runs'
+    n_done = len(done)
+    time.sleep(0.1)
+    assert len(done) == n_done, 'fired after cancel'
+
+    # A callback cancelling its own timer doesn't wait for itself.
+    fired = []
+
+    def cancel_self():
+        fired.append(1)
+        self_handle.cancel()
+
+    self_handle = scheduler.call_every(0.01, cancel_self)
+    assert wait_for(lambda: fired), 'not fired'
+    time.sleep(0.1)
+    assert len(fired) == 1, f'fired {len(fired)} times'
+    print('✓ cancel while running: waited for the callback')
+
+
+def test_many():
+    scheduler = Scheduler()
+    start = time.perf_counter()
+    handles = [scheduler.call_later(60, lambda: None) for _ in range(20000)]
+    for handle in handles:
+        handle.cancel()
+    cost = (time.perf_counter() - start) / 20000
+    assert cost < 1e-4, f'{cost * 1e6:.1f}us per timer'
+    assert len(scheduler) == 0, f'{len(scheduler)} timers left'
+    print(f'✓ many: {cost * 1e6:.1f}us to schedule and cancel a timer')
+
+
+def main():
+    try:
+        test_order()
+        test_periodic()
+        test_cancel()
+        test_cancel_running()
+        test_many()
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
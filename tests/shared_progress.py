@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the progress shared by the workers of a `multiprocessing.Pool`, with both `fork` and `spawn`.
+
+Usage: python tests/shared_progress.py
+"""
+
+import os
+import sys
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oven
+
+N_ITEMS = 64
+N_STEPS = 500
+
+
+def work(item, progress):
+    for _ in range(N_STEPS):
+        progress.update(1)
+    return os.getpid()
+
+
+def work_once(item, progress):
+    progress.update(1)
+    n_fds = len(os.listdir('/proc/self/fd')) if os.path.isdir('/proc') else 0
+    return os.getpid(), n_fds
+
+
+def test_start_method(method):
+    ctx = multiprocessing.get_context(method)
+    expected = N_ITEMS * N_STEPS
+    with oven.SharedProgress(
+        total=expected,
+        desc=method,
+        disable=True,
+        enable_notifications=False,
+    ) as progress:
+        pbar = progress.pbar
+        with ctx.Pool(4) as pool:
+            pids = pool.starmap(work, [(i, progress) for i in range(N_ITEMS)])
+        assert (
+            progress.n == expected
+        ), f'{method}: expected {expected}, got {progress.n}'
+    # The owner's bar catches up when closing.
+    assert pbar.n == expected, f'{method}: bar shows {pbar.n}'
+    assert not os.path.exists(progress.path), f'{method}: file is left'
+    print(
+        f'✓ {method}: {expected} counted exactly by {len(set(pids))} workers'
+    )
+
+
+def test_many_tasks(method, n_tasks=2000, n_slots=16):
+    # Each task unpickles its own copy of the progress, the copies share one slot per worker.
+    ctx = multiprocessing.get_context(method)
+    with oven.SharedProgress(
+        total=n_tasks,
+        n_slots=n_slots,
+        disable=True,
+        enable_notifications=False,
+    ) as progress:
+        with ctx.Pool(2) as pool:
+            results = pool.starmap(
+                work_once, [(i, progress) for i in range(n_tasks)], chunksize=1
+            )
+        n_claimed = progress._get_slots()[0]
+        assert progress.n == n_tasks, f'{method}: got {progress.n}'
+    n_workers = len({pid for pid, _ in results})
+    assert n_claimed == n_workers, f'{method}: {n_claimed} slots claimed'
+    max_fds = max(n_fds for _, n_fds in results)
+    assert max_fds < 64, f'{method}: {max_fds} open fds in a worker'
+    print(
+        f'✓ {method}: {n_tasks} tasks, {n_claimed} slots claimed, '
+        f'at most {max_fds} open fds per worker'
+    )
+
+
+def main():
+    try:
+        for method in multiprocessing.get_all_start_methods():
+            if method == 'forkserver':
+                continue
+            test_start_method(method)
+            test_many_tasks(method)
+    except AssertionError as e:
+        print(f'✗ {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()